@@ -1,12 +1,37 @@
+import time
+_import_start = time.perf_counter()
+
 import streamlit as st
 import os
+import copy
+import importlib
+from functools import lru_cache
 from config import (
-    APP_TITLE, 
+    APP_TITLE,
     APP_ICON,
-    DEFAULT_PAGE
+    DEFAULT_PAGE,
+    SHOW_STARTUP_TIMINGS
 )
-from data.data_loader import load_data, save_data
-from pages import dashboard, accounts, trade_journal, risk_calculator, analytics
+from data.cache import get_dataset_cache
+from data.persistence import get_persistence_manager
+from data.daily_view import DailyPerformanceView
+from data.equity_state import build_equity_states
+from utils.profiling import timed, record_timing, timing_report, log_timing_report_once
+
+# Only the first run in a process pays for the imports; later reruns hit sys.modules
+record_timing("imports", time.perf_counter() - _import_start, once=True)
+
+# Page modules are imported on first navigation so plotly and the page code
+# only load when a page that needs them is opened
+PAGE_MODULES = {
+    "Dashboard": "dashboard",
+    "Account 1 (Hourly)": "accounts",
+    "Account 2 (930)": "accounts",
+    "Account 3 (Lab)": "accounts",
+    "Trade Journal": "trade_journal",
+    "Risk Calculator": "risk_calculator",
+    "Performance Analytics": "analytics"
+}
 
 # Set page config
 st.set_page_config(
@@ -19,49 +44,64 @@ st.set_page_config(
 # Initial data loading
 def initialize_data():
     if 'initialized' not in st.session_state:
-        # Load data from files if they exist, otherwise use sample data
-        st.session_state.trade_journal = load_data('trades')
-        st.session_state.account_info = load_data('accounts') 
-        st.session_state.daily_performance = load_data('performance')
+        # Sessions share the process-wide datasets by reference; pages replace
+        # rather than mutate them. Account info is small and edited in place, so copy it.
+        with timed("data load", once=True):
+            datasets = get_dataset_cache().get_many(['trades', 'accounts', 'performance', 'equity'])
+        st.session_state.trade_journal = datasets['trades']
+        st.session_state.account_info = copy.deepcopy(datasets['accounts'])
+        st.session_state.daily_view = DailyPerformanceView.from_trades(datasets['trades'])
+        st.session_state.daily_performance = st.session_state.daily_view.reconcile(datasets['performance'])
+        st.session_state.equity_state = build_equity_states(st.session_state.daily_performance, datasets['equity'])
         st.session_state.initialized = True
+    
+    # Start the background writer that persists changes made by the pages
+    get_persistence_manager()
+
+@lru_cache(maxsize=None)
+def read_css():
+    with open(os.path.join("utils", "styles.css"), "r") as f:
+        return f.read()
 
 # Custom CSS
 def load_css():
-    with open(os.path.join("utils", "styles.css"), "r") as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{read_css()}</style>", unsafe_allow_html=True)
 
 # Navigation
 def create_navigation():
     st.sidebar.title("Navigation")
-    page = st.sidebar.radio("Select Page", 
-        ["Dashboard", "Account 1 (Hourly)", "Account 2 (930)", "Account 3 (Lab)", 
-         "Trade Journal", "Risk Calculator", "Performance Analytics"],
-        index=DEFAULT_PAGE)
+    page = st.sidebar.radio("Select Page", list(PAGE_MODULES), index=DEFAULT_PAGE)
     return page
 
+def load_page(page):
+    """Import a page module, timing the first import"""
+    module_name = f"pages.{PAGE_MODULES[page]}"
+    with timed(f"import {module_name}", once=True):
+        return importlib.import_module(module_name)
+
+def show_startup_timings():
+    log_timing_report_once()
+    if SHOW_STARTUP_TIMINGS:
+        with st.sidebar.expander("Startup timings"):
+            st.code(timing_report())
+
 # Main function
 def main():
+    render_start = time.perf_counter()
     initialize_data()
     load_css()
     page = create_navigation()
+    module = load_page(page)
     
     # Route to the correct page
-    if page == "Dashboard":
-        dashboard.show()
-    elif page == "Account 1 (Hourly)" or page == "Account 2 (930)" or page == "Account 3 (Lab)":
+    if module.__name__ == "pages.accounts":
         account_name = page.split(" ")[0] + " " + page.split(" ")[1]
-        accounts.show(account_name)
-    elif page == "Trade Journal":
-        trade_journal.show()
-    elif page == "Risk Calculator":
-        risk_calculator.show()
-    elif page == "Performance Analytics":
-        analytics.show()
+        module.show(account_name)
+    else:
+        module.show()
     
-    # Auto-save data on page change
-    save_data('trades', st.session_state.trade_journal)
-    save_data('accounts', st.session_state.account_info)
-    save_data('performance', st.session_state.daily_performance)
+    record_timing("first render", time.perf_counter() - render_start, once=True)
+    show_startup_timings()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,61 @@
+"""Compare equity chart payloads with and without downsampling.
+
+Builds the dashboard's equity curve figure from synthetic daily P&L,
+once with every point as SVG traces (the previous behaviour) and once
+downsampled with automatic WebGL, and reports the figure JSON size and
+the time to build and serialize it. Browser paint time isn't measured
+here; the JSON size is what the browser has to receive and parse.
+
+Run from the repository root:
+
+    python -m benchmarks.chart_benchmark [n_accounts] [n_days]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from utils.charts import downsample_frame, render_mode
+
+def synthetic_equity(n_accounts, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-03', periods=n_days).strftime('%Y-%m-%d')
+    frames = []
+    for account in range(n_accounts):
+        pnl = rng.normal(50, 800, n_days)
+        frames.append(pd.DataFrame({
+            'Date': dates,
+            'Account': f"Account {account + 1}",
+            'Equity': 150000 + np.cumsum(pnl)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def measure(build):
+    start = time.perf_counter()
+    fig = build()
+    built = time.perf_counter() - start
+    payload = fig.to_json()
+    serialized = time.perf_counter() - start
+    return fig, built, serialized, len(payload)
+
+def run(n_accounts, n_days):
+    equity_df = synthetic_equity(n_accounts, n_days)
+
+    def full():
+        return px.line(equity_df, x='Date', y='Equity', color='Account', render_mode='svg')
+
+    def downsampled():
+        sampled = downsample_frame(equity_df, ['Equity'], by='Account')
+        return px.line(sampled, x='Date', y='Equity', color='Account', render_mode=render_mode(len(sampled)))
+    
+    print(f"{n_accounts} accounts x {n_days} days ({len(equity_df):,} points)")
+    print(f"{'variant':>12} {'points':>9} {'trace':>10} {'build s':>8} {'build+json s':>13} {'json MB':>8}")
+    for name, build in [('full svg', full), ('downsampled', downsampled)]:
+        # Warm-up run so first-use import and template costs aren't counted
+        measure(build)
+        fig, built, serialized, size = measure(build)
+        points = sum(len(trace.x) for trace in fig.data)
+        print(f"{name:>12} {points:>9,} {fig.data[0].type:>10} {built:>8.3f} {serialized:>13.3f} {size / 1e6:>8.2f}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10, int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
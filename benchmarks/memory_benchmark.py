@@ -0,0 +1,32 @@
+"""Report trades frame memory before and after the load-time schema.
+
+Run from the repository root:
+
+    python -m benchmarks.memory_benchmark [n_trades]
+"""
+import sys
+import time
+from data.sample_data import generate_synthetic_trades
+from data.schema import apply_trade_schema
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def run(n_trades):
+    raw = generate_synthetic_trades(n_trades)
+    start = time.perf_counter()
+    typed = apply_trade_schema(raw)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{n_trades} trades")
+    print(f"{'column':>18} {'raw dtype':>12} {'raw MB':>8} {'typed dtype':>14} {'typed MB':>9}")
+    raw_usage = raw.memory_usage(deep=True, index=False)
+    typed_usage = typed.memory_usage(deep=True, index=False)
+    for column in typed.columns:
+        raw_dtype = str(raw[column].dtype) if column in raw.columns else '-'
+        raw_mb = raw_usage.get(column, 0) / 1e6
+        print(f"{column:>18} {raw_dtype:>12} {raw_mb:>8.1f} {str(typed[column].dtype):>14} {typed_usage[column] / 1e6:>9.1f}")
+    print(f"total: {megabytes(raw):.1f} MB -> {megabytes(typed):.1f} MB (schema applied in {elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,38 @@
+"""Compare load/save times of the storage backends on synthetic journals.
+
+Run from the repository root:
+
+    python -m benchmarks.storage_benchmark [n_trades ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from data.sample_data import generate_synthetic_trades
+from data.storage import CsvBackend, ParquetBackend
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Columns the dashboard needs; everything else (notably notes) is skipped
+DASHBOARD_COLUMNS = ['date', 'account', 'pnl', 'outcome', 'r_multiple']
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def run(sizes):
+    print(f"{'trades':>10} {'backend':>8} {'save (s)':>9} {'load (s)':>9} {'projected (s)':>14} {'size (MB)':>10}")
+    for n_trades in sizes:
+        trades = generate_synthetic_trades(n_trades)
+        with tempfile.TemporaryDirectory() as data_dir:
+            for backend in (CsvBackend(data_dir), ParquetBackend(data_dir)):
+                save_time = timed(lambda: backend.save('trades', trades))
+                load_time = timed(lambda: backend.load('trades'))
+                projected_time = timed(lambda: backend.load('trades', columns=DASHBOARD_COLUMNS))
+                size_mb = os.path.getsize(backend.path('trades')) / 1e6
+                print(f"{n_trades:>10} {backend.name:>8} {save_time:>9.3f} {load_time:>9.3f} "
+                      f"{projected_time:>14.3f} {size_mb:>10.1f}")
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
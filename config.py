@@ -3,9 +3,59 @@ APP_TITLE = "Prop Firm Trading Tracker"
 APP_ICON = "📈"
 DEFAULT_PAGE = 0
 
+# Show import/data load/first render timings in the sidebar
+SHOW_STARTUP_TIMINGS = False
+
 # Data storage settings
 DATA_DIR = "data_storage"
 
+# Table storage format: "parquet" (compressed, columnar), "sqlite" (indexed queries) or "csv"
+STORAGE_BACKEND = "parquet"
+
+# Number of logged trades replayed at startup before the log is folded into trades.csv
+TRADE_LOG_COMPACT_THRESHOLD = 500
+
+# Minimum number of seconds between background writes of changed session data
+PERSIST_FLUSH_INTERVAL = 2.0
+
+# Number of memoized calculation results kept across all sessions
+MEMO_CACHE_SIZE = 256
+
+# Estimated bytes of built chart figures kept across all sessions
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Rows per page offered by the trade history; the first is the default
+TRADE_HISTORY_PAGE_SIZES = [50, 100, 250, 500]
+
+# Most frames drawn in the rolling correlation heatmap; longer histories are sampled
+CORRELATION_MAX_FRAMES = 60
+
+# Most points drawn per chart series; longer series are downsampled
+CHART_MAX_POINTS = 1000
+
+# Figures with more points than one full downsampled series are rendered with WebGL
+# instead of SVG; a single series stays SVG, several long ones switch to WebGL
+WEBGL_POINT_THRESHOLD = CHART_MAX_POINTS
+
+# Monte Carlo projection: default path count, RNG seed, and worker processes (0 = one per core)
+MONTE_CARLO_PATHS = 100000
+MONTE_CARLO_SEED = 42
+MONTE_CARLO_WORKERS = 1
+
+# Prop firm max loss from the starting balance, for accounts without a 'max_loss' setting
+MONTE_CARLO_MAX_LOSS = 0.10
+
+# Most trades per day the Monte Carlo projection can simulate
+MONTE_CARLO_MAX_TRADES_PER_DAY = 20
+
+# Bootstrap confidence intervals for account metrics: resamples, confidence level and RNG seed
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 7
+
+# Shuffles per permutation test when comparing strategies (seeded with BOOTSTRAP_SEED)
+PERMUTATION_SHUFFLES = 2000
+
 # Account settings
 ACCOUNT_CONFIGS = {
     'Account 1': {
@@ -1,3 +1,11 @@
 # Make data functions available from the data package
-from data.data_loader import load_data, save_data
-from data.sample_data import generate_sample_trades, generate_sample_accounts, generate_sample_performance
\ No newline at end of file
+from data.data_loader import load_data, save_data, append_trades, compact_trade_log, dataset_version, create_sample_data, performance_from_trades
+from data.storage import StorageBackend, CsvBackend, ParquetBackend, SqliteBackend, get_storage_backend, migrate_from_csv
+from data.persistence import PersistenceManager, get_persistence_manager
+from data.cache import DatasetCache, get_dataset_cache
+from data.daily_view import DailyPerformanceView
+from data.equity_state import EquityState, build_equity_states
+from data.trade_index import TradeIndex
+from data.analytics_cube import AnalyticsCube
+from data.trade_view import TradeHistoryView, TradePage
+from data.sample_data import generate_sample_trades, generate_sample_accounts, generate_sample_performance, generate_synthetic_trades
\ No newline at end of file
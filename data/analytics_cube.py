@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['account', 'weekday', 'hour', 'setup_quality', 'month']
+CUBE_MEASURES = ['trades', 'wins', 'gross_profit', 'gross_loss', 'pnl', 'r_sum']
+
+class AnalyticsCube:
+    """Trade totals aggregated by account x weekday x hour x setup quality x month.
+
+    Built once per data version with a single groupby over the journal.
+    The cube has one row per occupied cell, which is bounded by the number
+    of buckets rather than the number of trades, so rolling it up to the
+    dimensions a chart needs is cheap whatever the journal size. Trades
+    with no timestamp or setup quality are kept and only drop out of
+    rollups over the dimension they lack. Weekday and month come from the
+    trade date and only the hour from the timestamp, so a trade with a
+    missing or malformed time still counts by day and month.
+    """
+
+    def __init__(self, trades):
+        # Parsed once per distinct date (to_datetime caches repeated values)
+        dates = pd.to_datetime(trades['date'], format='%Y-%m-%d', errors='coerce')
+        pnl = trades['pnl'].astype(float)
+        is_win = trades['outcome'] == 'Win'
+        keys = pd.DataFrame({
+            'account': trades['account'],
+            'weekday': dates.dt.weekday.astype('Int8'),
+            'hour': trades['timestamp'].dt.hour.astype('Int8'),
+            'setup_quality': trades['setup_quality'].astype('Int8'),
+            # yyyymm as an integer; formatting every trade's month as a string is the slow part
+            'month': (dates.dt.year * 100 + dates.dt.month).astype('Int32'),
+            'trades': 1,
+            'wins': is_win.astype(int),
+            'gross_profit': pnl.where(pnl > 0, 0.0),
+            'gross_loss': -pnl.where(pnl < 0, 0.0),
+            'pnl': pnl,
+            'r_sum': trades['r_multiple'].astype(float).fillna(0.0)
+        })
+        cells = keys.groupby(CUBE_DIMENSIONS, dropna=False, observed=True, sort=False)[CUBE_MEASURES].sum().reset_index()
+        month = cells['month']
+        self.cells = cells.assign(
+            account=cells['account'].astype(str),
+            month=(month // 100).astype(str).str.cat((month % 100).astype(str).str.zfill(2), sep='-').where(month.notna())
+        )
+        self._rollups = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def rollup(self, *dimensions):
+        """Totals and ratios grouped by the given dimensions"""
+        if dimensions not in self._rollups:
+            totals = self.cells.groupby(list(dimensions))[CUBE_MEASURES].sum()
+            self._rollups[dimensions] = with_ratios(totals)
+        return self._rollups[dimensions]
+
+    def breakdown(self, dimension, accounts, buckets=None):
+        """Per-account rollup over one dimension, with every account x bucket present
+
+        Buckets an account never traded in get zero totals and ratios.
+        Without `buckets`, every bucket that has trades is used, in order.
+        """
+        table = self.rollup('account', dimension)
+        if buckets is None:
+            buckets = sorted(table.index.get_level_values(dimension).unique())
+        index = pd.MultiIndex.from_product([list(accounts), list(buckets)], names=['account', dimension])
+        return table.reindex(index, fill_value=0).reset_index()
+
+    def totals(self):
+        """Totals over the whole journal"""
+        return with_ratios(self.cells[CUBE_MEASURES].sum().to_frame().T).iloc[0]
+
+def with_ratios(totals):
+    """Add win rate, profit factor and averages to summed cube measures"""
+    trades = totals['trades'].astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return totals.assign(
+            win_rate=(totals['wins'] / trades).where(trades > 0, 0.0),
+            profit_factor=(totals['gross_profit'] / totals['gross_loss']).where(totals['gross_loss'] > 0, totals['gross_profit']),
+            avg_pnl=(totals['pnl'] / trades).where(trades > 0, 0.0),
+            avg_r=(totals['r_sum'] / trades).where(trades > 0, 0.0)
+        )
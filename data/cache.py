@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from data.data_loader import load_data, dataset_version
+
+class DatasetCache:
+    """Process-wide cache of the loaded datasets, shared by every session.
+
+    Each dataset is loaded once per stored version and handed out by
+    reference, so extra browser sessions cost no extra parsing or memory.
+    Shared objects are read-only: pages replace a session's reference with
+    a new frame when they change data instead of editing it in place.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {data_type: threading.Lock() for data_type in ('trades', 'accounts', 'performance', 'equity')}
+
+    def get(self, data_type):
+        """Return the shared copy of a dataset, reloading it if storage changed"""
+        version = dataset_version(data_type)
+        entry = self._entries.get(data_type)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        
+        # One loader per dataset; sessions arriving meanwhile wait and reuse its result
+        with self._locks[data_type]:
+            entry = self._entries.get(data_type)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            data = load_data(data_type)
+            self._entries[data_type] = (version, data)
+            return data
+
+    def get_many(self, data_types):
+        """Return several datasets, loading the missing ones in parallel"""
+        with ThreadPoolExecutor(max_workers=len(data_types)) as executor:
+            return dict(zip(data_types, executor.map(self.get, data_types)))
+
+    def invalidate(self, data_type=None):
+        """Drop one or all cached datasets"""
+        if data_type is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(data_type, None)
+
+_cache = DatasetCache()
+
+def get_dataset_cache():
+    """Return the process-wide dataset cache"""
+    return _cache
@@ -0,0 +1,110 @@
+import logging
+import math
+import pandas as pd
+from data.schema import apply_performance_schema
+
+logger = logging.getLogger(__name__)
+
+class DailyPerformanceView:
+    """daily_performance as a materialized aggregate of the trade journal.
+
+    P&L totals and trade counts are held per (account, date) key, so
+    inserting, editing or deleting a trade is a constant-time dict update.
+    The dataframe the pages read is rebuilt from the dict only when it is
+    asked for after a change, which costs one row per trading day rather
+    than one concat per trade. Daily P&L recorded without trades in the
+    journal is kept as manual entries on top of the trade totals.
+    """
+
+    def __init__(self, totals=None, counts=None, manual=None):
+        self._totals = dict(totals or {})
+        self._counts = dict(counts or {})
+        self._manual = dict(manual or {})
+        self._frame = None
+
+    @classmethod
+    def from_trades(cls, trades, manual=None):
+        """Full rebuild from the trade journal, plus any manual entries"""
+        grouped = trades.groupby(['account', 'date'], observed=True)['pnl']
+        return cls(grouped.sum().to_dict(), grouped.size().to_dict(), manual)
+
+    @classmethod
+    def from_frame(cls, performance):
+        """View of a stored daily performance frame, to compare against"""
+        return cls(performance.groupby(['account', 'date'], observed=True)['pnl'].sum().to_dict())
+
+    def add_trade(self, trade):
+        """Apply a newly inserted trade"""
+        key = (trade['account'], trade['date'])
+        self._totals[key] = self._totals.get(key, 0.0) + trade['pnl']
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self._frame = None
+
+    def remove_trade(self, trade):
+        """Apply a deleted trade"""
+        key = (trade['account'], trade['date'])
+        count = self._counts.get(key, 0) - 1
+        if count <= 0:
+            # Last trade of the day is gone; a manual entry for the day stays
+            self._totals.pop(key, None)
+            self._counts.pop(key, None)
+        else:
+            self._totals[key] = self._totals.get(key, 0.0) - trade['pnl']
+            self._counts[key] = count
+        self._frame = None
+
+    def update_trade(self, old_trade, new_trade):
+        """Apply an edit; the trade may have moved to another account or date"""
+        self.remove_trade(old_trade)
+        self.add_trade(new_trade)
+
+    def pnl(self, account, date):
+        """Daily P&L for one account and date"""
+        key = (account, date)
+        return self._totals.get(key, 0.0) + self._manual.get(key, 0.0)
+
+    def frame(self):
+        """The view as a daily performance dataframe (date, account, pnl)"""
+        if self._frame is None:
+            keys = list(self._totals) + [key for key in self._manual if key not in self._totals]
+            rows = [(date, account, self.pnl(account, date)) for account, date in keys]
+            self._frame = apply_performance_schema(pd.DataFrame(rows, columns=['date', 'account', 'pnl']))
+        return self._frame
+
+    def mismatches(self, other, tolerance=1e-6):
+        """Keys whose P&L differs from another view, e.g. a full rebuild"""
+        keys = set(self._totals) | set(self._manual) | set(other._totals) | set(other._manual)
+        return sorted(
+            key for key in keys
+            if not math.isclose(self.pnl(*key), other.pnl(*key), abs_tol=tolerance)
+        )
+
+    def verify(self, trades, tolerance=1e-6):
+        """Check the incremental result against a full rebuild from trades"""
+        return not self.mismatches(DailyPerformanceView.from_trades(trades, self._manual), tolerance)
+
+    def reconcile(self, performance):
+        """Adopt a stored daily performance frame and return the frame the session should use
+
+        Stored P&L the trade journal doesn't account for, e.g. a day
+        recorded by hand, is kept as a manual entry so the stored value
+        still shows and is saved again. Journal days missing from the
+        stored frame are added from the trades. Either case is logged.
+        """
+        stored = DailyPerformanceView.from_frame(performance)
+        stale = self.mismatches(stored)
+        if not stale:
+            return performance
+        
+        manual = [key for key in stale if key in stored._totals]
+        missing = [key for key in stale if key not in stored._totals]
+        for key in manual:
+            self._manual[key] = stored.pnl(*key) - self._totals.get(key, 0.0)
+        self._frame = None
+        if manual:
+            logger.warning("Kept %d day(s) of stored P&L the trade journal doesn't account for as manual entries: %s",
+                           len(manual), manual[:5])
+        if missing:
+            logger.warning("Added %d day(s) of the trade journal missing from stored daily performance: %s",
+                           len(missing), missing[:5])
+        return self.frame()
@@ -1,46 +1,195 @@
 import os
 import pandas as pd
 import json
-from config import DATA_DIR
-from data.sample_data import generate_sample_trades, generate_sample_accounts, generate_sample_performance
+import threading
+from config import DATA_DIR, TRADE_LOG_COMPACT_THRESHOLD
+from data.storage import atomic_write, get_storage_backend, migrate_from_csv
+from data.schema import apply_trade_schema, apply_performance_schema, strip_derived_columns
+from data.sample_data import generate_sample_trades, generate_sample_accounts
+from data.daily_view import DailyPerformanceView
 
-# Ensure data directory exists
-os.makedirs(DATA_DIR, exist_ok=True)
+TRADE_LOG_FILE = os.path.join(DATA_DIR, 'trades.log')
 
-def load_data(data_type):
-    """Load data from storage or generate sample data if files don't exist"""
+# Bumped on every write so cached copies of a dataset can tell they are stale
+_write_counts = {'trades': 0, 'accounts': 0, 'performance': 0, 'equity': 0}
+_write_counts_lock = threading.Lock()
+
+# Held while the trade log is appended to, and from reading it until compaction has removed it,
+# so a trade appended by the background writer can't be deleted with a log that was already read.
+# Reentrant because replay compacts while holding it.
+_trade_log_lock = threading.RLock()
+
+# Datasets load in parallel; sample data must be created by one of them only.
+# Reentrant because deriving performance loads the trades.
+_sample_data_lock = threading.RLock()
+
+# JSON documents stored next to the tables
+JSON_FILES = {
+    'accounts': 'accounts.json',
+    'equity': 'equity_state.json'
+}
+
+def load_data(data_type, columns=None):
+    """Load data from storage or generate sample data if files don't exist
+
+    For the 'trades' and 'performance' tables `columns` limits the load to
+    the given columns when the storage backend supports it.
+    """
     if data_type == 'trades':
-        file_path = os.path.join(DATA_DIR, 'trades.csv')
-        if os.path.exists(file_path):
-            return pd.read_csv(file_path)
-        return generate_sample_trades()
-        
-    elif data_type == 'accounts':
-        file_path = os.path.join(DATA_DIR, 'accounts.json')
+        backend = get_table_backend('trades')
+        if not backend.exists('trades'):
+            # Persist the sample journal once so the log has a snapshot to replay onto
+            with _sample_data_lock:
+                if not backend.exists('trades'):
+                    create_sample_data()
+        trades = backend.load('trades', columns=columns)
+        return apply_trade_schema(replay_trade_log(trades, columns=columns))
+    
+    elif data_type in JSON_FILES:
+        file_path = os.path.join(DATA_DIR, JSON_FILES[data_type])
         if os.path.exists(file_path):
             with open(file_path, 'r') as f:
                 return json.load(f)
-        return generate_sample_accounts()
-        
+        # Equity states are derived data; an empty document means "rebuild"
+        return generate_sample_accounts() if data_type == 'accounts' else {}
+    
     elif data_type == 'performance':
-        file_path = os.path.join(DATA_DIR, 'performance.csv')
-        if os.path.exists(file_path):
-            return pd.read_csv(file_path)
-        return generate_sample_performance()
+        backend = get_table_backend('performance')
+        if not backend.exists('performance'):
+            # Daily P&L is derived from the journal so the two always agree
+            with _sample_data_lock:
+                if not backend.exists('performance'):
+                    save_data('performance', performance_from_trades(load_data('trades')))
+        return apply_performance_schema(backend.load('performance', columns=columns))
     
     return None
 
+def performance_from_trades(trades):
+    """Daily P&L per account and date, summed from a trade journal"""
+    return DailyPerformanceView.from_trades(trades).frame()
+
+def create_sample_data():
+    """Generate and persist the sample journal with the datasets derived from it
+
+    Daily performance is summed from the sample trades and the sample
+    accounts are stored too, so every cold start sees the same data.
+    """
+    trades = generate_sample_trades()
+    save_data('trades', trades)
+    save_data('performance', performance_from_trades(trades))
+    if not os.path.exists(os.path.join(DATA_DIR, JSON_FILES['accounts'])):
+        save_data('accounts', generate_sample_accounts())
+
 def save_data(data_type, data):
     """Save data to storage files"""
+    _count_write(data_type)
     if data_type == 'trades':
-        file_path = os.path.join(DATA_DIR, 'trades.csv')
-        data.to_csv(file_path, index=False)
+        get_table_backend('trades').save('trades', strip_derived_columns(data))
+    
+    elif data_type == 'performance':
+        get_table_backend('performance').save('performance', data)
+    
+    elif data_type in JSON_FILES:
+        file_path = os.path.join(DATA_DIR, JSON_FILES[data_type])
         
-    elif data_type == 'accounts':
-        file_path = os.path.join(DATA_DIR, 'accounts.json')
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=4)
+        def write_json(path):
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=4)
         
-    elif data_type == 'performance':
-        file_path = os.path.join(DATA_DIR, 'performance.csv')
-        data.to_csv(file_path, index=False)
\ No newline at end of file
+        atomic_write(file_path, write_json)
+
+def _count_write(data_type):
+    with _write_counts_lock:
+        _write_counts[data_type] += 1
+
+def dataset_version(data_type):
+    """Version stamp of a stored dataset: local write count plus file size and mtime
+
+    The file part catches writes made by other processes.
+    """
+    if data_type in JSON_FILES:
+        paths = [os.path.join(DATA_DIR, JSON_FILES[data_type])]
+    else:
+        paths = [get_storage_backend().path(data_type)]
+        if data_type == 'trades':
+            paths.append(TRADE_LOG_FILE)
+    
+    with _write_counts_lock:
+        stamp = [_write_counts[data_type]]
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def get_table_backend(table):
+    """Return the configured storage backend, migrating the table from CSV on first use"""
+    backend = get_storage_backend()
+    if backend.name != 'csv' and not backend.exists(table):
+        migrate_from_csv(backend, tables=(table,))
+    return backend
+
+def read_trade_log():
+    """Read the trade records appended since the last compaction, oldest first"""
+    if not os.path.exists(TRADE_LOG_FILE):
+        return []
+    
+    records = []
+    with open(TRADE_LOG_FILE, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted append is dropped
+                continue
+    return records
+
+def replay_trade_log(trades, columns=None):
+    """Apply the append-only trade log on top of the stored trades snapshot"""
+    with _trade_log_lock:
+        records = read_trade_log()
+        if not records:
+            return trades
+        
+        # New trades are kept newest first, matching the journal page
+        logged_trades = pd.DataFrame(records[::-1])
+        if columns is not None:
+            logged_trades = logged_trades.reindex(columns=columns)
+        trades = pd.concat([logged_trades, trades], ignore_index=True)
+        
+        # Periodic compaction keeps startup replay short; a projected load can't be written back
+        if columns is None and len(records) >= TRADE_LOG_COMPACT_THRESHOLD:
+            compact_trade_log(trades)
+    
+    return trades
+
+def append_trades(trades):
+    """Append trade records to the trades table or the trade log in a single write"""
+    _count_write('trades')
+    backend = get_table_backend('trades')
+    if backend.supports_append and backend.exists('trades'):
+        backend.append('trades', pd.DataFrame(trades))
+        return
+    
+    lines = ''.join(json.dumps(trade, default=str) + '\n' for trade in trades)
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with _trade_log_lock, open(TRADE_LOG_FILE, 'a') as f:
+        f.write(lines)
+
+def compact_trade_log(trades):
+    """Fold the trade log into a fresh trades snapshot and clear the log
+
+    `trades` must already include the logged records. Callers hold
+    _trade_log_lock from reading the log until this returns, so no record
+    appended in between is removed unsaved.
+    """
+    with _trade_log_lock:
+        save_data('trades', trades)
+        
+        if os.path.exists(TRADE_LOG_FILE):
+            os.remove(TRADE_LOG_FILE)
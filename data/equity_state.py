@@ -0,0 +1,140 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+import numpy as np
+
+# Bumped when the drawdown definition changes, so stored states are rebuilt
+EQUITY_STATE_VERSION = 2
+
+class HistoricalEditError(ValueError):
+    """Raised when a change lands before the last day already applied"""
+
+@dataclass
+class EquityState:
+    """Running equity and drawdown of one account at daily resolution.
+
+    P&L is cumulative from the starting balance, so the first peak is 0:
+    losing from day one counts as a drawdown, the same definition as
+    equity_curve and find_drawdown_episodes. Trades on the last day or a
+    later one are applied in constant time. An earlier day needs a rebuild
+    with from_daily().
+    """
+    account: str
+    last_date: Optional[str] = None
+    days: int = 0
+    cum_pnl: float = 0.0
+    peak: float = 0.0
+    current_drawdown: float = 0.0
+    max_drawdown: float = 0.0
+    max_drawdown_date: Optional[str] = None
+    # Values as of the day before last_date, so the last day can keep changing
+    prev_peak: float = 0.0
+    prev_max_drawdown: float = 0.0
+    prev_max_drawdown_date: Optional[str] = None
+    version: int = EQUITY_STATE_VERSION
+
+    @property
+    def in_recovery(self):
+        """Whether equity is below its running peak"""
+        return self.current_drawdown > 0
+
+    def apply(self, date, pnl):
+        """Add P&L booked on `date`"""
+        if self.last_date is not None and date < self.last_date:
+            raise HistoricalEditError(f"{self.account}: {date} is before {self.last_date}")
+        
+        if date != self.last_date:
+            # Close out the previous day
+            self.prev_peak = self.peak
+            self.prev_max_drawdown = self.max_drawdown
+            self.prev_max_drawdown_date = self.max_drawdown_date
+            self.last_date = date
+            self.days += 1
+        
+        self.cum_pnl += pnl
+        self.peak = max(self.prev_peak, self.cum_pnl)
+        self.current_drawdown = self.peak - self.cum_pnl
+        if self.current_drawdown > self.prev_max_drawdown:
+            self.max_drawdown = self.current_drawdown
+            self.max_drawdown_date = date
+        else:
+            self.max_drawdown = self.prev_max_drawdown
+            self.max_drawdown_date = self.prev_max_drawdown_date
+
+    @classmethod
+    def from_daily(cls, account, dates, pnls):
+        """Full recompute from an account's daily P&L rows"""
+        state = cls(account)
+        if len(dates) == 0:
+            return state
+        
+        order = np.argsort(np.asarray(dates, dtype=object), kind='stable')
+        dates = np.asarray(dates, dtype=object)[order]
+        cum_pnl = np.cumsum(np.asarray(pnls, dtype=float)[order])
+        peak = np.maximum.accumulate(np.maximum(cum_pnl, 0.0))
+        drawdown = peak - cum_pnl
+        
+        state.last_date = dates[-1]
+        state.days = len(dates)
+        state.cum_pnl = float(cum_pnl[-1])
+        state.peak = float(peak[-1])
+        state.current_drawdown = float(drawdown[-1])
+        max_idx = int(np.argmax(drawdown))
+        state.max_drawdown = float(drawdown[max_idx])
+        state.max_drawdown_date = dates[max_idx] if state.max_drawdown > 0 else None
+        if len(dates) > 1:
+            prev_max_idx = int(np.argmax(drawdown[:-1]))
+            state.prev_peak = float(peak[-2])
+            state.prev_max_drawdown = float(drawdown[prev_max_idx])
+            state.prev_max_drawdown_date = dates[prev_max_idx] if state.prev_max_drawdown > 0 else None
+        return state
+
+    def fingerprint(self):
+        return [self.version, self.days, self.last_date, round(self.cum_pnl, 6)]
+
+    def to_dict(self):
+        """Convert to a JSON-safe dictionary"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create an EquityState from a dictionary"""
+        data = dict(data)
+        # States stored before versioning used the old definition
+        data.setdefault('version', 1)
+        return cls(**data)
+
+def build_equity_states(performance, stored=None):
+    """Equity state per account, reusing stored states that still match the data
+
+    A stored state is kept when its version, day count, last date and
+    cumulative P&L agree with the performance frame; otherwise it is
+    recomputed.
+    """
+    stored = stored or {}
+    states = {}
+    for account, daily in performance.groupby('account', observed=True):
+        state = EquityState.from_dict(stored[account]) if account in stored else None
+        expected = [EQUITY_STATE_VERSION, len(daily), daily['date'].max(), round(float(daily['pnl'].sum()), 6)]
+        if state is None or state.fingerprint() != expected:
+            state = EquityState.from_daily(account, daily['date'].to_numpy(), daily['pnl'].to_numpy())
+        states[account] = state
+    return states
+
+def apply_trade(states, performance, trade):
+    """Update an account's equity state for a new trade
+
+    `performance` is the daily performance after the trade was added; it
+    is only read when the trade falls on a past day and the account has to
+    be recomputed.
+    """
+    account = trade['account']
+    state = states.setdefault(account, EquityState(account))
+    try:
+        state.apply(trade['date'], trade['pnl'])
+    except HistoricalEditError:
+        daily = performance[performance['account'] == account]
+        states[account] = EquityState.from_daily(account, daily['date'].to_numpy(), daily['pnl'].to_numpy())
+
+def equity_states_to_dict(states):
+    """Serialize equity states for storage"""
+    return {account: state.to_dict() for account, state in states.items()}
@@ -0,0 +1,123 @@
+import atexit
+import copy
+import logging
+import threading
+import time
+from config import PERSIST_FLUSH_INTERVAL
+from data.data_loader import save_data, append_trades
+from data.equity_state import equity_states_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Session state keys and the storage data types they are saved as
+SESSION_DATA_TYPES = {
+    'trade_journal': 'trades',
+    'account_info': 'accounts',
+    'daily_performance': 'performance',
+    'equity_state': 'equity'
+}
+
+class PersistenceManager:
+    """Write-behind persistence for session data.
+
+    Pages mark the session datasets they change as dirty and log new trades;
+    a background thread writes them out at most once per flush interval, so
+    disk writes never run on the render thread and a burst of changes is
+    coalesced into a single write per dataset.
+    """
+
+    def __init__(self, flush_interval=PERSIST_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # Serializes writers so an older snapshot can never overwrite a newer one
+        self._flush_lock = threading.Lock()
+        self._dirty = {}
+        self._pending_trades = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._last_flush = 0.0
+        self._thread = threading.Thread(target=self._run, name='persistence-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def mark_dirty(self, session_key, data):
+        """Schedule a session dataset to be written on the next flush"""
+        data_type = SESSION_DATA_TYPES[session_key]
+        # Snapshot now so later in-place edits on the render thread can't race the writer
+        if session_key == 'equity_state':
+            snapshot = equity_states_to_dict(data)
+        else:
+            snapshot = copy.deepcopy(data) if isinstance(data, dict) else data.copy()
+        with self._lock:
+            self._dirty[data_type] = snapshot
+        self._wakeup.set()
+
+    def log_trade(self, trade):
+        """Queue a new trade record for the append-only trade log"""
+        with self._lock:
+            self._pending_trades.append(dict(trade))
+        self._wakeup.set()
+
+    def has_pending(self):
+        """Whether any changes are waiting to be written"""
+        with self._lock:
+            return bool(self._dirty or self._pending_trades)
+
+    def flush(self):
+        """Write all pending changes now"""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            trades, self._pending_trades = self._pending_trades, []
+        
+        try:
+            if trades:
+                append_trades(trades)
+                trades = []
+            while dirty:
+                data_type, data = next(iter(dirty.items()))
+                save_data(data_type, data)
+                del dirty[data_type]
+        except Exception:
+            logger.exception("Failed to persist session data, will retry on next flush")
+            with self._lock:
+                # Newer changes marked while we were writing take precedence
+                for data_type, data in dirty.items():
+                    self._dirty.setdefault(data_type, data)
+                self._pending_trades[:0] = trades
+        finally:
+            self._last_flush = time.monotonic()
+
+    def shutdown(self):
+        """Stop the writer thread and flush anything still pending"""
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait()
+            if self._stop.is_set():
+                break
+            # Coalesce: let further changes accumulate until the interval has passed.
+            # Shutdown interrupts the wait and flushes the changes itself.
+            delay = self._last_flush + self.flush_interval - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            self._wakeup.clear()
+            self.flush()
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_persistence_manager():
+    """Return the process-wide persistence manager, starting it on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = PersistenceManager()
+        return _manager
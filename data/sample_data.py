@@ -203,4 +203,74 @@ def generate_sample_performance():
         'pnl': account1_pnl + account2_pnl + account3_pnl
     })
     
-    return daily_performance
\ No newline at end of file
+    return daily_performance
+
+def generate_synthetic_trades(n_trades, seed=0, years=3):
+    """Generate a large synthetic trade journal for benchmarking
+
+    Columns match generate_sample_trades(); values are drawn with vectorized
+    NumPy calls so millions of rows can be produced in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    
+    account_names = list(ACCOUNT_CONFIGS.keys())
+    account_idx = rng.integers(0, len(account_names), size=n_trades)
+    accounts = np.array(account_names)[account_idx]
+    strategies = np.array([ACCOUNT_CONFIGS[name]['strategy'] for name in account_names])[account_idx]
+    
+    # Business days over the last few years
+    business_days = pd.bdate_range(end=datetime.now().date(), periods=252 * years)
+    dates = business_days[rng.integers(0, len(business_days), size=n_trades)].strftime('%Y-%m-%d')
+    minutes = rng.integers(9 * 60 + 30, 16 * 60, size=n_trades)
+    times = np.char.add(np.char.add(np.char.zfill((minutes // 60).astype(str), 2), ':'),
+                        np.char.zfill((minutes % 60).astype(str), 2))
+    
+    instrument_names = np.array(['ES', 'NQ', 'YM'])
+    instrument_idx = rng.integers(0, 3, size=n_trades)
+    base_prices = np.array([4725.0, 18400.0, 37900.0])[instrument_idx]
+    point_values = np.array([50.0, 20.0, 5.0])[instrument_idx]
+    
+    is_long = rng.random(n_trades) < 0.5
+    is_win = rng.random(n_trades) < 0.6
+    direction_sign = np.where(is_long, 1.0, -1.0)
+    
+    entry = np.round(base_prices + rng.uniform(-50, 50, size=n_trades), 2)
+    move = np.where(is_win, 1.0, -1.0) * rng.uniform(5, 15, size=n_trades)
+    exit_ = np.round(entry + direction_sign * move, 2)
+    risk = rng.uniform(10, 25, size=n_trades)
+    stop = np.round(entry - direction_sign * risk, 2)
+    size = rng.integers(1, 6, size=n_trades)
+    
+    pnl = np.round(direction_sign * (exit_ - entry) * size * point_values, 2)
+    r_multiple = np.round(direction_sign * (exit_ - entry) / np.abs(entry - stop), 2)
+    
+    quality_high = rng.choice([3, 4, 5], size=n_trades, p=[0.2, 0.3, 0.5])
+    quality_low = rng.choice([1, 2, 3], size=n_trades, p=[0.3, 0.4, 0.3])
+    
+    notes_options = np.array([
+        'Perfect setup', 'Gap fade', 'Trend continuation', 'Support bounce',
+        'Resistance rejection', 'VWAP fade', 'Failed breakout', 'Double top',
+        'Double bottom', 'Key level test', 'Reversal pattern', 'Momentum trade',
+        'News reaction', 'Range breakout', 'Trend reversal'
+    ])
+    
+    trade_data = pd.DataFrame({
+        'date': dates,
+        'time': times,
+        'account': accounts,
+        'strategy': strategies,
+        'instrument': instrument_names[instrument_idx],
+        'direction': np.where(is_long, 'Long', 'Short'),
+        'entry_price': entry,
+        'exit_price': exit_,
+        'stop_loss': stop,
+        'position_size': size,
+        'pnl': pnl,
+        'r_multiple': r_multiple,
+        'outcome': np.where(is_win, 'Win', 'Loss'),
+        'setup_quality': np.where(is_win, quality_high, quality_low),
+        'execution_quality': np.where(is_win, quality_high, quality_low),
+        'notes': notes_options[rng.integers(0, len(notes_options), size=n_trades)]
+    })
+    
+    return trade_data.sort_values('date', ascending=False, ignore_index=True)
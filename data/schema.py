@@ -0,0 +1,90 @@
+import dataclasses
+import typing
+import pandas as pd
+from pandas.api.types import union_categoricals
+from models.trade import Trade, DailyPerformance
+
+# Columns computed at load time and never written back to storage
+DERIVED_TRADE_COLUMNS = ['timestamp']
+
+def schema_from_model(model):
+    """Column -> dtype mapping declared by a model dataclass
+
+    A field's `dtype` metadata wins; otherwise floats are float64 and
+    strings are left to pandas' default string handling.
+    """
+    schema = {}
+    for model_field in dataclasses.fields(model):
+        dtype = model_field.metadata.get('dtype')
+        if dtype is None:
+            field_type = model_field.type
+            if typing.get_origin(field_type) is typing.Union:
+                field_type = typing.get_args(field_type)[0]
+            if field_type is float:
+                dtype = 'float64'
+            elif field_type is int:
+                dtype = 'int64'
+        if dtype is not None:
+            schema[model_field.name] = dtype
+    return schema
+
+TRADE_SCHEMA = schema_from_model(Trade)
+PERFORMANCE_SCHEMA = schema_from_model(DailyPerformance)
+
+def apply_schema(df, schema):
+    """Cast the columns of a dataframe to a declared schema
+
+    Integer columns holding missing values use the nullable integer dtype.
+    Columns absent from the frame (e.g. a projected load) are skipped.
+    """
+    casts = {}
+    for column, dtype in schema.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        if dtype.startswith('int') and df[column].isna().any():
+            dtype = dtype.capitalize()
+        casts[column] = dtype
+    return df.astype(casts) if casts else df
+
+def apply_trade_schema(trades):
+    """Cast a trades frame to TRADE_SCHEMA and add the parsed timestamp column"""
+    trades = apply_schema(trades, TRADE_SCHEMA)
+    if 'date' in trades.columns and 'time' in trades.columns and 'timestamp' not in trades.columns:
+        trades = trades.assign(timestamp=pd.to_datetime(
+            trades['date'].astype(str) + ' ' + trades['time'].astype(str),
+            format='%Y-%m-%d %H:%M', errors='coerce'
+        ))
+    return trades
+
+def apply_performance_schema(performance):
+    """Cast a daily performance frame to PERFORMANCE_SCHEMA"""
+    return apply_schema(performance, PERFORMANCE_SCHEMA)
+
+def strip_derived_columns(trades):
+    """Drop load-time columns before a trades frame is written"""
+    return trades.drop(columns=[column for column in DERIVED_TRADE_COLUMNS if column in trades.columns])
+
+def concat_frames(frames, schema):
+    """Concatenate frames sharing a schema without losing categorical dtypes
+
+    Plain pd.concat falls back to object dtype when category sets differ,
+    so categorical columns are unioned first. Empty frames are skipped:
+    one read from an empty file has object columns and categories that
+    don't union with typed ones.
+    """
+    frames = [apply_schema(frame, schema) for frame in frames]
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    for column, dtype in schema.items():
+        if dtype != 'category' or not all(column in frame.columns for frame in frames):
+            continue
+        categories = union_categoricals([frame[column] for frame in frames]).categories
+        frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+def concat_trades(frames):
+    """Concatenate trade frames, typing any raw ones first"""
+    return concat_frames([apply_trade_schema(frame) for frame in frames], TRADE_SCHEMA)
+
+def concat_performance(frames):
+    """Concatenate daily performance frames, typing any raw ones first"""
+    return concat_frames(frames, PERFORMANCE_SCHEMA)
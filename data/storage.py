@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import tempfile
+from contextlib import closing, contextmanager
+import pandas as pd
+from config import DATA_DIR, STORAGE_BACKEND
+from data.schema import apply_trade_schema, apply_performance_schema
+
+def atomic_write(file_path, write):
+    """Write a file through a temp file and rename so readers never see a partial file
+
+    `write` is called with the temp file path.
+    """
+    # The data directory is created on first write rather than at import time
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # A unique temp file per call, so concurrent writers of one file can't clobber each other's
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        os.chmod(tmp_path, 0o644)
+        write(tmp_path)
+        with open(tmp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class StorageBackend:
+    """Interface for the table storage used by data_loader.
+
+    Tables are addressed by name ('trades', 'performance'). Backends that
+    store data by column can honour `columns` and skip the rest on load.
+    """
+    name = None
+    extension = None
+    # Backends that can add rows without rewriting the table
+    supports_append = False
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+
+    def path(self, table):
+        return os.path.join(self.data_dir, table + self.extension)
+
+    def exists(self, table):
+        return os.path.exists(self.path(table))
+
+    def load(self, table, columns=None):
+        """Load a table, optionally only the given columns"""
+        raise NotImplementedError
+
+    def save(self, table, df):
+        """Replace a table with the contents of a dataframe"""
+        raise NotImplementedError
+
+    def append(self, table, df):
+        """Add rows to an existing table"""
+        raise NotImplementedError
+
+class CsvBackend(StorageBackend):
+    """Plain-text CSV files, the original storage format"""
+    name = 'csv'
+    extension = '.csv'
+
+    def load(self, table, columns=None):
+        return pd.read_csv(self.path(table), usecols=columns)
+
+    def save(self, table, df):
+        atomic_write(self.path(table), lambda path: df.to_csv(path, index=False))
+
+class ParquetBackend(StorageBackend):
+    """Compressed columnar Parquet files with column projection"""
+    name = 'parquet'
+    extension = '.parquet'
+
+    def load(self, table, columns=None):
+        return pd.read_parquet(self.path(table), columns=columns)
+
+    def save(self, table, df):
+        atomic_write(self.path(table), lambda path: df.to_parquet(path, index=False, compression='zstd'))
+
+class SqliteBackend(StorageBackend):
+    """Single-file SQLite database with indexes for per-account and per-date queries"""
+    name = 'sqlite'
+    extension = '.db'
+    supports_append = True
+    database = 'trading'
+    
+    # Indexes created on each table after it is written
+    INDEXES = {
+        'trades': [('account', 'date'), ('date',)],
+        'performance': [('account', 'date'), ('date',)]
+    }
+
+    def path(self, table=None):
+        return os.path.join(self.data_dir, self.database + self.extension)
+
+    def connect(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+        return sqlite3.connect(self.path())
+
+    @contextmanager
+    def transaction(self):
+        """Connection that commits on success, rolls back on error and is always closed"""
+        with closing(self.connect()) as conn, conn:
+            yield conn
+
+    def exists(self, table):
+        if not os.path.exists(self.path()):
+            return False
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+        return row is not None
+
+    def load(self, table, columns=None):
+        return self.query(f"SELECT {self._select_list(columns)} FROM {table}")
+
+    def save(self, table, df):
+        # The replace happens in one transaction, so readers see either the old or new table
+        with self.transaction() as conn:
+            df.to_sql(table, conn, if_exists='replace', index=False)
+            self._create_indexes(conn, table)
+
+    def append(self, table, df):
+        with self.transaction() as conn:
+            df.to_sql(table, conn, if_exists='append', index=False)
+            self._create_indexes(conn, table)
+
+    def query(self, sql, params=()):
+        """Run a SELECT and return the result as a dataframe"""
+        with self.transaction() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def query_trades(self, account=None, start_date=None, end_date=None, columns=None):
+        """Trades for an account and inclusive date range, newest first, typed like a loaded journal"""
+        where, params = self._date_filter(account, start_date, end_date)
+        return apply_trade_schema(self.query(
+            f"SELECT {self._select_list(columns)} FROM trades{where} ORDER BY date DESC, time DESC",
+            params
+        ))
+
+    def query_daily_pnl(self, account=None, start_date=None, end_date=None):
+        """Daily P&L per account for an inclusive date range, typed like loaded performance"""
+        where, params = self._date_filter(account, start_date, end_date)
+        return apply_performance_schema(self.query(
+            f"SELECT date, account, SUM(pnl) AS pnl FROM performance{where} "
+            f"GROUP BY account, date ORDER BY account, date",
+            params
+        ))
+
+    def _create_indexes(self, conn, table):
+        for columns in self.INDEXES.get(table, []):
+            name = f"idx_{table}_{'_'.join(columns)}"
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+
+    @staticmethod
+    def _select_list(columns):
+        return '*' if columns is None else ', '.join(f'"{column}"' for column in columns)
+
+    @staticmethod
+    def _date_filter(account, start_date, end_date):
+        clauses = []
+        params = []
+        if account is not None:
+            clauses.append("account = ?")
+            params.append(account)
+        if start_date is not None:
+            clauses.append("date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            clauses.append("date <= ?")
+            params.append(end_date)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+STORAGE_BACKENDS = {
+    'csv': CsvBackend,
+    'parquet': ParquetBackend,
+    'sqlite': SqliteBackend
+}
+
+def parquet_available():
+    """Check whether a Parquet engine is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def get_storage_backend(name=STORAGE_BACKEND, data_dir=DATA_DIR):
+    """Create the configured storage backend, falling back to CSV without pyarrow"""
+    if name == 'parquet' and not parquet_available():
+        name = 'csv'
+    return STORAGE_BACKENDS[name](data_dir)
+
+def migrate_from_csv(backend, tables=('trades', 'performance')):
+    """One-shot copy of existing CSV tables into another backend.
+
+    Tables the backend already holds are left alone. Returns the names of
+    the tables that were migrated.
+    """
+    source = CsvBackend(backend.data_dir)
+    migrated = []
+    for table in tables:
+        if backend.exists(table) or not source.exists(table):
+            continue
+        backend.save(table, source.load(table))
+        migrated.append(table)
+    return migrated
@@ -0,0 +1,68 @@
+import numpy as np
+
+class TradeIndex:
+    """Row index over a trade journal in (account, date, time) order.
+
+    Built once per data version. Each account maps to a contiguous slice
+    of the sorted row positions, and a date or date range within an account
+    is found by binary search. Lookups are O(1) per account and O(log N)
+    per day instead of a boolean mask over the whole journal.
+    """
+
+    def __init__(self, trades):
+        self.trades = trades
+        accounts = trades['account'].to_numpy(dtype=str)
+        dates = trades['date'].to_numpy(dtype=str)
+        times = trades['time'].to_numpy(dtype=str)
+        
+        # Stable sort by account, date, then time; `positions` maps back to journal rows
+        self.positions = np.lexsort((times, dates, accounts))
+        self._dates = dates[self.positions]
+        sorted_accounts = accounts[self.positions]
+        
+        names, starts = np.unique(sorted_accounts, return_index=True)
+        ends = np.append(starts[1:], len(sorted_accounts))
+        self._account_slices = {name: slice(int(start), int(end)) for name, start, end in zip(names, starts, ends)}
+        
+        # Running win count in sorted order, so wins in any slice are one subtraction
+        is_win = (trades['outcome'] == 'Win').to_numpy()[self.positions]
+        self._win_cumsum = np.concatenate([[0], np.cumsum(is_win)])
+
+    @property
+    def accounts(self):
+        return list(self._account_slices)
+
+    def account_slice(self, account):
+        """Slice of the sorted order holding an account's trades"""
+        return self._account_slices.get(account, slice(0, 0))
+
+    def range_slice(self, account, start_date=None, end_date=None):
+        """Slice for an account's trades in an inclusive date range"""
+        bounds = self.account_slice(account)
+        dates = self._dates[bounds]
+        lo = 0 if start_date is None else int(np.searchsorted(dates, start_date, side='left'))
+        hi = len(dates) if end_date is None else int(np.searchsorted(dates, end_date, side='right'))
+        return slice(bounds.start + lo, bounds.start + max(lo, hi))
+
+    def day_slice(self, account, date):
+        """Slice for an account's trades on one date"""
+        return self.range_slice(account, date, date)
+
+    def count(self, index_slice):
+        return index_slice.stop - index_slice.start
+
+    def win_count(self, index_slice):
+        return int(self._win_cumsum[index_slice.stop] - self._win_cumsum[index_slice.start])
+
+    def rows(self, index_slice):
+        """Materialize the journal rows of a slice, in (account, date, time) order"""
+        return self.trades.iloc[self.positions[index_slice]]
+
+    def trades_for(self, account):
+        return self.rows(self.account_slice(account))
+
+    def trades_for_day(self, account, date):
+        return self.rows(self.day_slice(account, date))
+
+    def trades_between(self, account, start_date=None, end_date=None):
+        return self.rows(self.range_slice(account, start_date, end_date))
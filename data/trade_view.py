@@ -0,0 +1,183 @@
+import math
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+# Sort options of the trade history and the journal columns each one orders by
+SORT_KEYS = {
+    'Date': ['date', 'time'],
+    'Account': ['account', 'date', 'time'],
+    'P&L': ['pnl'],
+    'R Multiple': ['r_multiple']
+}
+
+def _mean_r(totals):
+    """Mean R multiple behind rows of (account, outcome, date) totals, NaN without any"""
+    r_count = totals['r_count'].sum()
+    return totals['r_sum'].sum() / r_count if r_count > 0 else math.nan
+
+@dataclass
+class TradePage:
+    """One page of a trade history query"""
+    rows: pd.DataFrame
+    total: int
+    page: int
+    n_pages: int
+    start: int
+
+    @property
+    def end(self):
+        return self.start + len(self.rows)
+
+class TradeHistoryView:
+    """Filtered, sorted and paged access to a trade journal.
+
+    Built once per data version. Columns are factorized to integer codes,
+    filters are boolean masks over those codes and each sort order is a
+    stable argsort computed on first use, so a query never copies or
+    re-sorts the journal; only the rows of the requested page are
+    materialized. Summary metrics come from totals per (account, outcome,
+    date), which has one row per trading day and outcome rather than one
+    per trade.
+    """
+
+    def __init__(self, trades):
+        self.trades = trades
+        self._codes = {}
+        self._orders = {}
+        self._totals = None
+
+    def __len__(self):
+        return len(self.trades)
+
+    def mask(self, accounts=None, outcomes=None, start_date=None):
+        """Rows matching the filters, or None when nothing is filtered out
+
+        Empty account or outcome selections don't filter, like the
+        multiselects they come from.
+        """
+        conditions = []
+        if accounts:
+            conditions.append(self._isin('account', accounts))
+        if outcomes:
+            conditions.append(self._isin('outcome', outcomes))
+        if start_date is not None:
+            conditions.append(self._codes_of('date')[0] >= self._date_code(start_date))
+        
+        mask = None
+        for condition in conditions:
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    def order(self, sort_by='Date', descending=True):
+        """Row positions of the whole journal in sort order
+
+        Ties keep journal order and missing values sort last either way.
+        """
+        key = (sort_by, descending)
+        if key not in self._orders:
+            sign = -1 if descending else 1
+            keys = []
+            for column in SORT_KEYS[sort_by]:
+                values = self.trades[column]
+                if pd.api.types.is_numeric_dtype(values):
+                    # lexsort puts NaN last, and a sign flip keeps it NaN
+                    keys.append(sign * values.to_numpy(dtype=float, na_value=np.nan))
+                else:
+                    # Sorted codes rank the values; missing values (code -1) get a rank past the last one
+                    codes, uniques = self._codes_of(column)
+                    ranks = len(uniques) - 1 - codes if descending else codes
+                    keys.append(np.where(codes < 0, len(uniques), ranks))
+            # lexsort treats its last key as the primary one
+            self._orders[key] = np.lexsort(keys[::-1])
+        return self._orders[key]
+
+    def positions(self, accounts=None, outcomes=None, start_date=None, sort_by='Date', descending=True):
+        """Row positions of the matching trades in sort order"""
+        order = self.order(sort_by, descending)
+        mask = self.mask(accounts, outcomes, start_date)
+        return order if mask is None else order[mask[order]]
+
+    def page(self, page=1, page_size=50, columns=None, **query):
+        """One page of the matching trades; `page` is clamped to the last page"""
+        positions = self.positions(**query)
+        total = len(positions)
+        n_pages = max(math.ceil(total / page_size), 1)
+        page = min(max(int(page), 1), n_pages)
+        start = (page - 1) * page_size
+        rows = self.trades.iloc[positions[start:start + page_size]]
+        return TradePage(rows if columns is None else rows[columns], total, page, n_pages, start)
+
+    def csv(self, **query):
+        """All matching trades as CSV text, in sort order"""
+        return self.trades.iloc[self.positions(**query)].to_csv(index=False)
+
+    def summary(self, accounts=None, outcomes=None, start_date=None):
+        """Win rate, net P&L, average R and expectancy of the matching trades
+
+        Returns None when no trade matches. Averages skip trades without
+        an R multiple, as the means over the trades themselves would.
+        """
+        totals = self._outcome_totals()
+        mask = np.ones(len(totals), dtype=bool)
+        if accounts:
+            mask &= np.isin(totals['account'], self._code_list('account', accounts))
+        if outcomes:
+            mask &= np.isin(totals['outcome'], self._code_list('outcome', outcomes))
+        if start_date is not None:
+            mask &= totals['date'].to_numpy() >= self._date_code(start_date)
+        
+        selected = totals[mask]
+        total_trades = selected['trades'].sum()
+        if total_trades == 0:
+            return None
+        
+        outcome = selected['outcome'].to_numpy()
+        wins = selected[np.isin(outcome, self._code_list('outcome', ['Win']))]
+        losses = selected[np.isin(outcome, self._code_list('outcome', ['Loss']))]
+        win_rate = wins['trades'].sum() / total_trades
+        win_r = _mean_r(wins)
+        loss_r = _mean_r(losses)
+        return {
+            'win_rate': win_rate,
+            'net_pnl': selected['pnl'].sum(),
+            'avg_r': _mean_r(selected),
+            'expectancy': win_rate * win_r + (1 - win_rate) * loss_r
+        }
+
+    def _outcome_totals(self):
+        """Trade count, P&L and R totals per (account, outcome, date), built on first use"""
+        if self._totals is None:
+            r_multiple = self.trades['r_multiple'].astype(float)
+            keys = pd.DataFrame({
+                'account': self._codes_of('account')[0],
+                'outcome': self._codes_of('outcome')[0],
+                'date': self._codes_of('date')[0],
+                'trades': 1,
+                'pnl': self.trades['pnl'].to_numpy(dtype=float),
+                'r_sum': r_multiple.fillna(0.0).to_numpy(),
+                'r_count': r_multiple.notna().to_numpy(dtype=int)
+            })
+            self._totals = keys.groupby(['account', 'outcome', 'date'], sort=False)[
+                ['trades', 'pnl', 'r_sum', 'r_count']
+            ].sum().reset_index()
+        return self._totals
+
+    def _codes_of(self, column):
+        """Integer codes of a column and its sorted distinct values, built on first use"""
+        if column not in self._codes:
+            codes, uniques = pd.factorize(self.trades[column], sort=True)
+            self._codes[column] = (codes, np.asarray(uniques, dtype=object))
+        return self._codes[column]
+
+    def _code_list(self, column, values):
+        """Codes of the given values that occur in a column"""
+        values = set(values)
+        return [code for code, value in enumerate(self._codes_of(column)[1]) if value in values]
+
+    def _isin(self, column, values):
+        return np.isin(self._codes_of(column)[0], self._code_list(column, values))
+
+    def _date_code(self, date):
+        """Code of the first journal date on or after `date`"""
+        return int(np.searchsorted(self._codes_of('date')[1].astype(str), date, side='left'))
@@ -1,25 +1,26 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
 @dataclass
 class Trade:
     """Data model for a single trade"""
+    # The `dtype` metadata is the storage dtype used for the trades dataframe
     date: str
     time: str
-    account: str
-    strategy: str
-    instrument: str
-    direction: str
+    account: str = field(metadata={'dtype': 'category'})
+    strategy: str = field(metadata={'dtype': 'category'})
+    instrument: str = field(metadata={'dtype': 'category'})
+    direction: str = field(metadata={'dtype': 'category'})
     entry_price: float
     exit_price: float
     stop_loss: float
-    position_size: int
+    position_size: int = field(metadata={'dtype': 'int16'})
     pnl: float
-    r_multiple: float
-    outcome: str
-    setup_quality: int
-    execution_quality: Optional[int] = None
+    r_multiple: float = field(metadata={'dtype': 'float32'})
+    outcome: str = field(metadata={'dtype': 'category'})
+    setup_quality: int = field(metadata={'dtype': 'int8'})
+    execution_quality: Optional[int] = field(default=None, metadata={'dtype': 'int8'})
     notes: Optional[str] = None
     
     @classmethod
@@ -69,7 +70,7 @@ class Trade:
 class DailyPerformance:
     """Data model for daily performance"""
     date: str
-    account: str
+    account: str = field(metadata={'dtype': 'category'})
     pnl: float
     
     @classmethod
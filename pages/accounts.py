@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
-from utils.calculations import calculate_account_metrics, calculate_drawdown
-from utils.formatting import download_csv
+from utils.calculations import calculate_account_metrics, calculate_drawdown, calculate_intraday_drawdown, get_trade_index
+from utils.formatting import download_csv, format_metric, format_interval
+from utils.statistics import calculate_metric_intervals
+from config import BOOTSTRAP_CONFIDENCE
+from utils.builders import get_daily_log
 
 def show(account_name):
     """Display account-specific page"""
@@ -62,14 +65,13 @@ def show(account_name):
 def display_performance_metrics(account_name):
     """Display performance metrics for an account"""
     metrics = calculate_account_metrics(account_name)
+    intervals = calculate_metric_intervals(account_name) or {}
+    metric_keys = ['win_rate', 'avg_win', 'avg_loss', 'expectancy', 'profit_factor']
     
     metrics_df = pd.DataFrame({
         'Metric': ['Win Rate', 'Average Win (R)', 'Average Loss (R)', 'Expectancy', 'Profit Factor'],
-        'Value': [f"{metrics['win_rate']*100:.1f}%", 
-                 f"{metrics['avg_win']:.2f}", 
-                 f"{metrics['avg_loss']:.2f}", 
-                 f"{metrics['expectancy']:.2f}", 
-                 f"{metrics['profit_factor']:.2f}"]
+        'Value': [format_metric(key, metrics[key]) for key in metric_keys],
+        f'{BOOTSTRAP_CONFIDENCE:.0%} CI': [format_interval(key, intervals.get(key)) for key in metric_keys]
     })
     
     st.dataframe(metrics_df, use_container_width=True, hide_index=True)
@@ -77,18 +79,21 @@ def display_performance_metrics(account_name):
 def display_drawdown_tracker(account_name, account):
     """Display drawdown tracker for an account"""
     current_dd, max_dd = calculate_drawdown(account_name)
+    _, intraday_dd = calculate_intraday_drawdown(account_name)
     daily_limit = account['current_balance'] * account['daily_stop']
     weekly_limit = account['current_balance'] * account['weekly_stop']
     
-    daily_remaining = daily_limit - current_dd
+    # The daily stop is measured on today's intraday drawdown
+    daily_remaining = daily_limit - intraday_dd
     weekly_remaining = weekly_limit - current_dd
     
-    recovery_mode = "Yes" if current_dd > daily_limit * 0.75 else "No"
+    recovery_mode = "Yes" if intraday_dd > daily_limit * 0.75 else "No"
     
     dd_df = pd.DataFrame({
-        'Metric': ['Current Drawdown', 'Max Drawdown', 'Daily Remaining', 'Weekly Remaining', 'Recovery Mode'],
+        'Metric': ['Current Drawdown', 'Max Drawdown', 'Intraday Drawdown', 'Daily Remaining', 'Weekly Remaining', 'Recovery Mode'],
         'Value': [f"${current_dd:.2f} ({current_dd/account['current_balance']*100:.2f}%)", 
                  f"${max_dd:.2f} ({max_dd/account['current_balance']*100:.2f}%)", 
+                 f"${intraday_dd:.2f} ({intraday_dd/account['current_balance']*100:.2f}%)", 
                  f"${daily_remaining:.2f} ({daily_remaining/account['current_balance']*100:.2f}%)", 
                  f"${weekly_remaining:.2f} ({weekly_remaining/account['current_balance']*100:.2f}%)", 
                  recovery_mode]
@@ -98,38 +103,14 @@ def display_drawdown_tracker(account_name, account):
 
 def display_daily_performance(account_name, account):
     """Display daily performance log for an account"""
-    account_daily = st.session_state.daily_performance[
-        st.session_state.daily_performance['account'] == account_name
-    ].sort_values('date', ascending=False)
-    
-    account_trades = st.session_state.trade_journal[
-        st.session_state.trade_journal['account'] == account_name
-    ]
-    
-    daily_data = []
-    for _, day in account_daily.iterrows():
-        day_trades = account_trades[account_trades['date'] == day['date']]
-        total_trades = len(day_trades)
-        win_trades = len(day_trades[day_trades['outcome'] == 'Win'])
-        win_rate = win_trades / total_trades if total_trades > 0 else 0
-        
-        daily_data.append({
-            'Date': day['date'],
-            'P&L ($)': day['pnl'],
-            'P&L (%)': day['pnl'] / account['current_balance'] * 100,
-            '# Trades': total_trades,
-            'Win Rate': f"{win_rate*100:.1f}%",
-            'Notes': ''
-        })
-    
-    daily_df = pd.DataFrame(daily_data)
+    daily_log = get_daily_log()
+    daily_df = daily_log[daily_log['Account'] == account_name].drop(columns='Account')
     st.dataframe(daily_df, use_container_width=True, hide_index=True)
 
 def display_account_trades(account_name):
     """Display trades for a specific account"""
-    account_trades = st.session_state.trade_journal[
-        st.session_state.trade_journal['account'] == account_name
-    ].sort_values('date', ascending=False)
+    # The index holds each account's trades oldest first; reverse for newest first
+    account_trades = get_trade_index().trades_for(account_name).iloc[::-1]
     
     st.dataframe(account_trades[['date', 'time', 'strategy', 'direction', 'pnl', 'r_multiple', 
                                'outcome', 'setup_quality', 'notes']],
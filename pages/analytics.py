@@ -3,7 +3,24 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from utils.calculations import calculate_account_metrics, calculate_drawdown_statistics
+from utils.calculations import (
+    calculate_account_metrics,
+    calculate_drawdown_statistics,
+    calculate_drawdown_episodes,
+    calculate_rolling_metrics,
+    calculate_rolling_sharpe,
+    get_analytics_cube
+)
+from utils.charts import downsample_frame, line_trace
+from utils.builders import get_equity_frame
+from utils.memo import cache_figure
+from utils.statistics import (
+    calculate_strategy_comparisons,
+    describe_comparison,
+    NORMAL_APPROX_METHOD,
+    PERMUTATION_EXACT_MAX_SAMPLES,
+    SIGNIFICANCE_LEVEL
+)
 from config import STRATEGY_COLORS
 
 def show():
@@ -14,6 +31,10 @@ def show():
     st.markdown('<div class="tab-header">Strategy Comparison</div>', unsafe_allow_html=True)
     display_strategy_comparison()
     
+    # Rolling Performance
+    st.markdown('<div class="tab-header">Rolling Performance</div>', unsafe_allow_html=True)
+    display_rolling_performance()
+    
     # Win Rate Analysis
     col1, col2 = st.columns(2)
     
@@ -52,8 +73,8 @@ def display_strategy_comparison():
     """Display strategy comparison metrics"""
     # Get metrics for each strategy
     metrics_data = {}
-    for account_name in ["Account 1", "Account 2", "Account 3"]:
-        strategy = st.session_state.account_info[account_name]['strategy']
+    for account_name, account in st.session_state.account_info.items():
+        strategy = account['strategy']
         metrics_data[strategy] = calculate_account_metrics(account_name)
         
         # Add monthly return calculation
@@ -62,11 +83,21 @@ def display_strategy_comparison():
         ].sort_values('date')
         
         if not account_daily.empty:
-            monthly_return = account_daily['pnl'].sum() / st.session_state.account_info[account_name]['current_balance'] * 100
+            monthly_return = account_daily['pnl'].sum() / account['current_balance'] * 100
             metrics_data[strategy]['monthly_return'] = monthly_return
         else:
             metrics_data[strategy]['monthly_return'] = 0
     
+    # Pairwise permutation tests; each metric's analysis reports its strongest difference
+    comparisons = calculate_strategy_comparisons()
+    tests = {
+        'win_rate': ('win_rate', lambda x: f"{x*100:.1f} pts"),
+        'avg_win': ('avg_win', lambda x: f"{x:.2f}R"),
+        'avg_loss': ('avg_loss', lambda x: f"{x:.2f}R"),
+        'expectancy': ('expectancy', lambda x: f"{x:.2f}R"),
+        'monthly_return': ('daily_pnl', lambda x: f"${x:,.0f}/day")
+    }
+    
     # Create comparison dataframe
     comparison_data = []
     metrics_list = ['Win Rate', 'Average Win (R)', 'Average Loss (R)', 'Expectancy', 'Monthly Return (%)']
@@ -74,61 +105,115 @@ def display_strategy_comparison():
     for metric_name, metric_key in zip(metrics_list, ['win_rate', 'avg_win', 'avg_loss', 'expectancy', 'monthly_return']):
         row_data = {'Metric': metric_name}
         
-        for strategy in ['Hourly Quarters', '930 Strategy', 'Lab Strategy']:
+        for strategy, metrics in metrics_data.items():
             if metric_key == 'win_rate':
-                row_data[strategy] = f"{metrics_data[strategy][metric_key]*100:.1f}%"
+                row_data[strategy] = f"{metrics[metric_key]*100:.1f}%"
             elif metric_key == 'monthly_return':
-                row_data[strategy] = f"{metrics_data[strategy][metric_key]:.2f}%"
+                row_data[strategy] = f"{metrics[metric_key]:.2f}%"
             else:
-                row_data[strategy] = f"{metrics_data[strategy][metric_key]:.2f}"
+                row_data[strategy] = f"{metrics[metric_key]:.2f}"
         
-        # Add analysis column
-        if metric_name == 'Win Rate':
-            analysis = "All strategies within expected ranges"
-        elif metric_name == 'Average Win (R)':
-            analysis = "Lab strategy has highest reward potential"
-        elif metric_name == 'Average Loss (R)':
-            analysis = "All strategies maintain controlled losses"
-        elif metric_name == 'Expectancy':
-            analysis = "All strategies show positive expectancy"
-        else:
-            analysis = "Lab has highest return with highest risk"
-        
-        row_data['Analysis'] = analysis
+        test_key, format_difference = tests[metric_key]
+        row_data['Analysis'] = describe_comparison(comparisons[test_key], format_difference)
         comparison_data.append(row_data)
     
     comparison_df = pd.DataFrame(comparison_data)
     st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+    
+    with st.expander("Pairwise significance tests"):
+        test_names = {'win_rate': 'Win Rate', 'avg_win': 'Average Win (R)', 'avg_loss': 'Average Loss (R)',
+                      'expectancy': 'R per Trade', 'daily_pnl': 'Daily P&L'}
+        pairwise = [results.assign(Metric=test_names[metric]) for metric, results in comparisons.items() if not results.empty]
+        if pairwise:
+            pairwise = pd.concat(pairwise, ignore_index=True)
+            st.dataframe(
+                pairwise[['Metric', 'group_a', 'group_b', 'mean_a', 'mean_b', 'difference', 'effect_size', 'p_value', 'method']].rename(columns={
+                    'group_a': 'Strategy A', 'group_b': 'Strategy B', 'mean_a': 'Mean A', 'mean_b': 'Mean B',
+                    'difference': 'Difference', 'effect_size': "Cohen's d", 'p_value': 'p-value', 'method': 'Test'
+                }).round(4),
+                use_container_width=True,
+                hide_index=True
+            )
+        else:
+            st.info("Comparisons need at least two strategies with trades")
+        caption = f"Two-sided permutation tests on the difference in means; p < {SIGNIFICANCE_LEVEL} is reported as significant."
+        if len(pairwise) and (pairwise['method'] == NORMAL_APPROX_METHOD).any():
+            caption += (f" Pairs with more than {PERMUTATION_EXACT_MAX_SAMPLES:,} pooled observations use the normal"
+                        " approximation to the permutation distribution (see the Test column).")
+        st.caption(caption)
+
+def display_rolling_performance():
+    """Display rolling-window metrics for each strategy"""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        metric_name = st.selectbox("Metric", ['Win Rate', 'Expectancy', 'Profit Factor', 'Average R', 'Sharpe (daily)'],
+                                   key="rolling_metric")
+    
+    with col2:
+        window_type = st.radio("Window", ['Trades', 'Days'], horizontal=True, key="rolling_window_type")
+    
+    with col3:
+        window = st.number_input(f"Window Size ({window_type.lower()})", min_value=2, max_value=1000,
+                                 value=20, step=1, key="rolling_window")
+    
+    fig = rolling_performance_figure(metric_name, window_type, window)
+    if fig is None:
+        st.info("Not enough trades for the selected window yet")
+        return
+    st.plotly_chart(fig, use_container_width=True)
+
+@cache_figure
+def rolling_performance_figure(metric_name, window_type, window):
+    """Rolling metric per strategy, or None when no window is complete yet"""
+    if metric_name == 'Sharpe (daily)':
+        # Sharpe is defined on daily P&L, so the window is always in trading days
+        rolling = calculate_rolling_sharpe(window)
+        metric_key = 'sharpe'
+    else:
+        rolling = calculate_rolling_metrics(window, window_type.lower())
+        metric_key = {'Win Rate': 'win_rate', 'Expectancy': 'expectancy',
+                      'Profit Factor': 'profit_factor', 'Average R': 'avg_r'}[metric_name]
+        # One point per trading day: the window as of that day's last trade
+        rolling = rolling.drop_duplicates(['account', 'date'], keep='last')
+    
+    rolling = rolling.dropna(subset=[metric_key])
+    if rolling.empty:
+        return None
+    
+    strategies = {name: account['strategy'] for name, account in st.session_state.account_info.items()}
+    chart_df = pd.DataFrame({
+        'Date': rolling['date'],
+        'Strategy': rolling['account'].astype(str).map(strategies),
+        metric_name: rolling[metric_key]
+    })
+    
+    fig = px.line(
+        chart_df,
+        x='Date',
+        y=metric_name,
+        color='Strategy',
+        title=f'Rolling {metric_name}',
+        color_discrete_map=STRATEGY_COLORS
+    )
+    if metric_name == 'Win Rate':
+        fig.update_layout(yaxis_tickformat='.0%')
+    elif metric_name == 'Profit Factor':
+        fig.add_hline(y=1, line_dash="dash", line_color="gray", annotation_text="Break-even")
+    return fig
 
 def display_win_rate_by_day():
     """Display win rates by day of week for each strategy"""
+    st.plotly_chart(win_rate_by_day_figure(), use_container_width=True)
+
+@cache_figure
+def win_rate_by_day_figure():
+    """Win rate by day of week for each strategy"""
     # Calculate win rates by day of week for each strategy
     day_mapping = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 4: 'Friday'}
     
-    day_data = []
-    for account_name in ["Account 1", "Account 2", "Account 3"]:
-        strategy = st.session_state.account_info[account_name]['strategy']
-        account_trades = st.session_state.trade_journal[
-            st.session_state.trade_journal['account'] == account_name
-        ]
-        
-        for day_num in range(5):
-            # Convert string dates to datetime for weekday calculation
-            account_trades['datetime'] = pd.to_datetime(account_trades['date'])
-            day_trades = account_trades[account_trades['datetime'].dt.weekday == day_num]
-            
-            if len(day_trades) > 0:
-                win_rate = len(day_trades[day_trades['outcome'] == 'Win']) / len(day_trades)
-            else:
-                win_rate = 0
-            
-            day_data.append({
-                'Day': day_mapping[day_num],
-                'Strategy': strategy,
-                'Win Rate': win_rate
-            })
-    
-    day_df = pd.DataFrame(day_data)
+    day_df = strategy_breakdown('weekday', buckets=list(day_mapping))
+    day_df = day_df.assign(Day=day_df['weekday'].map(day_mapping)).rename(columns={'win_rate': 'Win Rate'})
     
     # Create bar chart
     fig = px.bar(
@@ -141,37 +226,20 @@ def display_win_rate_by_day():
         color_discrete_map=STRATEGY_COLORS
     )
     fig.update_layout(yaxis_tickformat='.0%')
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_performance_by_time():
     """Display performance by time of day for each strategy"""
+    st.plotly_chart(performance_by_time_figure(), use_container_width=True)
+
+@cache_figure
+def performance_by_time_figure():
+    """Win rate by hour of day for each strategy"""
     # Group trades by hour
-    all_trades = st.session_state.trade_journal.copy()
-    all_trades['hour'] = all_trades['time'].str.split(':').str[0].astype(int)
-    
-    time_data = []
-    for hour in sorted(all_trades['hour'].unique()):
-        hour_trades = all_trades[all_trades['hour'] == hour]
-        
-        for account_name in ["Account 1", "Account 2", "Account 3"]:
-            strategy = st.session_state.account_info[account_name]['strategy']
-            strategy_hour_trades = hour_trades[hour_trades['account'] == account_name]
-            
-            if len(strategy_hour_trades) > 0:
-                win_rate = len(strategy_hour_trades[strategy_hour_trades['outcome'] == 'Win']) / len(strategy_hour_trades)
-                avg_pnl = strategy_hour_trades['pnl'].mean()
-            else:
-                win_rate = 0
-                avg_pnl = 0
-            
-            time_data.append({
-                'Hour': f"{hour:02d}:00",
-                'Strategy': strategy,
-                'Win Rate': win_rate,
-                'Avg PnL': avg_pnl
-            })
-    
-    time_df = pd.DataFrame(time_data)
+    time_df = strategy_breakdown('hour')
+    time_df = time_df.assign(Hour=time_df['hour'].map(lambda hour: f"{hour:02d}:00")).rename(
+        columns={'win_rate': 'Win Rate', 'avg_pnl': 'Avg PnL'}
+    )
     
     # Create line chart
     fig = px.line(
@@ -184,7 +252,7 @@ def display_performance_by_time():
         color_discrete_map=STRATEGY_COLORS
     )
     fig.update_layout(yaxis_tickformat='.0%')
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_drawdown_analysis():
     """Display drawdown analysis with equity curves and statistics"""
@@ -217,41 +285,55 @@ def display_drawdown_analysis():
                 </ul>
             </div>
         """, unsafe_allow_html=True)
+    
+    display_drawdown_episodes()
+
+def display_drawdown_episodes():
+    """Display every drawdown episode with its depth and duration"""
+    episodes = calculate_drawdown_episodes()
+    if episodes.empty:
+        st.info("No drawdowns recorded yet")
+        return
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        strategies = {name: account['strategy'] for name, account in st.session_state.account_info.items()}
+        selected = st.selectbox("Strategy", ["All"] + sorted(set(strategies.values())), key="drawdown_episode_strategy")
+        min_depth = st.number_input("Minimum Depth (%)", min_value=0.0, value=0.0, step=0.5, key="drawdown_episode_depth")
+    
+    episodes = episodes.assign(strategy=episodes['account'].map(strategies))
+    if selected != "All":
+        episodes = episodes[episodes['strategy'] == selected]
+    episodes = episodes[episodes['depth_pct'] >= min_depth].sort_values('depth_pct', ascending=False)
+    
+    with col2:
+        st.markdown(f"**{len(episodes)} drawdown episodes** "
+                    f"({int(episodes['recovery'].isna().sum())} ongoing)")
+        episode_table = pd.DataFrame({
+            'Strategy': episodes['strategy'],
+            'Start': episodes['start'].dt.strftime('%Y-%m-%d'),
+            'Trough': episodes['trough'].dt.strftime('%Y-%m-%d'),
+            'Recovered': episodes['recovery'].dt.strftime('%Y-%m-%d').fillna("Ongoing"),
+            'Depth ($)': episodes['depth'].map(lambda x: f"${x:,.2f}"),
+            'Depth (%)': episodes['depth_pct'].map(lambda x: f"{x:.2f}%"),
+            'Days Under Water': episodes['days_under_water'],
+            'Recovery Days': episodes['recovery_days'].astype('Int64')
+        })
+        st.dataframe(episode_table, use_container_width=True, hide_index=True)
 
 def display_equity_and_drawdown_curves():
     """Display equity curves and drawdown visualization"""
-    # Create equity curves with drawdown visualization
-    equity_data = []
-    drawdown_data = []
+    st.plotly_chart(equity_and_drawdown_figure(), use_container_width=True)
+
+@cache_figure
+def equity_and_drawdown_figure():
+    """Equity curves above drawdown curves for each strategy"""
+    # Equity and drawdown of every account, built in one pass
+    curves = get_equity_frame()[['Date', 'Strategy', 'Equity', 'Drawdown (%)']]
     
-    for account_name in ["Account 1", "Account 2", "Account 3"]:
-        strategy = st.session_state.account_info[account_name]['strategy']
-        account_daily = st.session_state.daily_performance[
-            st.session_state.daily_performance['account'] == account_name
-        ].sort_values('date')
-        
-        if not account_daily.empty:
-            # Calculate cumulative equity and drawdown
-            initial_balance = st.session_state.account_info[account_name]['starting_balance']
-            account_daily['equity'] = initial_balance + account_daily['pnl'].cumsum()
-            account_daily['peak'] = account_daily['equity'].cummax()
-            account_daily['drawdown'] = (account_daily['peak'] - account_daily['equity']) / account_daily['peak'] * 100
-            
-            for _, row in account_daily.iterrows():
-                equity_data.append({
-                    'Date': row['date'],
-                    'Strategy': strategy,
-                    'Equity': row['equity']
-                })
-                
-                drawdown_data.append({
-                    'Date': row['date'],
-                    'Strategy': strategy,
-                    'Drawdown (%)': row['drawdown']
-                })
-    
-    equity_df = pd.DataFrame(equity_data)
-    drawdown_df = pd.DataFrame(drawdown_data)
+    # Downsample equity and drawdown together so drawdown troughs stay on the chart
+    curves = downsample_frame(curves, ['Equity', 'Drawdown (%)'], by='Strategy')
+    total_points = 2 * len(curves)
     
     # Create subplot with equity and drawdown
     fig = make_subplots(rows=2, cols=1, 
@@ -261,14 +343,14 @@ def display_equity_and_drawdown_curves():
     
     # Add equity curves
     for strategy, color in STRATEGY_COLORS.items():
-        strategy_equity = equity_df[equity_df['Strategy'] == strategy]
+        strategy_curves = curves[curves['Strategy'] == strategy]
         
-        if not strategy_equity.empty:
+        if not strategy_curves.empty:
             fig.add_trace(
-                go.Scatter(
-                    x=strategy_equity['Date'],
-                    y=strategy_equity['Equity'],
-                    mode='lines',
+                line_trace(
+                    strategy_curves['Date'],
+                    strategy_curves['Equity'],
+                    total_points,
                     name=strategy,
                     line=dict(color=color)
                 ),
@@ -277,14 +359,14 @@ def display_equity_and_drawdown_curves():
     
     # Add drawdown
     for strategy, color in STRATEGY_COLORS.items():
-        strategy_drawdown = drawdown_df[drawdown_df['Strategy'] == strategy]
+        strategy_curves = curves[curves['Strategy'] == strategy]
         
-        if not strategy_drawdown.empty:
+        if not strategy_curves.empty:
             fig.add_trace(
-                go.Scatter(
-                    x=strategy_drawdown['Date'],
-                    y=strategy_drawdown['Drawdown (%)'],
-                    mode='lines',
+                line_trace(
+                    strategy_curves['Date'],
+                    strategy_curves['Drawdown (%)'],
+                    total_points,
                     name=f"{strategy} DD",
                     line=dict(color=color, dash='dot'),
                     showlegend=False
@@ -304,31 +386,19 @@ def display_equity_and_drawdown_curves():
     # Invert y-axis for drawdown (so down is worse)
     fig.update_yaxes(autorange="reversed", row=2, col=1)
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_win_rate_by_setup_quality():
     """Display win rate by setup quality for each strategy"""
+    st.plotly_chart(win_rate_by_setup_quality_figure(), use_container_width=True)
+
+@cache_figure
+def win_rate_by_setup_quality_figure():
+    """Win rate by setup quality for each strategy"""
     # Calculate win rate by setup quality
-    setup_data = []
-    for quality in range(1, 6):
-        quality_trades = st.session_state.trade_journal[st.session_state.trade_journal['setup_quality'] == quality]
-        
-        for account_name in ["Account 1", "Account 2", "Account 3"]:
-            strategy = st.session_state.account_info[account_name]['strategy']
-            strategy_quality_trades = quality_trades[quality_trades['account'] == account_name]
-            
-            if len(strategy_quality_trades) > 0:
-                win_rate = len(strategy_quality_trades[strategy_quality_trades['outcome'] == 'Win']) / len(strategy_quality_trades)
-            else:
-                win_rate = 0
-            
-            setup_data.append({
-                'Setup Quality': quality,
-                'Strategy': strategy,
-                'Win Rate': win_rate
-            })
-    
-    setup_df = pd.DataFrame(setup_data)
+    setup_df = strategy_breakdown('setup_quality', buckets=range(1, 6)).rename(
+        columns={'setup_quality': 'Setup Quality', 'win_rate': 'Win Rate'}
+    )
     
     # Create bar chart
     fig = px.bar(
@@ -341,40 +411,17 @@ def display_win_rate_by_setup_quality():
         color_discrete_map=STRATEGY_COLORS
     )
     fig.update_layout(yaxis_tickformat='.0%')
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_profit_factor_by_month():
     """Display profit factor by month for each strategy"""
+    st.plotly_chart(profit_factor_by_month_figure(), use_container_width=True)
+
+@cache_figure
+def profit_factor_by_month_figure():
+    """Profit factor by month for each strategy"""
     # Calculate profit factor by month
-    all_trades = st.session_state.trade_journal.copy()
-    all_trades['month'] = pd.to_datetime(all_trades['date']).dt.strftime('%Y-%m')
-    
-    month_data = []
-    for month in sorted(all_trades['month'].unique()):
-        month_trades = all_trades[all_trades['month'] == month]
-        
-        for account_name in ["Account 1", "Account 2", "Account 3"]:
-            strategy = st.session_state.account_info[account_name]['strategy']
-            strategy_month_trades = month_trades[month_trades['account'] == account_name]
-            
-            if len(strategy_month_trades) > 0:
-                gross_profit = strategy_month_trades[strategy_month_trades['pnl'] > 0]['pnl'].sum()
-                gross_loss = abs(strategy_month_trades[strategy_month_trades['pnl'] < 0]['pnl'].sum())
-                
-                if gross_loss > 0:
-                    profit_factor = gross_profit / gross_loss
-                else:
-                    profit_factor = gross_profit if gross_profit > 0 else 0
-            else:
-                profit_factor = 0
-            
-            month_data.append({
-                'Month': month,
-                'Strategy': strategy,
-                'Profit Factor': profit_factor
-            })
-    
-    month_df = pd.DataFrame(month_data)
+    month_df = strategy_breakdown('month').rename(columns={'month': 'Month', 'profit_factor': 'Profit Factor'})
     
     # Create line chart
     fig = px.line(
@@ -388,7 +435,15 @@ def display_profit_factor_by_month():
     )
     fig.update_layout(yaxis_title="Profit Factor (Gross Profit / Gross Loss)")
     fig.add_hline(y=1, line_dash="dash", line_color="gray", annotation_text="Break-even")
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def strategy_breakdown(dimension, buckets=None):
+    """Per-strategy totals over one analytics cube dimension, one row per account and bucket"""
+    account_info = st.session_state.account_info
+    breakdown = get_analytics_cube().breakdown(dimension, account_info, buckets)
+    return breakdown.assign(Strategy=breakdown['account'].map(
+        {name: account['strategy'] for name, account in account_info.items()}
+    ))
 
 def display_strategy_insights():
     """Display strategy optimization insights"""
@@ -446,9 +501,7 @@ def display_business_summary():
     total_current_capital = sum(account['current_balance'] for account in st.session_state.account_info.values())
     total_profit = total_current_capital - total_starting_capital
     
-    total_trades = len(st.session_state.trade_journal)
-    win_trades = len(st.session_state.trade_journal[st.session_state.trade_journal['outcome'] == 'Win'])
-    overall_win_rate = win_trades / total_trades if total_trades > 0 else 0
+    overall_win_rate = get_analytics_cube().totals()['win_rate']
     
     avg_daily_profit = st.session_state.daily_performance.groupby('date')['pnl'].sum().mean()
     
@@ -489,19 +542,27 @@ def display_business_summary():
 
 def display_monthly_performance():
     """Display monthly performance breakdown by account"""
+    st.plotly_chart(monthly_performance_figure(), use_container_width=True)
+
+@cache_figure
+def monthly_performance_figure():
+    """Monthly P&L per account with the total line"""
     monthly_pnl = st.session_state.daily_performance.copy()
     monthly_pnl['month'] = pd.to_datetime(monthly_pnl['date']).dt.strftime('%Y-%m')
-    monthly_summary = monthly_pnl.groupby(['month', 'account'])['pnl'].sum().reset_index()
+    monthly_summary = monthly_pnl.groupby(['month', 'account'], observed=True)['pnl'].sum().reset_index()
     
-    # Pivot to get accounts as columns
-    monthly_pivot = monthly_summary.pivot(index='month', columns='account', values='pnl').reset_index()
-    monthly_pivot['Total'] = monthly_pivot[['Account 1', 'Account 2', 'Account 3']].sum(axis=1)
+    # Pivot to get accounts as columns, including accounts with no trades yet
+    accounts = list(st.session_state.account_info)
+    monthly_pivot = monthly_summary.pivot(index='month', columns='account', values='pnl')
+    monthly_pivot.columns = monthly_pivot.columns.astype(str)
+    monthly_pivot = monthly_pivot.reindex(columns=accounts, fill_value=0).reset_index()
+    monthly_pivot['Total'] = monthly_pivot[accounts].sum(axis=1)
     
     # Plot monthly performance
     fig = px.bar(
         monthly_pivot,
         x='month',
-        y=['Account 1', 'Account 2', 'Account 3'],
+        y=accounts,
         title='Monthly Performance by Account',
         barmode='group',
         color_discrete_map={'Account 1': '#34a853', 'Account 2': '#fbbc05', 'Account 3': '#ea4335'}
@@ -519,4 +580,4 @@ def display_monthly_performance():
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    return fig
\ No newline at end of file
@@ -2,8 +2,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
-from utils.calculations import calculate_account_metrics, calculate_drawdown
-from utils.formatting import account_summary_card
+from utils.calculations import calculate_account_metrics, calculate_intraday_drawdown
+from utils.formatting import account_summary_card, format_metric, format_interval
+from utils.statistics import calculate_metric_intervals
+from utils.charts import downsample_frame, render_mode
+from utils.builders import get_equity_frame, build_trade_cards
+from utils.memo import cache_figure
 
 def show():
     """Display the dashboard page"""
@@ -17,7 +21,7 @@ def show():
     
     with col2:
         account_summary_card("Account 2", "account2-header")
-        
+    
     with col3:
         account_summary_card("Account 3", "account3-header")
     
@@ -30,10 +34,11 @@ def show():
         # Calculate drawdown status for each account
         for account_name in ["Account 1", "Account 2", "Account 3"]:
             account = st.session_state.account_info[account_name]
-            current_dd, max_dd = calculate_drawdown(account_name)
+            # The daily stop applies to today's worst intraday drawdown, not cumulative drawdown
+            _, intraday_dd = calculate_intraday_drawdown(account_name)
             
             daily_limit = account['current_balance'] * account['daily_stop']
-            pct_of_limit = current_dd / daily_limit if daily_limit > 0 else 0
+            pct_of_limit = intraday_dd / daily_limit if daily_limit > 0 else 0
             
             status_class = "status-ok"
             status_text = "OK"
@@ -53,26 +58,17 @@ def show():
             """, unsafe_allow_html=True)
     
     with col2:
-        # Performance Comparison
-        metrics_comparison = {}
+        # Performance Comparison, with bootstrap confidence intervals in brackets
+        metric_keys = ['win_rate', 'avg_win', 'avg_loss', 'expectancy']
+        metrics_df = pd.DataFrame({'Metric': ['Win Rate', 'Avg Win (R)', 'Avg Loss (R)', 'Expectancy']})
         for account_name in ["Account 1", "Account 2", "Account 3"]:
-            metrics_comparison[account_name] = calculate_account_metrics(account_name)
-        
-        metrics_df = pd.DataFrame({
-            'Metric': ['Win Rate', 'Avg Win (R)', 'Avg Loss (R)', 'Expectancy'],
-            'Account 1': [f"{metrics_comparison['Account 1']['win_rate']*100:.1f}%", 
-                         f"{metrics_comparison['Account 1']['avg_win']:.2f}", 
-                         f"{metrics_comparison['Account 1']['avg_loss']:.2f}", 
-                         f"{metrics_comparison['Account 1']['expectancy']:.2f}"],
-            'Account 2': [f"{metrics_comparison['Account 2']['win_rate']*100:.1f}%", 
-                         f"{metrics_comparison['Account 2']['avg_win']:.2f}", 
-                         f"{metrics_comparison['Account 2']['avg_loss']:.2f}", 
-                         f"{metrics_comparison['Account 2']['expectancy']:.2f}"],
-            'Account 3': [f"{metrics_comparison['Account 3']['win_rate']*100:.1f}%", 
-                         f"{metrics_comparison['Account 3']['avg_win']:.2f}", 
-                         f"{metrics_comparison['Account 3']['avg_loss']:.2f}", 
-                         f"{metrics_comparison['Account 3']['expectancy']:.2f}"]
-        })
+            metrics = calculate_account_metrics(account_name)
+            intervals = calculate_metric_intervals(account_name) or {}
+            metrics_df[account_name] = [
+                f"{format_metric(key, metrics[key])} ({format_interval(key, intervals.get(key))})"
+                if key in intervals else format_metric(key, metrics[key])
+                for key in metric_keys
+            ]
         
         st.dataframe(metrics_df, use_container_width=True)
     
@@ -89,28 +85,17 @@ def show():
 
 def display_equity_curves():
     """Display equity curves for all accounts"""
-    # Create daily equity data
-    equity_data = []
-    for account_name in ["Account 1", "Account 2", "Account 3"]:
-        account_daily = st.session_state.daily_performance[
-            st.session_state.daily_performance['account'] == account_name
-        ].sort_values('date')
-        
-        # Calculate cumulative equity
-        initial_balance = st.session_state.account_info[account_name]['starting_balance']
-        account_daily['equity'] = initial_balance + account_daily['pnl'].cumsum()
-        
-        for _, row in account_daily.iterrows():
-            equity_data.append({
-                'Date': row['date'],
-                'Account': account_name,
-                'Equity': row['equity']
-            })
-    
-    equity_df = pd.DataFrame(equity_data)
+    st.plotly_chart(equity_curves_figure(), use_container_width=True)
+
+@cache_figure
+def equity_curves_figure():
+    """Equity curve of every account"""
+    # Daily equity of every account, built in one pass
+    equity_df = get_equity_frame()[['Date', 'Account', 'Equity']]
     
-    # Plot equity curve
-    fig = px.line(equity_df, x='Date', y='Equity', color='Account',
+    # Plot at most CHART_MAX_POINTS per account, switching to WebGL for large figures
+    equity_df = downsample_frame(equity_df, ['Equity'], by='Account')
+    fig = px.line(equity_df, x='Date', y='Equity', color='Account', render_mode=render_mode(len(equity_df)),
                  color_discrete_map={'Account 1': '#34a853', 'Account 2': '#fbbc05', 'Account 3': '#ea4335'})
     fig.update_layout(
         title='Account Equity Curves',
@@ -119,29 +104,24 @@ def display_equity_curves():
         legend_title='Account',
         height=400
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
 def display_recent_trades():
     """Display most recent trades"""
     # Get recent trades
     recent_trades = st.session_state.trade_journal.sort_values('date', ascending=False).head(5)
     
-    for _, trade in recent_trades.iterrows():
-        card_class = "win-trade" if trade['outcome'] == 'Win' else "loss-trade"
-        st.markdown(f"""
-            <div class="trade-card {card_class}">
-                {trade['date']} - {trade['strategy']} - {trade['outcome']} - ${trade['pnl']}
-            </div>
-        """, unsafe_allow_html=True)
-        
+    for card in build_trade_cards(recent_trades):
+        st.markdown(card, unsafe_allow_html=True)
+
 def display_risk_alerts():
     """Display risk alerts with proper contrast"""
     for account_name in ["Account 1", "Account 2", "Account 3"]:
         account = st.session_state.account_info[account_name]
-        current_dd, max_dd = calculate_drawdown(account_name)
+        _, intraday_dd = calculate_intraday_drawdown(account_name)
         
         daily_limit = account['current_balance'] * account['daily_stop']
-        pct_of_limit = current_dd / daily_limit if daily_limit > 0 else 0
+        pct_of_limit = intraday_dd / daily_limit if daily_limit > 0 else 0
         
         status_class = "status-ok"
         status_text = "OK"
@@ -2,7 +2,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import math
-from utils.calculations import calculate_drawdown, calculate_correlation_matrix
+import numpy as np
+from config import CORRELATION_MAX_FRAMES, MONTE_CARLO_PATHS, MONTE_CARLO_MAX_LOSS, MONTE_CARLO_MAX_TRADES_PER_DAY
+from utils.calculations import calculate_intraday_drawdown, calculate_correlation_matrix, calculate_rolling_correlation, get_trade_index
+from utils.monte_carlo import calculate_monte_carlo, account_trades_per_day
+from utils.memo import cache_figure
+from utils.profiling import timed
 
 def show():
     """Display the risk calculator page"""
@@ -11,6 +16,28 @@ def show():
     # Position Size Calculator
     st.markdown('<div class="tab-header">Position Size Calculator</div>', unsafe_allow_html=True)
     
+    display_position_size_calculator()
+    
+    # Drawdown Monitor
+    st.markdown('<div class="tab-header">Drawdown Monitor</div>', unsafe_allow_html=True)
+    display_drawdown_monitor()
+    
+    # Recovery Calculator
+    st.markdown('<div class="tab-header">Recovery Calculator</div>', unsafe_allow_html=True)
+    display_recovery_calculator()
+    
+    # Monte Carlo Projection
+    st.markdown('<div class="tab-header">Monte Carlo Projection</div>', unsafe_allow_html=True)
+    display_monte_carlo()
+    
+    # Correlation Matrix
+    st.markdown('<div class="tab-header">Strategy Correlation</div>', unsafe_allow_html=True)
+    display_correlation_matrix()
+
+@st.fragment
+@timed("interaction: position size calculator")
+def display_position_size_calculator():
+    """Display the position size calculator; its inputs rerun only this fragment"""
     col1, col2 = st.columns(2)
     
     with col1:
@@ -37,28 +64,17 @@ def show():
             
             st.success(f"Position Size: {position_size} contracts")
             st.info(f"Actual Risk: ${total_risk:,.2f} ({total_risk/account_balance*100:.2f}%)")
-    
-    # Drawdown Monitor
-    st.markdown('<div class="tab-header">Drawdown Monitor</div>', unsafe_allow_html=True)
-    display_drawdown_monitor()
-    
-    # Recovery Calculator
-    st.markdown('<div class="tab-header">Recovery Calculator</div>', unsafe_allow_html=True)
-    display_recovery_calculator()
-    
-    # Correlation Matrix
-    st.markdown('<div class="tab-header">Strategy Correlation</div>', unsafe_allow_html=True)
-    display_correlation_matrix()
 
 def display_drawdown_monitor():
     """Display drawdown monitor for all accounts"""
     drawdown_data = []
     for account_name in ["Account 1", "Account 2", "Account 3"]:
         account = st.session_state.account_info[account_name]
-        current_dd, max_dd = calculate_drawdown(account_name)
+        # Today's worst peak-to-trough drawdown, which is what the daily stop is measured on
+        current_dd, intraday_dd = calculate_intraday_drawdown(account_name)
         
         daily_limit = account['current_balance'] * account['daily_stop']
-        pct_of_limit = current_dd / daily_limit if daily_limit > 0 else 0
+        pct_of_limit = intraday_dd / daily_limit if daily_limit > 0 else 0
         
         if pct_of_limit > 0.75:
             status = "WARNING"
@@ -72,7 +88,8 @@ def display_drawdown_monitor():
         
         drawdown_data.append({
             'Account': account_name,
-            'Current DD': f"${current_dd:.2f} ({current_dd/account['current_balance']*100:.2f}%)",
+            'Intraday DD': f"${current_dd:.2f} ({current_dd/account['current_balance']*100:.2f}%)",
+            'Worst Today': f"${intraday_dd:.2f} ({intraday_dd/account['current_balance']*100:.2f}%)",
             'Daily Limit': f"${daily_limit:.2f} ({account['daily_stop']*100:.1f}%)",
             'Status': f'<div class="{status_class}">{status}</div>',
             'Pct_of_Limit': pct_of_limit
@@ -84,21 +101,23 @@ def display_drawdown_monitor():
     drawdown_df = drawdown_df.sort_values('Pct_of_Limit', ascending=False)
     
     # Format the status column without HTML (remove the HTML tags)
-    display_df = drawdown_df[['Account', 'Current DD', 'Daily Limit', 'Status']].copy()
+    display_df = drawdown_df[['Account', 'Intraday DD', 'Worst Today', 'Daily Limit', 'Status']].copy()
     display_df['Status'] = display_df['Status'].str.extract(r'>([A-Z]+)<')
     
     # Display without the hidden column
     st.dataframe(display_df, use_container_width=True, hide_index=True)
 
+@st.fragment
+@timed("interaction: recovery calculator")
 def display_recovery_calculator():
     """Display recovery calculator for accounts approaching limits"""
     # Get drawdown data
     drawdown_data = []
     for account_name in ["Account 1", "Account 2", "Account 3"]:
         account = st.session_state.account_info[account_name]
-        current_dd, _ = calculate_drawdown(account_name)
+        _, intraday_dd = calculate_intraday_drawdown(account_name)
         daily_limit = account['current_balance'] * account['daily_stop']
-        pct_of_limit = current_dd / daily_limit if daily_limit > 0 else 0
+        pct_of_limit = intraday_dd / daily_limit if daily_limit > 0 else 0
         
         drawdown_data.append({
             'Account': account_name,
@@ -119,14 +138,14 @@ def display_recovery_calculator():
                                      key="recovery_account")
         
         account = st.session_state.account_info[recovery_account]
-        current_dd, _ = calculate_drawdown(recovery_account)
+        _, intraday_dd = calculate_intraday_drawdown(recovery_account)
         daily_limit = account['current_balance'] * account['daily_stop']
         
-        current_dd_pct = current_dd / account['current_balance'] * 100
+        intraday_dd_pct = intraday_dd / account['current_balance'] * 100
         daily_limit_pct = account['daily_stop'] * 100
-        pct_of_limit = current_dd / daily_limit if daily_limit > 0 else 0
+        pct_of_limit = intraday_dd / daily_limit if daily_limit > 0 else 0
         
-        st.info(f"Current Drawdown: ${current_dd:.2f} ({current_dd_pct:.2f}%)")
+        st.info(f"Today's Intraday Drawdown: ${intraday_dd:.2f} ({intraday_dd_pct:.2f}%)")
         st.info(f"Daily Limit: ${daily_limit:.2f} ({daily_limit_pct:.2f}%)")
         st.info(f"Percentage Used: {pct_of_limit*100:.1f}%")
         
@@ -175,22 +194,91 @@ def display_recovery_calculator():
         reduced_risk_amount = account['current_balance'] * reduced_risk
         st.success(f"Recommended Risk Amount: ${reduced_risk_amount:.2f} ({reduced_risk*100:.2f}% per trade)")
 
+@st.fragment
+@timed("interaction: monte carlo")
+def display_monte_carlo():
+    """Display simulated risk of ruin and balance projection for an account"""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        mc_account = st.selectbox("Account", list(st.session_state.account_info), key="mc_account")
+        method = st.radio("R Distribution", ["Historical", "Normal Fit"], horizontal=True, key="mc_method")
+    
+    with col2:
+        n_trades = st.number_input("Trades to Simulate", min_value=10, max_value=1000, value=100, step=10, key="mc_trades")
+        trades_per_day = st.number_input("Trades Per Day", min_value=1, max_value=MONTE_CARLO_MAX_TRADES_PER_DAY,
+                                         value=account_trades_per_day(get_trade_index().trades_for(mc_account)),
+                                         step=1, key=f"mc_trades_per_day_{mc_account}")
+    
+    with col3:
+        target_pct = st.number_input("Profit Target (%)", min_value=1.0, max_value=100.0, value=10.0, step=1.0,
+                                     key="mc_target") / 100
+        n_paths = st.select_slider("Simulated Paths", options=[10000, 25000, 50000, 100000, 250000],
+                                   value=MONTE_CARLO_PATHS, key="mc_paths")
+    
+    simulation = (mc_account, int(n_trades), int(trades_per_day), target_pct, n_paths,
+                  'bootstrap' if method == "Historical" else 'normal')
+    result = calculate_monte_carlo(*simulation)
+    if result is None:
+        st.info("Monte Carlo projection needs at least two trades with an R multiple for this account")
+        return
+    
+    account = st.session_state.account_info[mc_account]
+    max_loss = account.get('max_loss', MONTE_CARLO_MAX_LOSS)
+    
+    metric_cols = st.columns(4)
+    with metric_cols[0]:
+        st.metric(f"Daily Stop Hit ({account['daily_stop']*100:.1f}%)", f"{result.daily_stop_prob*100:.1f}%")
+    with metric_cols[1]:
+        st.metric(f"Weekly Stop Hit ({account['weekly_stop']*100:.1f}%)", f"{result.weekly_stop_prob*100:.1f}%")
+    with metric_cols[2]:
+        st.metric(f"Max Loss Breach ({max_loss*100:.0f}%)", f"{result.max_loss_prob*100:.2f}%")
+    with metric_cols[3]:
+        days = result.expected_days_to_target
+        st.metric(f"Reach +{target_pct*100:.0f}% Target", f"{result.target_prob*100:.1f}%",
+                  f"~{days:.0f} trading days" if not np.isnan(days) else "not reached", delta_color="off")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.plotly_chart(monte_carlo_figure(*simulation), use_container_width=True)
+    
+    with col2:
+        balances = result.balance_percentiles
+        percentiles = pd.DataFrame({
+            'Percentile': [f"{p}th" for p in balances],
+            'Balance': [f"${balance:,.2f}" for balance in balances.values()]
+        })
+        st.dataframe(percentiles, use_container_width=True, hide_index=True)
+
+@cache_figure
+def monte_carlo_figure(account_name, n_trades, trades_per_day, target_pct, n_paths, method):
+    """Histogram of simulated final balances"""
+    result = calculate_monte_carlo(account_name, n_trades, trades_per_day, target_pct, n_paths, method)
+    account = st.session_state.account_info[account_name]
+    
+    # Plot the binned final balances rather than sending every path to the browser
+    edges = result.balance_edges
+    histogram = pd.DataFrame({'Balance': (edges[:-1] + edges[1:]) / 2, 'Paths': result.balance_counts / result.n_paths})
+    fig = px.bar(histogram, x='Balance', y='Paths',
+                 title=f"Balance After {result.n_trades} Trades ({result.n_paths:,} paths)")
+    fig.update_traces(marker_color=account.get('color', '#4285f4'))
+    fig.update_layout(yaxis_tickformat='.1%', bargap=0)
+    fig.add_vline(x=account['current_balance'], line_dash="dash", line_color="gray", annotation_text="Current")
+    return fig
+
 def display_correlation_matrix():
     """Display correlation matrix between strategies"""
     # Calculate correlation matrix
-    corr_matrix, avg_correlation = calculate_correlation_matrix()
+    _, avg_correlation = calculate_correlation_matrix()
     
-    # Create a heatmap
-    fig = px.imshow(
-        corr_matrix,
-        text_auto=True,
-        color_continuous_scale="RdBu_r",
-        zmin=-1,
-        zmax=1,
-        title="Strategy Correlation Matrix"
-    )
-    fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    if np.isnan(avg_correlation):
+        st.info("Correlation needs at least two strategies with trading history")
+        return
+    
+    st.plotly_chart(correlation_figure(), use_container_width=True)
+    
+    display_rolling_correlation()
     
     # Correlation analysis
     if avg_correlation < 0.3:
@@ -214,4 +302,62 @@ def display_correlation_matrix():
                 This reduces the risk management benefits of strategy separation.
                 Consider revising your strategies to focus on different market conditions or timeframes.
             </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
+
+@cache_figure
+def correlation_figure():
+    """Heatmap of the correlation between strategies' daily P&L"""
+    corr_matrix, _ = calculate_correlation_matrix()
+    fig = px.imshow(
+        corr_matrix,
+        text_auto=True,
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+        title="Strategy Correlation Matrix"
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.fragment
+@timed("interaction: rolling correlation")
+def display_rolling_correlation():
+    """Display how the correlation between strategies evolves over time"""
+    window = st.number_input("Rolling Window (trading days)", min_value=5, max_value=250, value=30, step=5,
+                             key="correlation_window")
+    fig = rolling_correlation_figure(window)
+    
+    if fig is None:
+        st.info(f"Rolling correlation needs at least {window} trading days")
+        return
+    st.plotly_chart(fig, use_container_width=True)
+
+@cache_figure
+def rolling_correlation_figure(window):
+    """Animated rolling correlation heatmap, or None without a complete window"""
+    dates, strategies, rolling_corr = calculate_rolling_correlation(window)
+    if len(dates) == 0:
+        return None
+    
+    # Sample long histories down to a fixed number of frames, always keeping the latest window
+    frames = np.unique(np.linspace(0, len(dates) - 1, min(len(dates), CORRELATION_MAX_FRAMES)).round().astype(int))
+    
+    fig = px.imshow(
+        np.round(rolling_corr[frames], 2),
+        x=strategies,
+        y=strategies,
+        animation_frame=0,
+        text_auto=True,
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+        title=f"Rolling {window}-Day Strategy Correlation"
+    )
+    # Label the animation steps with the date each window ends on (a single frame has no slider)
+    if fig.layout.sliders:
+        slider = fig.layout.sliders[0]
+        slider.currentvalue.prefix = "Window ending "
+        for step, frame in zip(slider.steps, frames):
+            step.label = str(dates[frame])
+    fig.update_layout(height=450)
+    return fig
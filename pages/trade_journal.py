@@ -1,10 +1,16 @@
 import streamlit as st
 import pandas as pd
+import functools
 from datetime import datetime, timedelta
 import math
-from config import INSTRUMENT_POINT_VALUES
-from utils.formatting import download_csv
-from utils.calculations import calculate_point_value
+from config import INSTRUMENT_POINT_VALUES, TRADE_HISTORY_PAGE_SIZES
+from utils.calculations import calculate_point_value, get_trade_history_view
+from data.trade_view import SORT_KEYS
+from data.persistence import get_persistence_manager
+from data.schema import concat_trades
+from data.equity_state import apply_trade
+from utils.memo import bump_data_version
+from utils.profiling import timed
 
 def show():
     """Display the trade journal page"""
@@ -13,6 +19,16 @@ def show():
     # Add New Trade Form
     st.markdown('<div class="tab-header">Add New Trade</div>', unsafe_allow_html=True)
     
+    display_add_trade_form()
+    
+    # Trade History
+    st.markdown('<div class="tab-header">Trade History</div>', unsafe_allow_html=True)
+    display_trade_history()
+
+@st.fragment
+@timed("interaction: add trade form")
+def display_add_trade_form():
+    """Display the new trade form; editing its fields reruns only this fragment"""
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -78,40 +94,34 @@ def show():
             }
             
             # Add to the trade journal
-            st.session_state.trade_journal = pd.concat([pd.DataFrame([new_trade]), st.session_state.trade_journal], 
-                                                     ignore_index=True)
-            
-            # Update the daily performance
-            today = trade_date.strftime('%Y-%m-%d')
-            
-            # Check if there's already an entry for this date and account
-            mask = (st.session_state.daily_performance['date'] == today) & \
-                  (st.session_state.daily_performance['account'] == trade_account)
+            st.session_state.trade_journal = concat_trades([pd.DataFrame([new_trade]), st.session_state.trade_journal])
             
-            if mask.any():
-                # Update existing entry
-                st.session_state.daily_performance.loc[mask, 'pnl'] += trade_pnl
-            else:
-                # Add new entry
-                new_day = {
-                    'date': today,
-                    'account': trade_account,
-                    'pnl': trade_pnl
-                }
-                st.session_state.daily_performance = pd.concat([pd.DataFrame([new_day]), 
-                                                              st.session_state.daily_performance], 
-                                                             ignore_index=True)
+            # Update the daily performance view; only this trade's (account, date) total changes
+            st.session_state.daily_view.add_trade(new_trade)
+            st.session_state.daily_performance = st.session_state.daily_view.frame()
+            apply_trade(st.session_state.equity_state, st.session_state.daily_performance, new_trade)
             
             # Update account balance
             st.session_state.account_info[trade_account]['current_balance'] += trade_pnl
+            bump_data_version()
+            
+            # Persist in the background: the trade goes to the append-only log
+            persistence = get_persistence_manager()
+            persistence.log_trade(new_trade)
+            persistence.mark_dirty('daily_performance', st.session_state.daily_performance)
+            persistence.mark_dirty('account_info', st.session_state.account_info)
+            persistence.mark_dirty('equity_state', st.session_state.equity_state)
             
             st.success("Trade added successfully!")
             st.rerun()
         else:
             st.error("Please fill in all required fields (Entry, Exit, Stop Loss)")
-    
-    # Trade History
-    st.markdown('<div class="tab-header">Trade History</div>', unsafe_allow_html=True)
+
+@st.fragment
+@timed("interaction: trade history")
+def display_trade_history():
+    """Display one page of the filtered and sorted trade history with its summary"""
+    view = get_trade_history_view()
     
     # Filter options
     col1, col2, col3 = st.columns(3)
@@ -130,15 +140,7 @@ def show():
         date_options = ["All Time", "This Week", "This Month", "Last 30 Days"]
         filter_date = st.selectbox("Filter by Date", options=date_options)
     
-    # Apply filters
-    filtered_trades = st.session_state.trade_journal.copy()
-    
-    if filter_account:
-        filtered_trades = filtered_trades[filtered_trades['account'].isin(filter_account)]
-    
-    if filter_outcome:
-        filtered_trades = filtered_trades[filtered_trades['outcome'].isin(filter_outcome)]
-    
+    start_date = None
     if filter_date != "All Time":
         today = datetime.now().date()
         if filter_date == "This Week":
@@ -147,43 +149,59 @@ def show():
             start_date = today.replace(day=1).strftime('%Y-%m-%d')
         elif filter_date == "Last 30 Days":
             start_date = (today - timedelta(days=30)).strftime('%Y-%m-%d')
-        
-        filtered_trades = filtered_trades[filtered_trades['date'] >= start_date]
+    filters = {'accounts': tuple(filter_account), 'outcomes': tuple(filter_outcome), 'start_date': start_date}
+    
+    # Sorting and paging options
+    col1, col2, col3, col4 = st.columns(4)
     
-    # Sort by date descending
-    filtered_trades = filtered_trades.sort_values('date', ascending=False)
+    with col1:
+        sort_by = st.selectbox("Sort by", options=list(SORT_KEYS), key="history_sort")
+    
+    with col2:
+        descending = st.radio("Order", ["Descending", "Ascending"], horizontal=True, key="history_order") == "Descending"
     
-    # Show the dataframe with styling
-    st.dataframe(
-        filtered_trades[['date', 'time', 'account', 'strategy', 'instrument', 'direction', 
-                      'entry_price', 'exit_price', 'pnl', 'r_multiple', 'outcome', 'notes']],
-        use_container_width=True,
-        hide_index=True
+    with col3:
+        page_size = st.selectbox("Rows per page", options=TRADE_HISTORY_PAGE_SIZES, key="history_page_size")
+    
+    with col4:
+        page_number = st.number_input("Page", min_value=1, value=1, step=1, key="history_page")
+    
+    # Only the visible page of the journal is materialized
+    page = view.page(
+        page_number,
+        page_size,
+        columns=['date', 'time', 'account', 'strategy', 'instrument', 'direction',
+                 'entry_price', 'exit_price', 'pnl', 'r_multiple', 'outcome', 'notes'],
+        sort_by=sort_by,
+        descending=descending,
+        **filters
     )
+    st.dataframe(page.rows, use_container_width=True, hide_index=True)
+    if page.total:
+        st.caption(f"Showing {page.start + 1:,}–{page.end:,} of {page.total:,} trades (page {page.page} of {page.n_pages})")
     
     # Summary metrics for filtered trades
-    if not filtered_trades.empty:
+    summary = view.summary(**filters)
+    if summary is not None:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_trades = len(filtered_trades)
-            win_trades = len(filtered_trades[filtered_trades['outcome'] == 'Win'])
-            win_rate = win_trades / total_trades if total_trades > 0 else 0
-            st.metric("Win Rate", f"{win_rate*100:.1f}%")
+            st.metric("Win Rate", f"{summary['win_rate']*100:.1f}%")
         
         with col2:
-            net_pnl = filtered_trades['pnl'].sum()
-            st.metric("Net P&L", f"${net_pnl:.2f}")
+            st.metric("Net P&L", f"${summary['net_pnl']:.2f}")
         
         with col3:
-            avg_r = filtered_trades['r_multiple'].mean()
-            st.metric("Average R", f"{avg_r:.2f}")
+            st.metric("Average R", f"{summary['avg_r']:.2f}")
         
         with col4:
-            win_r = filtered_trades[filtered_trades['outcome'] == 'Win']['r_multiple'].mean()
-            loss_r = filtered_trades[filtered_trades['outcome'] == 'Loss']['r_multiple'].mean()
-            expectancy = (win_rate * win_r) + ((1 - win_rate) * loss_r)
-            st.metric("Expectancy", f"{expectancy:.2f}")
-    
-    # Download option
-    st.markdown(download_csv(filtered_trades, "trade_journal"), unsafe_allow_html=True)
\ No newline at end of file
+            st.metric("Expectancy", f"{summary['expectancy']:.2f}")
+    
+    # The CSV of every filtered trade is only built when the button is clicked
+    st.download_button(
+        "Download CSV",
+        data=functools.partial(view.csv, sort_by=sort_by, descending=descending, **filters),
+        file_name="trade_journal.csv",
+        mime="text/csv",
+        on_click="ignore"
+    )
\ No newline at end of file
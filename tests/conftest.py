@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.schema import apply_trade_schema
+
+ACCOUNTS = ['Account 1', 'Account 2', 'Account 3']
+STRATEGIES = ['Hourly Quarters', 'Gap Fill', 'Opening Range']
+
+def make_trades(n=300, seed=7):
+    """A journal of `n` random trades over three accounts, in date order"""
+    rng = np.random.default_rng(seed)
+    accounts = rng.integers(0, len(ACCOUNTS), n)
+    days = pd.Timestamp('2025-01-02') + pd.to_timedelta(np.sort(rng.integers(0, 180, n)), unit='D')
+    minutes = rng.integers(9 * 60 + 30, 16 * 60, n)
+    outcomes = rng.choice(['Win', 'Loss', 'Breakeven'], n, p=[0.5, 0.4, 0.1])
+    r_multiple = np.where(outcomes == 'Win', rng.uniform(0.5, 3, n), np.where(outcomes == 'Loss', -1.0, 0.0)).round(2)
+    trades = pd.DataFrame({
+        'date': days.strftime('%Y-%m-%d'),
+        'time': [f"{m // 60:02d}:{m % 60:02d}" for m in minutes],
+        'account': np.array(ACCOUNTS)[accounts],
+        'strategy': np.array(STRATEGIES)[accounts],
+        'instrument': rng.choice(['ES', 'NQ', 'YM'], n),
+        'direction': rng.choice(['Long', 'Short'], n),
+        'entry_price': 4700.0,
+        'exit_price': 4710.0,
+        'stop_loss': 4690.0,
+        'position_size': 1,
+        'pnl': (r_multiple * 500).round(2),
+        'r_multiple': r_multiple,
+        'outcome': outcomes,
+        'setup_quality': 3,
+        'execution_quality': 3,
+        'notes': ''
+    })
+    return apply_trade_schema(trades)
+
+def make_account_info():
+    return {
+        account: {
+            'name': account, 'strategy': strategy, 'starting_balance': 150000.0, 'current_balance': 150000.0,
+            'risk_per_trade': 0.01, 'daily_stop': 0.02, 'weekly_stop': 0.05
+        }
+        for account, strategy in zip(ACCOUNTS, STRATEGIES)
+    }
+
+@pytest.fixture
+def trades():
+    return make_trades()
+
+@pytest.fixture
+def account_info():
+    return make_account_info()
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run in an empty directory, so the relative DATA_DIR is a fresh data store"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path / 'data_storage'
+
+@pytest.fixture
+def persistence(data_dir, monkeypatch):
+    """A fresh process-wide persistence manager writing to `data_dir`, flushed before leaving it"""
+    from data import persistence as persistence_module
+    manager = persistence_module.PersistenceManager(flush_interval=0.05)
+    monkeypatch.setattr(persistence_module, '_manager', manager)
+    yield manager
+    manager.shutdown()
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.analytics_cube import AnalyticsCube
+from tests.conftest import ACCOUNTS
+
+# Per-bucket filters of the analytics page before the cube, kept as references
+
+def baseline_win_rate_by_day(trades):
+    rows = []
+    for day_num in range(5):
+        for account_name in ACCOUNTS:
+            account_trades = trades[trades['account'] == account_name].copy()
+            account_trades['datetime'] = pd.to_datetime(account_trades['date'])
+            day_trades = account_trades[account_trades['datetime'].dt.weekday == day_num]
+            win_rate = len(day_trades[day_trades['outcome'] == 'Win']) / len(day_trades) if len(day_trades) > 0 else 0
+            rows.append((account_name, day_num, win_rate))
+    return rows
+
+def baseline_win_rate_by_hour(trades):
+    trades = trades.copy()
+    trades['hour'] = trades['time'].str.split(':').str[0].astype(int)
+    rows = []
+    for hour in sorted(trades['hour'].unique()):
+        hour_trades = trades[trades['hour'] == hour]
+        for account_name in ACCOUNTS:
+            account_trades = hour_trades[hour_trades['account'] == account_name]
+            if len(account_trades) > 0:
+                win_rate = len(account_trades[account_trades['outcome'] == 'Win']) / len(account_trades)
+                avg_pnl = account_trades['pnl'].mean()
+            else:
+                win_rate = avg_pnl = 0
+            rows.append((account_name, hour, win_rate, avg_pnl))
+    return rows
+
+def baseline_win_rate_by_setup_quality(trades):
+    rows = []
+    for quality in range(1, 6):
+        quality_trades = trades[trades['setup_quality'] == quality]
+        for account_name in ACCOUNTS:
+            account_trades = quality_trades[quality_trades['account'] == account_name]
+            win_rate = len(account_trades[account_trades['outcome'] == 'Win']) / len(account_trades) if len(account_trades) > 0 else 0
+            rows.append((account_name, quality, win_rate))
+    return rows
+
+def baseline_profit_factor_by_month(trades):
+    trades = trades.copy()
+    trades['month'] = pd.to_datetime(trades['date']).dt.strftime('%Y-%m')
+    rows = []
+    for month in sorted(trades['month'].unique()):
+        month_trades = trades[trades['month'] == month]
+        for account_name in ACCOUNTS:
+            account_trades = month_trades[month_trades['account'] == account_name]
+            profit_factor = 0
+            if len(account_trades) > 0:
+                gross_profit = account_trades[account_trades['pnl'] > 0]['pnl'].sum()
+                gross_loss = abs(account_trades[account_trades['pnl'] < 0]['pnl'].sum())
+                profit_factor = gross_profit / gross_loss if gross_loss > 0 else gross_profit
+            rows.append((account_name, month, profit_factor))
+    return rows
+
+def rows_of(breakdown, *columns):
+    return list(breakdown[['account', *columns]].itertuples(index=False, name=None))
+
+def assert_rows_equal(actual, expected):
+    actual, expected = sorted(actual), sorted(expected)
+    assert [row[:2] for row in actual] == [row[:2] for row in expected]
+    np.testing.assert_allclose(np.array([row[2:] for row in actual], dtype=float),
+                               np.array([row[2:] for row in expected], dtype=float), rtol=1e-9)
+
+@pytest.fixture
+def trades(trades):
+    rng = np.random.default_rng(9)
+    return trades.assign(setup_quality=rng.integers(1, 6, len(trades)).astype('int8'))
+
+@pytest.fixture
+def untimed(trades):
+    """The same journal with some trades' times missing or malformed"""
+    trades = trades.copy()
+    trades.loc[trades.index[::9], 'timestamp'] = pd.NaT
+    return trades
+
+def test_weekday_win_rate(untimed):
+    cube = AnalyticsCube(untimed)
+    actual = rows_of(cube.breakdown('weekday', ACCOUNTS, range(5)), 'weekday', 'win_rate')
+    assert_rows_equal(actual, baseline_win_rate_by_day(untimed))
+
+def test_hourly_win_rate(trades):
+    cube = AnalyticsCube(trades)
+    actual = rows_of(cube.breakdown('hour', ACCOUNTS), 'hour', 'win_rate', 'avg_pnl')
+    assert_rows_equal(actual, baseline_win_rate_by_hour(trades))
+
+def test_untimed_trades_only_leave_the_hourly_rollup(untimed):
+    cube = AnalyticsCube(untimed)
+    assert cube.rollup('hour')['trades'].sum() == untimed['timestamp'].notna().sum()
+    assert cube.rollup('weekday')['trades'].sum() == len(untimed)
+    assert cube.rollup('month')['trades'].sum() == len(untimed)
+
+def test_setup_quality_win_rate(untimed):
+    cube = AnalyticsCube(untimed)
+    actual = rows_of(cube.breakdown('setup_quality', ACCOUNTS, range(1, 6)), 'setup_quality', 'win_rate')
+    assert_rows_equal(actual, baseline_win_rate_by_setup_quality(untimed))
+
+def test_monthly_profit_factor(untimed):
+    cube = AnalyticsCube(untimed)
+    actual = rows_of(cube.breakdown('month', ACCOUNTS), 'month', 'profit_factor')
+    assert_rows_equal(actual, baseline_profit_factor_by_month(untimed))
+
+def test_totals(trades):
+    totals = AnalyticsCube(trades).totals()
+    assert totals['trades'] == len(trades)
+    assert totals['win_rate'] == pytest.approx((trades['outcome'] == 'Win').mean())
+    assert totals['pnl'] == pytest.approx(trades['pnl'].sum())
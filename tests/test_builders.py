@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from data.daily_view import DailyPerformanceView
+from utils.builders import build_equity_frame, build_daily_log, build_trade_cards
+from tests.conftest import ACCOUNTS
+
+# The loops below are the page code the builders replaced, kept as references
+
+def baseline_equity(performance, account_info):
+    equity_data = []
+    for account_name in ACCOUNTS:
+        account_daily = performance[performance['account'] == account_name].sort_values('date')
+        if not account_daily.empty:
+            initial_balance = account_info[account_name]['starting_balance']
+            account_daily['equity'] = initial_balance + account_daily['pnl'].cumsum()
+            account_daily['peak'] = account_daily['equity'].cummax()
+            account_daily['drawdown'] = (account_daily['peak'] - account_daily['equity']) / account_daily['peak'] * 100
+            for _, row in account_daily.iterrows():
+                equity_data.append({
+                    'Date': row['date'],
+                    'Account': account_name,
+                    'Strategy': account_info[account_name]['strategy'],
+                    'Equity': row['equity'],
+                    'Drawdown (%)': row['drawdown']
+                })
+    return pd.DataFrame(equity_data)
+
+def baseline_daily_log(performance, trades, account_name, account):
+    account_daily = performance[performance['account'] == account_name].sort_values('date', ascending=False)
+    account_trades = trades[trades['account'] == account_name]
+    daily_data = []
+    for _, day in account_daily.iterrows():
+        day_trades = account_trades[account_trades['date'] == day['date']]
+        total_trades = len(day_trades)
+        win_trades = len(day_trades[day_trades['outcome'] == 'Win'])
+        win_rate = win_trades / total_trades if total_trades > 0 else 0
+        daily_data.append({
+            'Date': day['date'],
+            'P&L ($)': day['pnl'],
+            'P&L (%)': day['pnl'] / account['current_balance'] * 100,
+            '# Trades': total_trades,
+            'Win Rate': f"{win_rate*100:.1f}%",
+            'Notes': ''
+        })
+    return pd.DataFrame(daily_data)
+
+def baseline_trade_cards(trades):
+    cards = []
+    for _, trade in trades.iterrows():
+        card_class = "win-trade" if trade['outcome'] == 'Win' else "loss-trade"
+        cards.append(f"""
+            <div class="trade-card {card_class}">
+                {trade['date']} - {trade['strategy']} - {trade['outcome']} - ${trade['pnl']}
+            </div>
+        """)
+    return cards
+
+@pytest.fixture
+def performance(trades):
+    return DailyPerformanceView.from_trades(trades).frame()
+
+def test_equity_frame_matches_baseline(performance, account_info):
+    pd.testing.assert_frame_equal(build_equity_frame(performance, account_info), baseline_equity(performance, account_info))
+
+def test_equity_frame_skips_accounts_without_days(performance, account_info):
+    performance = performance[performance['account'] != 'Account 2']
+    equity = build_equity_frame(performance, account_info)
+    assert 'Account 2' not in set(equity['Account'])
+    pd.testing.assert_frame_equal(equity, baseline_equity(performance, account_info))
+
+def test_daily_log_matches_baseline(performance, trades, account_info):
+    # Days whose trades are no longer in the journal log no trades
+    trades = trades.iloc[len(trades) // 4:]
+    log = build_daily_log(performance, trades, account_info)
+    for account_name, account in account_info.items():
+        expected = baseline_daily_log(performance, trades, account_name, account)
+        actual = log[log['Account'] == account_name].drop(columns='Account').reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected)
+    assert (log['# Trades'] == 0).any()
+
+def test_trade_cards_match_baseline(trades):
+    recent = trades.sort_values('date', ascending=False).head(20)
+    assert build_trade_cards(recent) == baseline_trade_cards(recent)
+    assert build_trade_cards(recent.iloc[:0]) == []
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+import pytest
+from data import cache as cache_module
+from data.cache import DatasetCache
+from data.data_loader import append_trades, save_data
+
+@pytest.fixture
+def loads(data_dir, monkeypatch):
+    """Record every dataset the cache loads from storage"""
+    calls = []
+    load_data = cache_module.load_data
+    
+    def recording_load(data_type):
+        calls.append(data_type)
+        return load_data(data_type)
+    monkeypatch.setattr(cache_module, 'load_data', recording_load)
+    return calls
+
+def test_dataset_is_loaded_once_and_shared(loads):
+    cache = DatasetCache()
+    # The first load of an empty store writes the sample data, so the next get reloads once
+    cache.get('trades')
+    trades = cache.get('trades')
+    assert cache.get('trades') is trades
+    assert loads.count('trades') == 2
+
+def test_write_reloads_the_dataset(loads):
+    cache = DatasetCache()
+    accounts = cache.get('accounts')
+    cache.get('accounts')
+    changed = dict(accounts, **{'Account 1': dict(accounts['Account 1'], current_balance=1.0)})
+    save_data('accounts', changed)
+    assert cache.get('accounts')['Account 1']['current_balance'] == 1.0
+
+def test_logged_trade_reloads_the_journal(loads, trades):
+    cache = DatasetCache()
+    cache.get('trades')
+    before = cache.get('trades')
+    record = trades.drop(columns='timestamp').iloc[0].to_dict()
+    append_trades([dict(record, notes='logged')])
+    after = cache.get('trades')
+    assert len(after) == len(before) + 1
+    assert 'logged' in after['notes'].tolist()
+
+def test_write_by_another_process_reloads_the_dataset(loads, data_dir, account_info):
+    save_data('accounts', account_info)
+    cache = DatasetCache()
+    cache.get('accounts')
+    path = data_dir / 'accounts.json'
+    accounts = json.loads(path.read_text())
+    accounts['Account 1']['current_balance'] = 2.0
+    # Another process doesn't bump this process's write count; the file's size and mtime change
+    path.write_text(json.dumps(accounts, indent=2))
+    assert cache.get('accounts')['Account 1']['current_balance'] == 2.0
+
+def test_concurrent_sessions_share_one_load(loads, monkeypatch):
+    cache = DatasetCache()
+    cache.get('performance')
+    cache.invalidate()
+    loads.clear()
+    load_data = cache_module.load_data
+    
+    def slow_load(data_type):
+        time.sleep(0.05)
+        return load_data(data_type)
+    monkeypatch.setattr(cache_module, 'load_data', slow_load)
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('performance'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loads == ['performance']
+    assert all(result is results[0] for result in results)
+
+def test_get_many_and_invalidate(loads):
+    cache = DatasetCache()
+    cache.get_many(['trades', 'accounts', 'performance'])
+    datasets = cache.get_many(['trades', 'accounts', 'performance'])
+    assert set(datasets) == {'trades', 'accounts', 'performance'}
+    assert cache.get('accounts') is datasets['accounts']
+    
+    cache.invalidate('accounts')
+    assert cache.get('accounts') is not datasets['accounts']
+    loads.clear()
+    cache.invalidate()
+    cache.get('performance')
+    assert loads == ['performance']
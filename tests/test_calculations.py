@@ -0,0 +1,284 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+from tests.conftest import ACCOUNTS, make_trades
+from utils.calculations import (
+    compute_account_metrics, compute_intraday_equity, compute_intraday_sessions, compute_rolling_metrics, compute_correlation_matrix, compute_rolling_correlation,
+    find_drawdown_episodes, compute_drawdown_episodes
+)
+
+def naive_window_metrics(window):
+    """Metrics of one window of trades, computed directly"""
+    wins = window[window['outcome'] == 'Win']
+    losses = window[window['outcome'] == 'Loss']
+    r = window['r_multiple'].astype(float).fillna(0.0)
+    win_rate = len(wins) / len(window)
+    avg_win = wins['r_multiple'].astype(float).mean() if len(wins) else 0.0
+    avg_loss = losses['r_multiple'].astype(float).mean() if len(losses) else 0.0
+    gross_profit = window.loc[window['pnl'] > 0, 'pnl'].sum()
+    gross_loss = -window.loc[window['pnl'] < 0, 'pnl'].sum()
+    return {
+        'trades': len(window),
+        'win_rate': win_rate,
+        'avg_r': r.mean(),
+        'expectancy': win_rate * avg_win + (1 - win_rate) * avg_loss,
+        'profit_factor': gross_profit / gross_loss if gross_loss > 0 else gross_profit
+    }
+
+def naive_rolling_metrics(trades, window, by):
+    rows = []
+    ordered = trades.sort_values(['account', 'timestamp'], kind='stable')
+    for _, group in ordered.groupby('account', observed=True, sort=False):
+        group = group.reset_index(drop=True)
+        for i, timestamp in enumerate(group['timestamp']):
+            if by == 'days':
+                in_window = group.iloc[:i + 1]
+                in_window = in_window[in_window['timestamp'] > timestamp - pd.Timedelta(days=window)]
+            else:
+                in_window = group.iloc[max(i + 1 - window, 0):i + 1]
+            metrics = naive_window_metrics(in_window)
+            if by != 'days' and len(in_window) < window:
+                metrics.update(win_rate=np.nan, avg_r=np.nan, expectancy=np.nan, profit_factor=np.nan)
+            rows.append(metrics)
+    return pd.DataFrame(rows)
+
+@pytest.mark.parametrize('window,by', [(20, 'trades'), (1, 'trades'), (10, 'days'), (1, 'days')])
+def test_rolling_metrics_match_direct_windows(trades, window, by):
+    result = compute_rolling_metrics(trades, window, by=by)
+    expected = naive_rolling_metrics(trades, window, by)
+    assert len(result) == len(trades)
+    for column in expected.columns:
+        np.testing.assert_allclose(result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                   rtol=1e-6, atol=1e-9, err_msg=column)
+
+def test_rolling_metrics_by_days_skip_missing_timestamps(trades):
+    trades = trades.copy()
+    missing = trades.index[[5, 50, 200]]
+    trades.loc[missing, 'timestamp'] = pd.NaT
+    
+    result = compute_rolling_metrics(trades, 10, by='days')
+    assert len(result) == len(trades) - len(missing)
+    assert result['timestamp'].notna().all()
+    assert (result['trades'] >= 1).all()
+    
+    expected = naive_rolling_metrics(trades.drop(missing), 10, 'days')
+    np.testing.assert_array_equal(result['trades'].to_numpy(), expected['trades'].to_numpy())
+
+def test_rolling_metrics_by_trades_keep_missing_timestamps(trades):
+    trades = trades.copy()
+    trades.loc[trades.index[5], 'timestamp'] = pd.NaT
+    result = compute_rolling_metrics(trades, 20)
+    assert len(result) == len(trades)
+    assert result['trades'].between(1, 20).all()
+
+def test_rolling_metrics_empty():
+    result = compute_rolling_metrics(pd.DataFrame(columns=['account', 'timestamp']), 10, by='days')
+    assert result.empty
+
+@pytest.fixture
+def strategy_matrix():
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(120, 4))
+    values[:, 1] += values[:, 0]
+    matrix = pd.DataFrame(values, columns=['A', 'B', 'C', 'D'],
+                          index=pd.date_range('2025-01-01', periods=120).strftime('%Y-%m-%d'))
+    matrix['D'] = 0.0
+    return matrix
+
+def test_correlation_matrix_matches_pandas(strategy_matrix):
+    corr, average = compute_correlation_matrix(strategy_matrix)
+    expected = strategy_matrix.corr()
+    pd.testing.assert_frame_equal(corr, expected, atol=1e-9)
+    
+    pairs = expected.where(~np.eye(4, dtype=bool)).abs().stack()
+    assert average == pytest.approx(pairs.mean())
+
+def test_correlation_matrix_needs_two_days(strategy_matrix):
+    corr, average = compute_correlation_matrix(strategy_matrix.iloc[:1])
+    assert corr.isna().all().all()
+    assert np.isnan(average)
+
+def test_rolling_correlation_matches_pandas(strategy_matrix):
+    window = 30
+    dates, corr = compute_rolling_correlation(strategy_matrix, window)
+    assert list(dates) == list(strategy_matrix.index[window - 1:])
+    for i in [0, 41, len(dates) - 1]:
+        expected = strategy_matrix.iloc[i:i + window].corr().to_numpy()
+        np.testing.assert_allclose(corr[i], expected, atol=1e-9)
+
+def test_rolling_correlation_shorter_than_window(strategy_matrix):
+    dates, corr = compute_rolling_correlation(strategy_matrix.iloc[:10], 30)
+    assert len(dates) == 0
+    assert corr.shape == (0, 4, 4)
+
+def test_drawdown_episodes():
+    dates = pd.date_range('2025-01-01', periods=8).strftime('%Y-%m-%d')
+    # Equity 1000 -> 900 -> 950 -> 1100 (recovered) -> 1050 -> 1000 -> 1200 (recovered) -> 1100
+    pnl = [-100, 50, 150, -50, -50, 200, -100, 0]
+    episodes = find_drawdown_episodes(dates, pnl, 1000.0)
+    
+    assert len(episodes) == 3
+    first, second, ongoing = episodes.to_dict('records')
+    assert first['start'] == pd.Timestamp('2025-01-01') and first['trough'] == pd.Timestamp('2025-01-01')
+    assert first['recovery'] == pd.Timestamp('2025-01-03')
+    assert first['depth'] == 100 and first['depth_pct'] == pytest.approx(10.0)
+    assert first['trading_days'] == 2 and first['days_under_water'] == 2 and first['recovery_days'] == 2
+    
+    assert second['start'] == pd.Timestamp('2025-01-03') and second['trough'] == pd.Timestamp('2025-01-05')
+    assert second['depth'] == 100 and second['depth_pct'] == pytest.approx(100 / 1100 * 100)
+    assert second['recovery_days'] == 1
+    
+    assert pd.isna(ongoing['recovery']) and np.isnan(ongoing['recovery_days'])
+    assert ongoing['trading_days'] == 2 and ongoing['days_under_water'] == 2
+
+def test_drawdown_episodes_none_under_water():
+    assert find_drawdown_episodes(['2025-01-01', '2025-01-02'], [10, 20], 1000.0).empty
+
+def test_drawdown_episodes_per_account(account_info):
+    performance = pd.DataFrame({
+        'date': ['2025-01-02', '2025-01-01', '2025-01-01', '2025-01-02'],
+        'account': ['Account 1', 'Account 1', 'Account 2', 'Account 2'],
+        'pnl': [200.0, -100.0, 50.0, 25.0]
+    })
+    episodes = compute_drawdown_episodes(performance, account_info)
+    assert list(episodes['account']) == ['Account 1']
+    assert episodes.iloc[0]['depth'] == 100
+    assert episodes.iloc[0]['recovery'] == pd.Timestamp('2025-01-02')
+
+def per_account_metrics(trades, account_name):
+    """Metrics of one account by filtering the journal, as before the single groupby"""
+    account_trades = trades[trades['account'] == account_name]
+    total_trades = len(account_trades)
+    win_trades = len(account_trades[account_trades['outcome'] == 'Win'])
+    win_rate = win_trades / total_trades if total_trades > 0 else 0
+    avg_win = account_trades[account_trades['outcome'] == 'Win']['r_multiple'].mean() if win_trades > 0 else 0
+    avg_loss = account_trades[account_trades['outcome'] == 'Loss']['r_multiple'].mean() if (total_trades - win_trades) > 0 else 0
+    expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss) if total_trades > 0 else 0
+    win_sum = account_trades[account_trades['pnl'] > 0]['pnl'].sum()
+    loss_sum = abs(account_trades[account_trades['pnl'] < 0]['pnl'].sum())
+    profit_factor = win_sum / loss_sum if loss_sum > 0 else win_sum
+    return {
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': expectancy,
+        'profit_factor': profit_factor
+    }
+
+def assert_metrics_match(trades):
+    metrics = compute_account_metrics(trades)
+    assert sorted(metrics) == sorted(trades['account'].astype(str).unique())
+    for account in metrics:
+        expected = per_account_metrics(trades, account)
+        for key, value in expected.items():
+            assert metrics[account][key] == pytest.approx(value, rel=1e-6, nan_ok=True), (account, key)
+
+@pytest.mark.parametrize('seed', range(8))
+def test_account_metrics_match_per_account_filters(seed):
+    assert_metrics_match(make_trades(n=250, seed=seed))
+
+def test_account_metrics_edge_accounts(trades):
+    # Only wins, only breakevens (no losses to average), and a single loss
+    trades = trades.copy()
+    only = {ACCOUNTS[0]: 'Win', ACCOUNTS[1]: 'Breakeven'}
+    for account, outcome in only.items():
+        rows = trades['account'] == account
+        trades.loc[rows, 'outcome'] = outcome
+        trades.loc[rows, 'r_multiple'] = 1.0 if outcome == 'Win' else 0.0
+        trades.loc[rows, 'pnl'] = 500.0 if outcome == 'Win' else 0.0
+    last = trades[trades['account'] == ACCOUNTS[2]].index
+    trades = trades.drop(last[1:])
+    trades.loc[last[0], ['outcome', 'r_multiple', 'pnl']] = ['Loss', -1.0, -500.0]
+    assert_metrics_match(trades)
+
+def test_account_metrics_empty_journal(trades):
+    assert compute_account_metrics(trades.iloc[:0]) == {}
+
+def session_trades(rows):
+    """A journal of (account, date, time, pnl) rows"""
+    return pd.DataFrame(rows, columns=['account', 'date', 'time', 'pnl'])
+
+def test_intraday_sessions_split_by_account_and_date():
+    trades = session_trades([
+        ('Account 1', '2025-01-02', '10:00', 200.0),
+        ('Account 2', '2025-01-02', '10:05', -300.0),
+        ('Account 1', '2025-01-03', '09:45', -100.0),
+        ('Account 1', '2025-01-02', '11:00', -50.0)
+    ])
+    intraday = compute_intraday_equity(trades)
+    assert intraday[['account', 'date', 'time']].values.tolist() == [
+        ['Account 1', '2025-01-02', '10:00'],
+        ['Account 1', '2025-01-02', '11:00'],
+        ['Account 1', '2025-01-03', '09:45'],
+        ['Account 2', '2025-01-02', '10:05']
+    ]
+    # Each session starts again from the opening balance
+    assert intraday['session_pnl'].tolist() == [200.0, 150.0, -100.0, -300.0]
+    assert intraday['session_drawdown'].tolist() == [0.0, 50.0, 100.0, 300.0]
+    
+    sessions = compute_intraday_sessions(intraday)
+    assert sessions['trades'].tolist() == [2, 1, 1]
+    assert sessions.loc[('Account 1', '2025-01-02'), 'pnl'] == 150.0
+
+def test_intraday_drawdown_is_peak_to_trough_within_a_session():
+    trades = session_trades([
+        ('Account 1', '2025-01-02', '09:35', 300.0),
+        ('Account 1', '2025-01-02', '10:10', -500.0),
+        ('Account 1', '2025-01-02', '11:20', 100.0),
+        ('Account 1', '2025-01-02', '13:00', -200.0),
+        ('Account 1', '2025-01-02', '15:00', 50.0)
+    ])
+    intraday = compute_intraday_equity(trades)
+    assert intraday['session_peak'].tolist() == [300.0] * 5
+    assert intraday['session_drawdown'].tolist() == [0.0, 500.0, 400.0, 600.0, 550.0]
+    
+    session = compute_intraday_sessions(intraday).loc[('Account 1', '2025-01-02')]
+    # A giveback from the high counts in full, not just the loss below the open
+    assert session['max_drawdown'] == 600.0
+    assert session['max_loss'] == 300.0
+    assert session['current_drawdown'] == 550.0
+
+def test_intraday_sessions_match_a_loop_over_trades(trades):
+    sessions = compute_intraday_sessions(compute_intraday_equity(trades))
+    for (account, date), session in trades.groupby(['account', 'date'], observed=True):
+        pnl, peak, max_drawdown = 0.0, 0.0, 0.0
+        for value in session.sort_values('time', kind='stable')['pnl']:
+            pnl += value
+            peak = max(peak, pnl)
+            max_drawdown = max(max_drawdown, peak - pnl)
+        expected = sessions.loc[(account, date)]
+        assert expected['max_drawdown'] == pytest.approx(max_drawdown)
+        assert expected['current_drawdown'] == pytest.approx(peak - pnl)
+        assert expected['pnl'] == pytest.approx(pnl)
+
+def test_intraday_equity_empty(trades):
+    assert compute_intraday_equity(trades.iloc[:0]).empty
+
+def _intraday_drawdown_script():
+    import streamlit as st
+    from utils.calculations import calculate_intraday_drawdown
+    st.session_state.result = {
+        (account, date): tuple(float(value) for value in calculate_intraday_drawdown(account, date))
+        for account in ['Account 1', 'Account 2', 'Account 3']
+        for date in ['2025-01-02', '2025-01-03']
+    }
+
+def test_calculate_intraday_drawdown_single_trade_accounts(trades):
+    journal = trades.iloc[:2].assign(
+        account=['Account 1', 'Account 2'],
+        date='2025-01-02',
+        time='10:00',
+        pnl=[-400.0, 250.0]
+    )
+    at = AppTest.from_function(_intraday_drawdown_script)
+    at.session_state['trade_journal'] = journal
+    at.run()
+    
+    assert not at.exception
+    result = at.session_state['result']
+    assert result[('Account 1', '2025-01-02')] == (400.0, 400.0)
+    assert result[('Account 2', '2025-01-02')] == (0.0, 0.0)
+    # No trades in the session means no drawdown
+    assert result[('Account 1', '2025-01-03')] == (0.0, 0.0)
+    assert result[('Account 3', '2025-01-02')] == (0.0, 0.0)
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from config import CHART_MAX_POINTS
+from utils.charts import downsample_frame, downsample_indices, line_trace, lttb_indices, minmax_indices, render_mode
+
+def random_walk(n, seed=0):
+    return 150000 + np.cumsum(np.random.default_rng(seed).normal(0, 500, n))
+
+@pytest.mark.parametrize('seed', range(5))
+def test_lttb_keeps_endpoints(seed):
+    y = random_walk(10000, seed)
+    picked = lttb_indices(y, 500)
+    assert len(picked) == 500
+    assert picked[0] == 0 and picked[-1] == len(y) - 1
+    assert np.all(np.diff(picked) > 0)
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+@pytest.mark.parametrize('seed', range(5))
+def test_downsampling_keeps_endpoints_and_extremes(method, seed):
+    y = random_walk(20000, seed)
+    picked = downsample_indices(y, 400, method)
+    assert len(picked) <= 400
+    assert {0, len(y) - 1, int(y.argmin()), int(y.argmax())} <= set(picked.tolist())
+    assert y[picked].min() == y.min() and y[picked].max() == y.max()
+
+def test_downsampling_keeps_a_single_spike():
+    # A one-day spike LTTB's bucket averages could smooth away
+    y = np.zeros(50000)
+    y[12345] = -1e6
+    y[40000] = 1e6
+    picked = downsample_indices(y, 100)
+    assert 12345 in picked and 40000 in picked
+
+def test_short_series_are_untouched():
+    y = random_walk(CHART_MAX_POINTS)
+    np.testing.assert_array_equal(downsample_indices(y), np.arange(len(y)))
+
+def test_minmax_keeps_bucket_extremes():
+    y = random_walk(1000, 3)
+    picked = minmax_indices(y, 20)
+    for bucket in np.array_split(np.arange(1000), 10):
+        assert bucket[y[bucket].argmin()] in picked and bucket[y[bucket].argmax()] in picked
+
+def test_downsample_frame_per_group():
+    frame = pd.DataFrame({
+        'Account': np.repeat(['Account 1', 'Account 2', 'Account 3'], [5000, 50, 3000]),
+        'Equity': np.concatenate([random_walk(5000, 1), random_walk(50, 2), random_walk(3000, 3)])
+    })
+    sampled = downsample_frame(frame, ['Equity'], by='Account', max_points=300)
+    sizes = sampled.groupby('Account').size()
+    assert sizes['Account 2'] == 50
+    assert sizes['Account 1'] <= 300 and sizes['Account 3'] <= 300
+    for account, group in frame.groupby('Account'):
+        kept = sampled[sampled['Account'] == account]['Equity']
+        assert kept.max() == group['Equity'].max() and kept.min() == group['Equity'].min()
+
+def test_one_downsampled_series_renders_as_svg_and_several_as_webgl():
+    series = downsample_indices(random_walk(100000))
+    assert render_mode(len(series)) == 'svg'
+    assert render_mode(3 * len(series)) == 'webgl'
+    assert isinstance(line_trace(series, series), go.Scatter)
+    assert isinstance(line_trace(series, series, total_points=3 * len(series)), go.Scattergl)
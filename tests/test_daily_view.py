@@ -0,0 +1,112 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from data.daily_view import DailyPerformanceView
+from data.schema import apply_performance_schema
+
+def test_incremental_inserts_match_full_rebuild(trades):
+    seed = trades.iloc[:200]
+    view = DailyPerformanceView.from_trades(seed)
+    for _, trade in trades.iloc[200:].iterrows():
+        view.add_trade(trade)
+    
+    assert view.verify(trades)
+    expected = trades.groupby(['account', 'date'], observed=True)['pnl'].sum()
+    frame = view.frame().set_index(['account', 'date'])['pnl']
+    pd.testing.assert_series_equal(frame.sort_index(), expected.sort_index(), check_names=False, check_index_type=False)
+
+def test_verify_reports_drift(trades):
+    view = DailyPerformanceView.from_trades(trades.iloc[:-1])
+    assert not view.verify(trades)
+    last = trades.iloc[-1]
+    assert view.mismatches(DailyPerformanceView.from_trades(trades)) == [(last['account'], last['date'])]
+
+def test_frame_is_rebuilt_after_a_change(trades):
+    view = DailyPerformanceView.from_trades(trades.iloc[:10])
+    before = view.frame()
+    assert view.frame() is before
+    view.add_trade({'account': 'Account 1', 'date': '2030-01-01', 'pnl': 125.0})
+    after = view.frame()
+    assert after is not before
+    assert view.pnl('Account 1', '2030-01-01') == 125.0
+    assert len(after) == len(before) + 1
+
+def recomputed(trades):
+    """Daily P&L by a full groupby over the journal"""
+    return trades.groupby(['account', 'date'], observed=True)['pnl'].sum()
+
+def assert_matches_journal(view, trades):
+    frame = view.frame().set_index(['account', 'date'])['pnl']
+    pd.testing.assert_series_equal(frame.sort_index(), recomputed(trades).sort_index(),
+                                   check_names=False, check_index_type=False)
+
+def test_deletes_and_edits_match_full_recompute(trades):
+    rng = np.random.default_rng(11)
+    journal = trades.copy()
+    view = DailyPerformanceView.from_trades(journal)
+    for step in range(300):
+        position = journal.index[rng.integers(len(journal))]
+        old_trade = journal.loc[position].to_dict()
+        if step % 2:
+            view.remove_trade(old_trade)
+            journal = journal.drop(position)
+        else:
+            new_trade = dict(
+                old_trade,
+                account=rng.choice(['Account 1', 'Account 2', 'Account 3']),
+                date=rng.choice(journal['date'].unique()),
+                pnl=round(float(rng.normal(0, 500)), 2)
+            )
+            view.update_trade(old_trade, new_trade)
+            journal.loc[position, ['account', 'date', 'pnl']] = [new_trade['account'], new_trade['date'], new_trade['pnl']]
+    
+    assert view.verify(journal)
+    assert_matches_journal(view, journal)
+
+def test_deleting_the_last_trade_of_a_day_removes_the_day(trades):
+    trade = trades.iloc[0].to_dict()
+    view = DailyPerformanceView.from_trades(trades.iloc[:1])
+    view.remove_trade(trade)
+    assert view.frame().empty
+    assert view.pnl(trade['account'], trade['date']) == 0.0
+
+def test_reconcile_keeps_a_matching_stored_frame(trades):
+    view = DailyPerformanceView.from_trades(trades)
+    stored = view.frame().sample(frac=1, random_state=0).reset_index(drop=True)
+    assert view.reconcile(stored) is stored
+
+def test_reconcile_keeps_stored_days_without_trades(trades, caplog):
+    # The shipped data: a hand-entered day and an empty journal
+    manual = apply_performance_schema(pd.DataFrame({'date': ['2025-04-24'], 'account': ['Account 1'], 'pnl': [245.54]}))
+    view = DailyPerformanceView.from_trades(trades.iloc[:0])
+    with caplog.at_level(logging.WARNING, logger='data.daily_view'):
+        performance = view.reconcile(manual)
+    assert 'manual entries' in caplog.text
+    pd.testing.assert_frame_equal(performance, manual)
+    
+    # Trades added later on other days and on the manual day add to it
+    for _, trade in trades.iloc[:20].iterrows():
+        view.add_trade(trade)
+    view.add_trade({'account': 'Account 1', 'date': '2025-04-24', 'pnl': 100.0})
+    assert view.pnl('Account 1', '2025-04-24') == pytest.approx(345.54)
+    assert len(view.frame()) == len(recomputed(trades.iloc[:20])) + 1
+    
+    view.remove_trade({'account': 'Account 1', 'date': '2025-04-24', 'pnl': 100.0})
+    assert view.pnl('Account 1', '2025-04-24') == pytest.approx(245.54)
+    assert view.verify(trades.iloc[:20])
+
+def test_reconcile_keeps_stored_values_and_adds_missing_days(trades, caplog):
+    view = DailyPerformanceView.from_trades(trades)
+    stored = view.frame().copy()
+    stored.loc[0, 'pnl'] += 50.0
+    changed = (stored.loc[0, 'account'], stored.loc[0, 'date'])
+    dropped = (stored.loc[1, 'account'], stored.loc[1, 'date'])
+    stored = stored.drop(index=1)
+    
+    with caplog.at_level(logging.WARNING, logger='data.daily_view'):
+        performance = view.reconcile(stored)
+    assert 'manual entries' in caplog.text and 'missing from stored' in caplog.text
+    assert len(performance) == len(stored) + 1
+    assert view.pnl(*changed) == pytest.approx(stored.loc[0, 'pnl'])
+    assert view.pnl(*dropped) == pytest.approx(recomputed(trades)[dropped])
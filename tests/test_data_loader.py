@@ -0,0 +1,109 @@
+import os
+import threading
+import pytest
+from data import data_loader
+from data.data_loader import load_data, append_trades, replay_trade_log, read_trade_log, TRADE_LOG_FILE
+from data.schema import strip_derived_columns
+from data.storage import atomic_write
+from tests.conftest import make_trades
+
+def trade_records(n, seed=1):
+    return strip_derived_columns(make_trades(n, seed=seed)).to_dict('records')
+
+def test_logged_trades_replay_newest_first(data_dir):
+    snapshot = load_data('trades')
+    records = trade_records(3)
+    append_trades(records[:2])
+    append_trades(records[2:])
+    
+    trades = load_data('trades')
+    assert len(trades) == len(snapshot) + 3
+    assert list(trades['time'][:3]) == [record['time'] for record in records[::-1]]
+
+def test_torn_final_line_is_dropped(data_dir):
+    load_data('trades')
+    append_trades(trade_records(2))
+    with open(TRADE_LOG_FILE, 'a') as f:
+        f.write('{"date": "2025-')
+    assert len(read_trade_log()) == 2
+
+def test_compaction_folds_the_log_into_the_snapshot(data_dir, monkeypatch):
+    monkeypatch.setattr(data_loader, 'TRADE_LOG_COMPACT_THRESHOLD', 5)
+    snapshot = load_data('trades')
+    append_trades(trade_records(5))
+    
+    assert len(load_data('trades')) == len(snapshot) + 5
+    assert not os.path.exists(TRADE_LOG_FILE)
+    assert len(load_data('trades')) == len(snapshot) + 5
+
+def test_append_during_compaction_is_kept(data_dir, monkeypatch):
+    monkeypatch.setattr(data_loader, 'TRADE_LOG_COMPACT_THRESHOLD', 5)
+    snapshot = load_data('trades')
+    append_trades(trade_records(5))
+    late = trade_records(1, seed=2)
+    writer = threading.Thread(target=append_trades, args=(late,))
+    save_data = data_loader.save_data
+    
+    def save_while_appending(data_type, data):
+        # The background writer appends after the log was read, before it is removed
+        if data_type == 'trades' and not writer.is_alive():
+            writer.start()
+            writer.join(timeout=0.5)
+        save_data(data_type, data)
+    
+    monkeypatch.setattr(data_loader, 'save_data', save_while_appending)
+    replay_trade_log(data_loader.get_table_backend('trades').load('trades'))
+    writer.join()
+    monkeypatch.setattr(data_loader, 'save_data', save_data)
+    
+    assert [record['time'] for record in read_trade_log()] == [late[0]['time']]
+    assert len(load_data('trades')) == len(snapshot) + 6
+
+def test_concurrent_appends_while_compacting(data_dir, monkeypatch):
+    monkeypatch.setattr(data_loader, 'TRADE_LOG_COMPACT_THRESHOLD', 3)
+    snapshot = load_data('trades')
+    records = trade_records(60)
+    
+    def writer():
+        for record in records:
+            append_trades([record])
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        load_data('trades')
+    thread.join()
+    
+    assert len(load_data('trades')) == len(snapshot) + len(records)
+
+def test_atomic_write_from_concurrent_writers(tmp_path):
+    path = tmp_path / 'doc.txt'
+    errors = []
+    
+    def writer(text):
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                f.write(text * 10000)
+        try:
+            for _ in range(20):
+                atomic_write(str(path), write)
+        except Exception as error:
+            errors.append(error)
+    
+    threads = [threading.Thread(target=writer, args=(letter,)) for letter in 'abcd']
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not errors
+    assert path.read_text() in {letter * 10000 for letter in 'abcd'}
+    assert os.listdir(tmp_path) == ['doc.txt']
+
+def test_atomic_write_cleans_up_after_a_failed_write(tmp_path):
+    def write(tmp):
+        raise OSError('disk full')
+    
+    with pytest.raises(OSError):
+        atomic_write(str(tmp_path / 'doc.txt'), write)
+    assert os.listdir(tmp_path) == []
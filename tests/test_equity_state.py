@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.equity_state import EQUITY_STATE_VERSION, EquityState, HistoricalEditError, apply_trade, build_equity_states
+from tests.conftest import make_trades
+from utils.calculations import equity_curve, find_drawdown_episodes
+
+STATE_FIELDS = ['last_date', 'days', 'cum_pnl', 'peak', 'current_drawdown', 'max_drawdown', 'max_drawdown_date']
+
+def daily_of(trades):
+    return trades.groupby(['account', 'date'], observed=True, as_index=False)['pnl'].sum()
+
+def assert_same_state(actual, expected):
+    for field in STATE_FIELDS:
+        value, reference = getattr(actual, field), getattr(expected, field)
+        if isinstance(reference, float):
+            assert value == pytest.approx(reference, abs=1e-6), field
+        else:
+            assert value == reference, field
+
+def apply_one_at_a_time(trades):
+    """Equity states from applying each trade to the states of the ones before it"""
+    states = {}
+    for i in range(len(trades)):
+        trade = trades.iloc[i]
+        apply_trade(states, daily_of(trades.iloc[:i + 1]), trade)
+    return states
+
+@pytest.mark.parametrize('seed', [1, 2, 3, 4, 5])
+def test_trades_in_date_order_match_full_recompute(seed):
+    trades = make_trades(n=200, seed=seed)
+    states = apply_one_at_a_time(trades)
+    expected = build_equity_states(daily_of(trades))
+    assert states.keys() == expected.keys()
+    for account, state in states.items():
+        assert_same_state(state, expected[account])
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_trades_in_random_order_match_full_recompute(seed):
+    # Back-dated trades go through the rebuild path
+    trades = make_trades(n=200, seed=seed)
+    shuffled = trades.sample(frac=1, random_state=seed).reset_index(drop=True)
+    states = apply_one_at_a_time(shuffled)
+    expected = build_equity_states(daily_of(trades))
+    for account, state in states.items():
+        assert_same_state(state, expected[account])
+
+def test_earlier_day_is_rejected():
+    state = EquityState('Account 1')
+    state.apply('2025-01-03', 100.0)
+    with pytest.raises(HistoricalEditError):
+        state.apply('2025-01-02', 50.0)
+
+def test_round_trips_through_dict(trades):
+    states = build_equity_states(daily_of(trades))
+    for state in states.values():
+        assert_same_state(EquityState.from_dict(state.to_dict()), state)
+
+def test_stale_stored_state_is_recomputed(trades):
+    daily = daily_of(trades)
+    stored = {account: state.to_dict() for account, state in build_equity_states(daily).items()}
+    stored['Account 1']['cum_pnl'] += 1.0
+    states = build_equity_states(daily, stored)
+    expected = build_equity_states(daily)
+    assert_same_state(states['Account 1'], expected['Account 1'])
+
+@pytest.mark.parametrize('seed', range(6))
+def test_drawdown_agrees_with_episodes(seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-02', periods=120).strftime('%Y-%m-%d').to_numpy()
+    pnl = rng.normal(0, 1000, len(dates)).round(2)
+    if seed % 2:
+        # Losing from day one is a drawdown from the starting balance
+        pnl[:5] = -abs(pnl[:5])
+    state = EquityState.from_daily('Account 1', dates, pnl)
+    episodes = find_drawdown_episodes(dates, pnl, 150000.0)
+    _, _, drawdown = equity_curve(pnl, 150000.0)
+    
+    assert state.current_drawdown == pytest.approx(drawdown[-1])
+    assert state.max_drawdown == pytest.approx(episodes['depth'].max())
+    deepest = episodes.loc[episodes['depth'].idxmax()]
+    assert pd.Timestamp(state.max_drawdown_date) == deepest['trough']
+
+def test_losing_first_day_is_a_drawdown():
+    state = EquityState('Account 1')
+    state.apply('2025-01-02', -500.0)
+    assert state.current_drawdown == state.max_drawdown == 500.0
+    assert_same_state(state, EquityState.from_daily('Account 1', ['2025-01-02'], [-500.0]))
+
+def test_state_stored_under_the_old_definition_is_recomputed(trades):
+    daily = daily_of(trades)
+    stored = {account: state.to_dict() for account, state in build_equity_states(daily).items()}
+    del stored['Account 1']['version']
+    states = build_equity_states(daily, stored)
+    assert states['Account 1'].version == EQUITY_STATE_VERSION
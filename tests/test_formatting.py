@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+from streamlit.testing.v1 import AppTest
+from data.daily_view import DailyPerformanceView
+from tests.conftest import make_account_info, make_trades
+
+def _summary_card_script():
+    from utils.formatting import account_summary_card
+    account_summary_card('Account 1', 'account1-header')
+
+def test_summary_card_today_and_week():
+    def day(offset):
+        return (datetime.now() - timedelta(days=offset)).strftime('%Y-%m-%d')
+    
+    view = DailyPerformanceView()
+    for offset, pnl in [(0, 100.0), (0, 50.0), (3, -40.0), (6, 10.0), (7, 1000.0)]:
+        view.add_trade({'account': 'Account 1', 'date': day(offset), 'pnl': pnl})
+    view.add_trade({'account': 'Account 2', 'date': day(0), 'pnl': 999.0})
+    
+    at = AppTest.from_function(_summary_card_script)
+    at.session_state['daily_view'] = view
+    at.session_state['daily_performance'] = view.frame()
+    at.session_state['trade_journal'] = make_trades(30)
+    at.session_state['account_info'] = make_account_info()
+    at.session_state['data_version'] = 0
+    at.run()
+    
+    assert not at.exception
+    card = at.markdown[0].value
+    assert 'Today: $+150.00' in card
+    assert 'Week: $+120.00' in card
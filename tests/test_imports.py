@@ -0,0 +1,21 @@
+import subprocess
+import sys
+import utils
+
+def modules_loaded_by(statement):
+    """Modules a fresh interpreter has loaded after running `statement`"""
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return set(output.split())
+
+def test_profiling_loads_without_the_rest_of_utils():
+    loaded = modules_loaded_by('from utils.profiling import timed')
+    assert 'utils.profiling' in loaded
+    assert not {'utils.calculations', 'utils.statistics', 'utils.monte_carlo', 'utils.builders', 'pandas'} & loaded
+
+def test_package_exports_resolve_on_access():
+    from utils.calculations import calculate_account_metrics
+    from utils.formatting import download_csv
+    assert utils.calculate_account_metrics is calculate_account_metrics
+    assert utils.download_csv is download_csv
+    assert set(utils.__all__) >= {'calculate_drawdown', 'account_summary_card'}
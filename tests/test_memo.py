@@ -0,0 +1,133 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+from streamlit.testing.v1 import AppTest
+from utils import memo
+from utils.memo import FIGURE_OVERHEAD_BYTES, LRUCache, cache_figure, estimate_figure_bytes, memoize_on_data_version
+
+def figure_of(n_points):
+    return go.Figure(go.Scatter(x=np.arange(n_points), y=np.zeros(n_points)))
+
+def test_lru_evicts_least_recently_used_by_count():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.info()['size'] == 2
+
+def test_lru_bounded_by_weight():
+    cache = LRUCache(100, weigh=len)
+    cache.put('a', 'x' * 40)
+    cache.put('b', 'x' * 40)
+    cache.put('c', 'x' * 40)
+    assert cache.get('a') is None
+    assert cache.info()['weight'] == 80
+    # Replacing an entry releases its old weight
+    cache.put('b', 'x' * 10)
+    assert cache.info()['weight'] == 50
+    cache.put('d', 'x' * 50)
+    assert cache.get('c') is not None and cache.get('d') is not None
+    assert cache.info()['weight'] == 100
+
+def test_lru_skips_values_heavier_than_the_budget():
+    cache = LRUCache(100, weigh=len)
+    cache.put('a', 'x' * 60)
+    cache.put('huge', 'x' * 101)
+    assert cache.get('huge') is None
+    assert cache.get('a') is not None
+
+def test_figure_size_estimate_counts_point_data():
+    small, large = figure_of(100), figure_of(100000)
+    assert estimate_figure_bytes(large) - estimate_figure_bytes(small) == pytest.approx(2 * 99900 * 8, rel=0.01)
+    assert estimate_figure_bytes(None) == 0
+    
+    frames = [go.Frame(data=[go.Heatmap(z=np.zeros((10, 10)))]) for _ in range(5)]
+    animated = go.Figure(data=[go.Heatmap(z=np.zeros((10, 10)))], frames=frames)
+    assert estimate_figure_bytes(animated) >= FIGURE_OVERHEAD_BYTES + 6 * 100 * 8
+
+def test_figure_cache_evicts_by_size(monkeypatch):
+    budget = estimate_figure_bytes(figure_of(10000)) * 5 // 2
+    monkeypatch.setattr(memo, '_figure_cache', LRUCache(budget, weigh=estimate_figure_bytes))
+    monkeypatch.setattr(memo, 'get_data_version', lambda: 1)
+    built = []
+    
+    @cache_figure
+    def chart(n_points):
+        built.append(n_points)
+        return figure_of(n_points)
+    
+    first = chart(10000)
+    assert chart(10000) is first
+    chart(10001)
+    # A third figure of the same size doesn't fit; the least recently used goes
+    chart(10002)
+    assert memo.figure_cache_info()['size'] == 2
+    assert memo.figure_cache_info()['weight'] <= budget
+    assert chart(10000) is not first
+    assert built == [10000, 10001, 10002, 10000]
+
+@pytest.fixture
+def version(monkeypatch):
+    """A settable data version, and a private calculation cache"""
+    current = [1]
+    monkeypatch.setattr(memo, 'get_data_version', lambda: current[0])
+    monkeypatch.setattr(memo, '_memo_cache', LRUCache(16))
+    return current
+
+def test_memoized_per_version_and_arguments(version):
+    calls = []
+    
+    @memoize_on_data_version
+    def total(n):
+        calls.append(n)
+        return [n * 2]
+    
+    assert total(1) is total(1)
+    assert total(2) == [4]
+    assert calls == [1, 2]
+    
+    version[0] = 2
+    assert total(1) == [2]
+    assert calls == [1, 2, 1]
+    assert memo.memo_cache_info()['hits'] == 1
+
+def test_functions_with_the_same_arguments_dont_collide(version):
+    @memoize_on_data_version
+    def first():
+        return 'first'
+    
+    @memoize_on_data_version
+    def second():
+        return 'second'
+    
+    assert (first(), second(), first()) == ('first', 'second', 'first')
+
+def test_memoized_none_is_cached(version):
+    calls = []
+    
+    @memoize_on_data_version
+    def missing():
+        calls.append(1)
+        return None
+    
+    assert missing() is None and missing() is None
+    assert calls == [1]
+
+def _version_script():
+    import streamlit as st
+    from utils.memo import bump_data_version, get_data_version
+    st.session_state.first = get_data_version()
+    st.session_state.same = get_data_version()
+    st.session_state.bumped = bump_data_version()
+
+def test_sessions_never_share_a_data_version():
+    sessions = [AppTest.from_function(_version_script).run() for _ in range(3)]
+    for at in sessions:
+        assert not at.exception
+        assert at.session_state['first'] == at.session_state['same']
+        assert at.session_state['bumped'] != at.session_state['first']
+    versions = [at.session_state[key] for at in sessions for key in ('first', 'bumped')]
+    assert len(set(versions)) == len(versions)
@@ -0,0 +1,119 @@
+import dataclasses
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+from config import MONTE_CARLO_MAX_TRADES_PER_DAY
+from data.schema import apply_trade_schema
+from utils.monte_carlo import (
+    BALANCE_HISTOGRAM_BINS,
+    CHUNK_CELLS,
+    TRADING_DAYS_PER_WEEK,
+    _simulate_chunk,
+    account_trades_per_day,
+    chunk_paths,
+    sample_r_multiples,
+    simulate_account
+)
+from tests.conftest import make_account_info, make_trades
+
+def high_frequency_trades():
+    """A journal where Account 1 averages 150 trades a day"""
+    trades = make_trades(300).drop(columns='timestamp')
+    return apply_trade_schema(trades.assign(
+        account='Account 1',
+        date=np.where(np.arange(len(trades)) < 150, '2025-01-02', '2025-01-03')
+    ))
+
+def test_trades_per_day_average():
+    trades = pd.DataFrame({'date': ['2025-01-02'] * 3 + ['2025-01-03'] * 5})
+    assert account_trades_per_day(trades) == 4
+    assert account_trades_per_day(trades.iloc[:0]) == 1
+
+def test_trades_per_day_clamped_to_limit():
+    trades = high_frequency_trades()
+    assert account_trades_per_day(trades) == MONTE_CARLO_MAX_TRADES_PER_DAY
+    assert account_trades_per_day(trades, limit=200) == 150
+
+def _monte_carlo_script():
+    from pages.risk_calculator import display_monte_carlo
+    display_monte_carlo()
+
+def test_monte_carlo_inputs_for_high_frequency_account():
+    at = AppTest.from_function(_monte_carlo_script, default_timeout=60)
+    at.session_state['trade_journal'] = high_frequency_trades()
+    at.session_state['account_info'] = make_account_info()
+    at.session_state['data_version'] = 0
+    at.run()
+    
+    assert not at.exception
+    assert at.number_input(key='mc_trades_per_day_Account 1').value == MONTE_CARLO_MAX_TRADES_PER_DAY
+
+def simulate_paths_one_by_one(seed, n_paths, r_history, method, risk_per_trade, balance, n_trades, trades_per_day,
+                              daily_stop, weekly_stop, loss_limit, target):
+    """The chunk simulation path by path and trade by trade, from the same draws"""
+    r_multiples = sample_r_multiples(np.random.default_rng(seed), r_history, (n_paths, n_trades), method)
+    daily_hits = weekly_hits = breaches = 0
+    final_balances, trades_to_target = [], []
+    for path in r_multiples:
+        equity, day_open, week_open = balance, balance, balance
+        daily_hit = weekly_hit = False
+        breach_at = reached_at = None
+        for trade, r in enumerate(path):
+            if trade % trades_per_day == 0:
+                day_open = equity
+                if trade // trades_per_day % TRADING_DAYS_PER_WEEK == 0:
+                    week_open = equity
+            equity *= max(1 + risk_per_trade * r, 0)
+            daily_hit |= equity / day_open <= 1 - daily_stop
+            weekly_hit |= equity / week_open <= 1 - weekly_stop
+            if breach_at is None and equity <= loss_limit:
+                breach_at, breach_balance = trade, equity
+            if reached_at is None and equity >= target:
+                reached_at = trade
+        daily_hits += daily_hit
+        weekly_hits += weekly_hit
+        breaches += breach_at is not None
+        final_balances.append(equity if breach_at is None else breach_balance)
+        if reached_at is not None and (breach_at is None or reached_at < breach_at):
+            trades_to_target.append(reached_at + 1)
+    return daily_hits, weekly_hits, breaches, np.array(final_balances), np.array(trades_to_target)
+
+@pytest.mark.parametrize('n_trades, trades_per_day, method', [(40, 3, 'bootstrap'), (23, 1, 'normal'), (12, 7, 'bootstrap')])
+def test_chunk_matches_path_by_path_simulation(n_trades, trades_per_day, method):
+    r_history = np.random.default_rng(1).normal(0.1, 1.5, 200)
+    task = (np.random.SeedSequence(3), 400, r_history, method, 0.02, 150000.0, n_trades, trades_per_day,
+            0.02, 0.05, 140000.0, 160000.0)
+    actual = _simulate_chunk(task)
+    expected = simulate_paths_one_by_one(*task)
+    assert actual[:3] == expected[:3]
+    assert sum(expected[:3]) > 0
+    np.testing.assert_allclose(actual[3], expected[3], rtol=1e-9)
+    np.testing.assert_array_equal(actual[4], expected[4])
+
+def test_chunks_are_bounded_by_cells():
+    for n_trades in [1, 10, 100, 1000, 10 ** 7]:
+        assert chunk_paths(n_trades) >= 1
+        assert chunk_paths(n_trades) * n_trades <= max(CHUNK_CELLS, n_trades)
+
+def test_result_keeps_only_summaries():
+    r_history = np.random.default_rng(2).normal(0.1, 1.5, 100)
+    result = simulate_account(r_history, 0.01, 150000.0, 100, 3, 0.02, 0.05, 140000.0, 165000.0, n_paths=30000)
+    for field in dataclasses.fields(result):
+        value = getattr(result, field.name)
+        assert np.size(value) <= BALANCE_HISTOGRAM_BINS + 1, field.name
+    assert result.balance_counts.sum() == result.n_paths
+    percentiles = list(result.balance_percentiles.values())
+    assert percentiles == sorted(percentiles)
+    assert result.balance_edges[0] <= percentiles[0] and percentiles[-1] <= result.balance_edges[-1]
+
+def test_result_does_not_depend_on_workers():
+    # Several chunks, so the process pool actually splits the work
+    r_history = np.random.default_rng(4).normal(0.1, 1.5, 100)
+    n_paths = chunk_paths(200) * 2 + 17
+    args = (r_history, 0.01, 150000.0, 200, 3, 0.02, 0.05, 140000.0, 165000.0)
+    serial = simulate_account(*args, n_paths=n_paths, workers=1)
+    parallel = simulate_account(*args, n_paths=n_paths, workers=2)
+    assert serial.balance_percentiles == parallel.balance_percentiles
+    np.testing.assert_array_equal(serial.balance_counts, parallel.balance_counts)
+    assert (serial.daily_stop_prob, serial.target_prob) == (parallel.daily_stop_prob, parallel.target_prob)
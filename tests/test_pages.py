@@ -0,0 +1,79 @@
+import json
+import pytest
+from streamlit.testing.v1 import AppTest
+from data.daily_view import DailyPerformanceView
+from data.data_loader import load_data
+from data.equity_state import build_equity_states
+from tests.conftest import make_account_info
+
+def _position_size_script():
+    from pages.risk_calculator import display_position_size_calculator
+    display_position_size_calculator()
+
+def number_input(at, label):
+    return next(widget for widget in at.number_input if widget.label == label)
+
+def test_position_size_fragment():
+    at = AppTest.from_function(_position_size_script)
+    at.session_state['account_info'] = make_account_info()
+    at.run()
+    assert not at.exception
+    # 1% of 150,000 over 12.5 points at $12.50 a point
+    assert at.success[0].value == "Position Size: 9 contracts"
+    
+    number_input(at, "Stop Loss (points)").set_value(25.0).run()
+    assert at.success[0].value == "Position Size: 4 contracts"
+
+def _add_trade_script():
+    from pages.trade_journal import display_add_trade_form
+    display_add_trade_form()
+
+def open_trade_form(trades):
+    daily_view = DailyPerformanceView.from_trades(trades)
+    at = AppTest.from_function(_add_trade_script)
+    at.session_state['trade_journal'] = trades
+    at.session_state['account_info'] = make_account_info()
+    at.session_state['daily_view'] = daily_view
+    at.session_state['daily_performance'] = daily_view.frame()
+    at.session_state['equity_state'] = build_equity_states(daily_view.frame())
+    at.session_state['data_version'] = 0
+    at.run()
+    assert not at.exception
+    return at
+
+def add_trade(at, entry, exit, stop):
+    number_input(at, "Entry Price").set_value(entry)
+    number_input(at, "Exit Price").set_value(exit)
+    number_input(at, "Stop Loss").set_value(stop)
+    next(button for button in at.button if button.label == "Add Trade").click()
+    return at.run()
+
+def test_add_trade_form_updates_session_and_storage(trades, persistence, data_dir):
+    at = open_trade_form(trades)
+    journal_before = len(at.session_state.trade_journal)
+    pnl_before = at.session_state.daily_performance['pnl'].sum()
+    version_before = at.session_state.data_version
+    
+    add_trade(at, 4700.0, 4710.0, 4690.0)
+    assert not at.exception
+    journal = at.session_state.trade_journal
+    assert len(journal) == journal_before + 1
+    pnl = float(journal.iloc[0]['pnl'])
+    assert at.session_state.daily_performance['pnl'].sum() - pnl_before == pnl
+    assert at.session_state.daily_view.verify(journal)
+    assert at.session_state.data_version != version_before
+    equity = at.session_state.equity_state[journal.iloc[0]['account']]
+    assert equity.last_date == journal.iloc[0]['date']
+    
+    persistence.flush()
+    logged = (data_dir / 'trades.log').read_text().splitlines()
+    assert len(logged) == 1 and json.loads(logged[0])['pnl'] == pnl
+    assert load_data('performance')['pnl'].sum() == pytest.approx(at.session_state.daily_performance['pnl'].sum())
+
+def test_add_trade_form_requires_prices(trades, persistence):
+    at = open_trade_form(trades)
+    journal_before = len(at.session_state.trade_journal)
+    add_trade(at, 4700.0, 4710.0, 0.0)
+    assert at.error[0].value == "Please fill in all required fields (Entry, Exit, Stop Loss)"
+    assert len(at.session_state.trade_journal) == journal_before
+    assert not persistence.has_pending()
@@ -0,0 +1,110 @@
+import json
+import time
+import pytest
+from data import persistence as persistence_module
+from data.data_loader import load_data, read_trade_log
+from data.equity_state import EquityState
+from data.persistence import PersistenceManager
+
+def wait_until_written(manager, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while manager.has_pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The writer takes the changes before writing them; the flush lock is held until they're on disk
+    with manager._flush_lock:
+        pass
+    assert not manager.has_pending()
+
+@pytest.fixture
+def stopped(data_dir):
+    """A manager whose writer thread has stopped, so only explicit flushes write"""
+    manager = PersistenceManager()
+    manager.shutdown()
+    return manager
+
+@pytest.fixture
+def saves(monkeypatch):
+    """Record every dataset write while still performing it"""
+    calls = []
+    save_data = persistence_module.save_data
+    
+    def recording_save(data_type, data):
+        calls.append((data_type, data))
+        save_data(data_type, data)
+    monkeypatch.setattr(persistence_module, 'save_data', recording_save)
+    return calls
+
+def test_background_writer_coalesces_changes(persistence, saves, account_info):
+    for balance in range(50):
+        account_info['Account 1']['current_balance'] = float(balance)
+        persistence.mark_dirty('account_info', account_info)
+    wait_until_written(persistence)
+    
+    # At most one write that caught an early change, then one for the rest
+    assert 1 <= len(saves) <= 2
+    assert load_data('accounts')['Account 1']['current_balance'] == 49.0
+
+def test_marked_data_is_snapshotted(persistence, account_info):
+    persistence.mark_dirty('account_info', account_info)
+    account_info['Account 1']['current_balance'] = -1.0
+    persistence.flush()
+    assert load_data('accounts')['Account 1']['current_balance'] == 150000.0
+
+def test_equity_state_is_written_as_dicts(persistence):
+    state = EquityState('Account 1')
+    state.apply('2025-01-02', -250.0)
+    persistence.mark_dirty('equity_state', {'Account 1': state})
+    persistence.flush()
+    assert EquityState.from_dict(load_data('equity')['Account 1']) == state
+
+def test_shutdown_flushes_logged_trades(data_dir, trades):
+    manager = PersistenceManager(flush_interval=60.0)
+    # After a flush the next change waits out the interval; shutdown must not
+    manager.flush()
+    records = trades.drop(columns='timestamp').head(3).astype(object).to_dict('records')
+    for record in records:
+        manager.log_trade(record)
+    time.sleep(0.1)
+    started = time.monotonic()
+    manager.shutdown()
+    
+    assert time.monotonic() - started < 5
+    assert not manager._thread.is_alive()
+    assert [trade['pnl'] for trade in read_trade_log()] == [record['pnl'] for record in records]
+
+def test_failed_write_is_retried(stopped, monkeypatch, account_info, data_dir):
+    save_data = persistence_module.save_data
+    failures = []
+    
+    def failing_save(data_type, data):
+        if not failures:
+            failures.append(data_type)
+            raise OSError("disk full")
+        save_data(data_type, data)
+    monkeypatch.setattr(persistence_module, 'save_data', failing_save)
+    
+    stopped.mark_dirty('account_info', account_info)
+    stopped.flush()
+    assert failures == ['accounts']
+    assert stopped.has_pending()
+    
+    stopped.flush()
+    assert not stopped.has_pending()
+    with open(data_dir / 'accounts.json') as f:
+        assert json.load(f)['Account 1']['current_balance'] == 150000.0
+
+def test_newer_change_wins_over_a_failed_write(stopped, monkeypatch, account_info):
+    save_data = persistence_module.save_data
+    
+    def failing_save(data_type, data):
+        # A newer change arrives while the failing write is in progress
+        newer = dict(account_info, **{'Account 1': dict(account_info['Account 1'], current_balance=1.0)})
+        stopped.mark_dirty('account_info', newer)
+        monkeypatch.setattr(persistence_module, 'save_data', save_data)
+        raise OSError("disk full")
+    monkeypatch.setattr(persistence_module, 'save_data', failing_save)
+    
+    stopped.mark_dirty('account_info', account_info)
+    stopped.flush()
+    stopped.flush()
+    assert load_data('accounts')['Account 1']['current_balance'] == 1.0
@@ -0,0 +1,55 @@
+import io
+import pandas as pd
+from data.schema import (
+    TRADE_SCHEMA, apply_trade_schema, apply_performance_schema, strip_derived_columns, concat_trades, concat_performance
+)
+from tests.conftest import make_trades
+
+def test_trade_schema_dtypes(trades):
+    for column, dtype in TRADE_SCHEMA.items():
+        assert str(trades[column].dtype) == dtype, column
+    assert str(trades['timestamp'].dtype).startswith('datetime64')
+    assert trades['timestamp'].iloc[0] == pd.Timestamp(f"{trades['date'].iloc[0]} {trades['time'].iloc[0]}")
+
+def test_schema_round_trips_through_csv(trades):
+    trades = trades.assign(notes='Breakout')
+    buffer = io.StringIO()
+    strip_derived_columns(trades).to_csv(buffer, index=False)
+    buffer.seek(0)
+    loaded = apply_trade_schema(pd.read_csv(buffer))
+    pd.testing.assert_frame_equal(loaded, trades, check_dtype=False, check_categorical=False)
+    assert list(loaded.dtypes.astype(str)) == list(trades.dtypes.astype(str))
+
+def test_malformed_time_gives_missing_timestamp(trades):
+    raw = strip_derived_columns(trades).head(2).assign(time=['10:15', 'soon'])
+    assert apply_trade_schema(raw)['timestamp'].isna().tolist() == [False, True]
+
+def test_missing_integers_use_nullable_dtype(trades):
+    raw = strip_derived_columns(trades).head(3).astype({'position_size': float})
+    raw.loc[1, 'position_size'] = None
+    assert str(apply_trade_schema(raw)['position_size'].dtype) == 'Int16'
+
+def test_concat_keeps_categories(trades):
+    first = make_trades(5, seed=1)
+    second = make_trades(5, seed=2).assign(account='Account 9')
+    combined = concat_trades([first, strip_derived_columns(second)])
+    assert combined['account'].dtype == 'category'
+    assert set(combined['account']) == set(first['account']) | {'Account 9'}
+    assert len(combined) == 10
+
+def test_concat_onto_an_empty_journal(trades):
+    # An empty trades.csv loads with object columns and untyped categories
+    header = ','.join(strip_derived_columns(trades).columns) + '\n'
+    empty = apply_trade_schema(pd.read_csv(io.StringIO(header)))
+    combined = concat_trades([strip_derived_columns(trades.head(1)), empty])
+    assert len(combined) == 1
+    assert combined['account'].dtype == 'category'
+
+def test_performance_schema():
+    performance = concat_performance([
+        pd.DataFrame({'date': ['2025-01-02'], 'account': ['Account 1'], 'pnl': [10]}),
+        pd.DataFrame({'date': ['2025-01-02'], 'account': ['Account 2'], 'pnl': [5.5]})
+    ])
+    assert performance['account'].dtype == 'category'
+    assert performance['pnl'].dtype == 'float64'
+    assert apply_performance_schema(performance) is performance
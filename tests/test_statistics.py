@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils import statistics
+from utils.statistics import (
+    permutation_test, compare_samples, describe_comparison, NORMAL_APPROX_METHOD, PERMUTATION_METHOD
+)
+
+def naive_permutation_p_value(a, b, n_shuffles, seed):
+    """p-value from shuffling the pooled sample one permutation at a time"""
+    rng = np.random.default_rng(seed)
+    pooled = np.concatenate([a, b])
+    observed = abs(np.mean(a) - np.mean(b))
+    extreme = 0
+    for _ in range(n_shuffles):
+        shuffled = rng.permuted(pooled)
+        extreme += abs(shuffled[:len(a)].mean() - shuffled[len(a):].mean()) >= observed - 1e-12
+    return (extreme + 1) / (n_shuffles + 1)
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(5)
+    return rng.normal(0.3, 1, 40), rng.normal(0, 1, 65)
+
+@pytest.mark.parametrize('block_size', [statistics.PERMUTATION_BLOCK_SIZE, 105 * 7, 100])
+def test_permutation_matches_naive_loop(samples, monkeypatch, block_size):
+    monkeypatch.setattr(statistics, 'PERMUTATION_BLOCK_SIZE', block_size)
+    a, b = samples
+    result = permutation_test(a, b, n_shuffles=500, seed=3)
+    assert result['method'] == PERMUTATION_METHOD
+    assert result['p_value'] == naive_permutation_p_value(a, b, 500, 3)
+    assert result['difference'] == pytest.approx(a.mean() - b.mean())
+
+def test_permutation_detects_a_real_difference():
+    rng = np.random.default_rng(1)
+    result = permutation_test(rng.normal(1, 1, 200), rng.normal(0, 1, 200), n_shuffles=1000, seed=2)
+    assert result['p_value'] == pytest.approx(1 / 1001)
+    assert result['effect_size'] == pytest.approx(1, abs=0.25)
+
+def test_permutation_null_is_not_significant():
+    rng = np.random.default_rng(4)
+    p_values = [permutation_test(rng.normal(0, 1, 50), rng.normal(0, 1, 50), n_shuffles=500, seed=seed)['p_value']
+                for seed in range(40)]
+    # Under the null p-values are uniform: about 5% fall below 0.05
+    assert np.mean(np.array(p_values) < 0.05) <= 0.15
+    assert 0.3 < np.mean(p_values) < 0.7
+
+def test_constant_samples():
+    assert permutation_test([1.0, 1.0, 1.0], [1.0, 1.0])['p_value'] == 1.0
+
+def test_normal_approximation_near_the_cutoff(monkeypatch):
+    rng = np.random.default_rng(8)
+    a, b = rng.normal(0.05, 1, 1500), rng.normal(0, 1, 2500)
+    exact = permutation_test(a, b, n_shuffles=4000, seed=1)
+    monkeypatch.setattr(statistics, 'PERMUTATION_EXACT_MAX_SAMPLES', len(a) + len(b) - 1)
+    approximate = permutation_test(a, b, n_shuffles=4000, seed=1)
+    assert exact['method'] == PERMUTATION_METHOD and approximate['method'] == NORMAL_APPROX_METHOD
+    assert approximate['p_value'] == pytest.approx(exact['p_value'], abs=0.02)
+
+def test_realistic_journals_run_exact_permutations():
+    rng = np.random.default_rng(0)
+    result = permutation_test(rng.normal(size=6000), rng.normal(size=9000), n_shuffles=50)
+    assert result['method'] == PERMUTATION_METHOD
+
+def test_compare_samples_and_description(monkeypatch):
+    rng = np.random.default_rng(2)
+    results = compare_samples({'A': rng.normal(1, 1, 100), 'B': rng.normal(0, 1, 100), 'C': [1.0]}, n_shuffles=200)
+    assert list(zip(results['group_a'], results['group_b'])) == [('A', 'B')]
+    assert describe_comparison(results, '{:.2f}'.format).startswith('A above B by')
+    assert 'normal approx.' not in describe_comparison(results, '{:.2f}'.format)
+    
+    monkeypatch.setattr(statistics, 'PERMUTATION_EXACT_MAX_SAMPLES', 10)
+    approximate = compare_samples({'A': rng.normal(1, 1, 100), 'B': rng.normal(0, 1, 100)})
+    assert describe_comparison(approximate, '{:.2f}'.format).endswith('normal approx.)')
+    assert describe_comparison(pd.DataFrame(), str) == "Not enough data to compare"
+
+def loop_bootstrap(trades, n_resamples, seed):
+    """Bootstrap one resample at a time, recomputing the metrics on each resampled frame"""
+    rng = np.random.default_rng(seed)
+    samples = {metric: [] for metric in ['win_rate', 'avg_win', 'avg_loss', 'expectancy', 'profit_factor']}
+    for _ in range(n_resamples):
+        sample = trades.iloc[rng.integers(0, len(trades), size=len(trades))].astype({'r_multiple': float})
+        wins = sample[sample['outcome'] == 'Win']
+        losses = sample[sample['outcome'] == 'Loss']
+        win_rate = len(wins) / len(sample)
+        avg_win = wins['r_multiple'].mean() if len(wins) else 0.0
+        avg_loss = losses['r_multiple'].mean() if len(losses) else 0.0
+        win_sum = sample.loc[sample['pnl'] > 0, 'pnl'].sum()
+        loss_sum = -sample.loc[sample['pnl'] < 0, 'pnl'].sum()
+        samples['win_rate'].append(win_rate)
+        samples['avg_win'].append(avg_win)
+        samples['avg_loss'].append(avg_loss)
+        samples['expectancy'].append(win_rate * avg_win + (1 - win_rate) * avg_loss)
+        samples['profit_factor'].append(win_sum / loss_sum if loss_sum > 0 else win_sum)
+    return samples
+
+def bootstrap(trades, n_resamples=200, seed=7):
+    return statistics.bootstrap_account_metrics(
+        trades['outcome'].to_numpy(dtype=str),
+        trades['r_multiple'].to_numpy(dtype=float),
+        trades['pnl'].to_numpy(dtype=float),
+        n_resamples,
+        seed
+    )
+
+@pytest.mark.parametrize('block_size', [statistics.BOOTSTRAP_BLOCK_SIZE, 300 * 7])
+def test_bootstrap_matches_per_resample_loop(trades, monkeypatch, block_size):
+    monkeypatch.setattr(statistics, 'BOOTSTRAP_BLOCK_SIZE', block_size)
+    trades = trades[trades['account'] == 'Account 1']
+    expected = loop_bootstrap(trades, 200, 7)
+    for metric, values in bootstrap(trades).items():
+        np.testing.assert_allclose(values, expected[metric], rtol=1e-9, err_msg=metric)
+
+def test_bootstrap_skips_missing_r_multiples(trades):
+    trades = trades.copy()
+    trades.loc[trades.index[::5], 'r_multiple'] = np.nan
+    expected = loop_bootstrap(trades, 100, 3)
+    for metric, values in bootstrap(trades, 100, 3).items():
+        np.testing.assert_allclose(values, expected[metric], rtol=1e-9, err_msg=metric)
+
+def test_bootstrap_approximation_near_the_cutoff(monkeypatch):
+    from tests.conftest import make_trades
+    trades = make_trades(statistics.BOOTSTRAP_EXACT_MAX_TRADES + 500, seed=12).assign(account='Account 1')
+    approximate = statistics.compute_metric_intervals(trades, n_resamples=2000)['Account 1']
+    monkeypatch.setattr(statistics, 'BOOTSTRAP_EXACT_MAX_TRADES', len(trades))
+    exact = statistics.compute_metric_intervals(trades, n_resamples=2000)['Account 1']
+    assert exact != approximate
+    for metric, (low, high) in exact.items():
+        width = max(high - low, 1e-6)
+        assert approximate[metric][0] == pytest.approx(low, abs=0.1 * width), metric
+        assert approximate[metric][1] == pytest.approx(high, abs=0.1 * width), metric
+
+def test_metric_intervals_cover_the_point_estimate(trades):
+    from utils.calculations import compute_account_metrics
+    intervals = statistics.compute_metric_intervals(trades, n_resamples=500)
+    metrics = compute_account_metrics(trades)
+    assert set(intervals) == set(metrics)
+    for account, account_intervals in intervals.items():
+        for metric, (low, high) in account_intervals.items():
+            assert low <= metrics[account][metric] <= high, (account, metric)
@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+from data import storage
+from data.daily_view import DailyPerformanceView
+from data.schema import apply_performance_schema, apply_trade_schema, strip_derived_columns
+from data.storage import CsvBackend, ParquetBackend, SqliteBackend, get_storage_backend, migrate_from_csv
+
+BACKENDS = [CsvBackend, ParquetBackend, SqliteBackend]
+
+def stored_tables(trades):
+    """The trades and daily performance tables as data_loader saves them"""
+    # Empty notes come back from CSV as missing values
+    trades = strip_derived_columns(trades.assign(notes='Breakout'))
+    return {'trades': trades, 'performance': DailyPerformanceView.from_trades(trades).frame()}
+
+SCHEMAS = {'trades': apply_trade_schema, 'performance': apply_performance_schema}
+
+def typed(table, df):
+    """A table typed by its schema, without categories that have no rows; only Parquet stores those"""
+    df = SCHEMAS[table](df).reset_index(drop=True)
+    categorical = df.select_dtypes('category').columns
+    return df.assign(**{column: df[column].cat.remove_unused_categories() for column in categorical})
+
+def assert_same_table(table, loaded, saved):
+    pd.testing.assert_frame_equal(typed(table, loaded), typed(table, saved))
+
+@pytest.mark.parametrize('backend_class', BACKENDS)
+def test_backend_round_trip(backend_class, tmp_path, trades):
+    backend = backend_class(str(tmp_path))
+    for table, df in stored_tables(trades).items():
+        assert not backend.exists(table)
+        backend.save(table, df)
+        assert backend.exists(table)
+        assert_same_table(table, backend.load(table), df)
+
+@pytest.mark.parametrize('backend_class', BACKENDS)
+def test_backend_save_replaces_the_table(backend_class, tmp_path, trades):
+    backend = backend_class(str(tmp_path))
+    tables = stored_tables(trades)
+    backend.save('trades', tables['trades'])
+    backend.save('trades', tables['trades'].head(5))
+    assert_same_table('trades', backend.load('trades'), tables['trades'].head(5))
+
+@pytest.mark.parametrize('backend_class', BACKENDS)
+def test_backend_column_projection(backend_class, tmp_path, trades):
+    backend = backend_class(str(tmp_path))
+    backend.save('trades', stored_tables(trades)['trades'])
+    loaded = backend.load('trades', columns=['date', 'account', 'pnl'])
+    assert sorted(loaded.columns) == ['account', 'date', 'pnl']
+    assert len(loaded) == len(trades)
+
+def test_sqlite_append(tmp_path, trades):
+    backend = SqliteBackend(str(tmp_path))
+    table = stored_tables(trades)['trades']
+    backend.save('trades', table.iloc[:100])
+    backend.append('trades', table.iloc[100:])
+    assert_same_table('trades', backend.load('trades'), table)
+
+@pytest.mark.parametrize('backend_class', [ParquetBackend, SqliteBackend])
+def test_migrate_from_csv(backend_class, tmp_path, trades):
+    tables = stored_tables(trades)
+    source = CsvBackend(str(tmp_path))
+    for table, df in tables.items():
+        source.save(table, df)
+    backend = backend_class(str(tmp_path))
+    
+    assert migrate_from_csv(backend) == ['trades', 'performance']
+    for table, df in tables.items():
+        assert_same_table(table, backend.load(table), df)
+    # Once migrated the backend's tables win; later CSV changes aren't copied again
+    source.save('trades', tables['trades'].head(3))
+    assert migrate_from_csv(backend) == []
+    assert len(backend.load('trades')) == len(trades)
+
+def test_migrate_skips_missing_csv_tables(tmp_path, trades):
+    CsvBackend(str(tmp_path)).save('performance', stored_tables(trades)['performance'])
+    backend = SqliteBackend(str(tmp_path))
+    assert migrate_from_csv(backend) == ['performance']
+    assert not backend.exists('trades')
+
+def test_parquet_falls_back_to_csv_without_pyarrow(tmp_path, monkeypatch):
+    assert isinstance(get_storage_backend('parquet', str(tmp_path)), ParquetBackend)
+    monkeypatch.setattr(storage, 'parquet_available', lambda: False)
+    assert isinstance(get_storage_backend('parquet', str(tmp_path)), CsvBackend)
+    assert isinstance(get_storage_backend('sqlite', str(tmp_path)), SqliteBackend)
+
+@pytest.fixture
+def sqlite_backend(tmp_path, trades):
+    backend = SqliteBackend(str(tmp_path))
+    backend.save('trades', strip_derived_columns(trades))
+    backend.save('performance', DailyPerformanceView.from_trades(trades).frame())
+    return backend
+
+def test_sqlite_trade_query_matches_the_journal(sqlite_backend, trades):
+    result = sqlite_backend.query_trades('Account 2', '2025-02-01', '2025-03-31')
+    expected = trades[(trades['account'] == 'Account 2') & trades['date'].between('2025-02-01', '2025-03-31')]
+    expected = expected.sort_values(['date', 'time'], ascending=False, kind='stable')
+    
+    assert list(zip(result['date'], result['time'])) == list(zip(expected['date'], expected['time']))
+    assert result['pnl'].tolist() == pytest.approx(expected['pnl'].tolist())
+    assert dict(result.dtypes.astype(str)) == dict(trades.dtypes.astype(str))
+
+def test_sqlite_daily_pnl_query(sqlite_backend, trades):
+    result = sqlite_backend.query_daily_pnl(account='Account 1', start_date='2025-03-01')
+    account = trades[(trades['account'] == 'Account 1') & (trades['date'] >= '2025-03-01')]
+    expected = account.groupby('date')['pnl'].sum()
+    
+    assert result['date'].tolist() == expected.index.tolist()
+    assert result['pnl'].tolist() == pytest.approx(expected.tolist())
+    assert str(result['account'].dtype) == 'category'
+
+def test_sqlite_projected_query(sqlite_backend):
+    result = sqlite_backend.query_trades('Account 3', columns=['date', 'pnl'])
+    assert list(result.columns) == ['date', 'pnl']
@@ -0,0 +1,31 @@
+import pytest
+from data.trade_index import TradeIndex
+from tests.conftest import ACCOUNTS
+
+@pytest.fixture
+def index(trades):
+    return TradeIndex(trades)
+
+@pytest.mark.parametrize('account', ACCOUNTS + ['Account 9'])
+def test_trades_for_matches_mask(trades, index, account):
+    expected = trades[trades['account'] == account].sort_values(['date', 'time'], kind='stable')
+    assert list(index.trades_for(account).index) == list(expected.index)
+
+def test_trades_for_reversed_is_newest_first(index):
+    newest_first = index.trades_for('Account 1').iloc[::-1]
+    keys = list(zip(newest_first['date'], newest_first['time']))
+    assert keys == sorted(keys, reverse=True)
+
+def test_day_and_range_slices(trades, index):
+    account = trades[trades['account'] == 'Account 2']
+    for date in account['date'].unique()[:10]:
+        day = account[account['date'] == date]
+        day_slice = index.day_slice('Account 2', date)
+        assert index.count(day_slice) == len(day)
+        assert index.win_count(day_slice) == (day['outcome'] == 'Win').sum()
+        assert set(index.trades_for_day('Account 2', date).index) == set(day.index)
+    
+    between = index.trades_between('Account 2', '2025-02-01', '2025-03-01')
+    expected = account[(account['date'] >= '2025-02-01') & (account['date'] <= '2025-03-01')]
+    assert set(between.index) == set(expected.index)
+    assert index.trades_between('Account 2', '2025-03-01', '2025-02-01').empty
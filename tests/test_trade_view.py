@@ -0,0 +1,78 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from data.trade_view import TradeHistoryView
+
+def direct_query(trades, accounts, outcomes, start_date):
+    """The filter, sort and summary the trade history used to run on every render"""
+    filtered = trades
+    if accounts:
+        filtered = filtered[filtered['account'].isin(accounts)]
+    if outcomes:
+        filtered = filtered[filtered['outcome'].isin(outcomes)]
+    if start_date is not None:
+        filtered = filtered[filtered['date'] >= start_date]
+    filtered = filtered.sort_values(['date', 'time'], ascending=False, kind='stable')
+    if filtered.empty:
+        return filtered, None
+    
+    win_rate = (filtered['outcome'] == 'Win').mean()
+    win_r = filtered.loc[filtered['outcome'] == 'Win', 'r_multiple'].mean()
+    loss_r = filtered.loc[filtered['outcome'] == 'Loss', 'r_multiple'].mean()
+    return filtered, {
+        'win_rate': win_rate,
+        'net_pnl': filtered['pnl'].sum(),
+        'avg_r': filtered['r_multiple'].mean(),
+        'expectancy': win_rate * win_r + (1 - win_rate) * loss_r
+    }
+
+@pytest.fixture
+def trades(trades):
+    trades = trades.copy()
+    trades.loc[trades.index[::7], 'r_multiple'] = np.nan
+    return trades
+
+def test_queries_match_direct_filtering(trades):
+    view = TradeHistoryView(trades)
+    dates = sorted(trades['date'].unique())
+    for accounts, outcomes, start_date in itertools.product(
+        [(), ('Account 1',), ('Account 2', 'Account 3')],
+        [(), ('Win',), ('Loss', 'Breakeven')],
+        [None, dates[len(dates) // 2], '2999-01-01']
+    ):
+        query = {'accounts': accounts, 'outcomes': outcomes, 'start_date': start_date}
+        expected, expected_summary = direct_query(trades, list(accounts), list(outcomes), start_date)
+        matched = trades.iloc[view.positions(**query)]
+        assert sorted(matched.index) == sorted(expected.index)
+        assert list(zip(matched['date'], matched['time'])) == list(zip(expected['date'], expected['time']))
+        
+        summary = view.summary(**query)
+        if expected_summary is None:
+            assert summary is None
+        else:
+            assert summary == pytest.approx(expected_summary, rel=1e-6, nan_ok=True)
+        
+        page = view.page(2, 20, **query)
+        assert list(page.rows.index) == list(matched.index[page.start:page.start + 20])
+
+def test_page_is_clamped(trades):
+    page = TradeHistoryView(trades).page(99, 50)
+    assert page.n_pages == page.page == 6
+    assert page.total == len(trades) and page.end == len(trades)
+
+@pytest.mark.parametrize('descending', [True, False])
+@pytest.mark.parametrize('sort_by,column', [('P&L', 'pnl'), ('R Multiple', 'r_multiple'), ('Account', 'account')])
+def test_missing_values_sort_last(trades, sort_by, column, descending):
+    trades = trades.copy()
+    missing = trades.index[[0, 10, 150, 299]]
+    trades.loc[missing, column] = np.nan
+    
+    ordered = trades.iloc[TradeHistoryView(trades).order(sort_by, descending)][column]
+    n_missing = ordered.isna().sum()
+    assert n_missing >= len(missing)
+    assert ordered.iloc[-n_missing:].isna().all()
+    
+    present = ordered.iloc[:-n_missing]
+    present = present.astype(str) if column == 'account' else present.astype(float)
+    assert present.is_monotonic_decreasing if descending else present.is_monotonic_increasing
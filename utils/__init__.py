@@ -1,13 +1,24 @@
 # Make utility functions available from the utils package
-from utils.calculations import (
-    calculate_account_metrics,
-    calculate_drawdown,
-    calculate_drawdown_statistics,
-    calculate_correlation_matrix,
-    calculate_point_value
-)
+import importlib
 
-from utils.formatting import (
-    account_summary_card,
-    download_csv
-)
\ No newline at end of file
+# Re-exported names and their modules, imported on first access so that
+# importing one submodule (app.py imports utils.profiling before anything
+# else) doesn't load the calculations, charts and their dependencies with it
+_EXPORTS = {
+    'calculate_account_metrics': 'utils.calculations',
+    'calculate_drawdown': 'utils.calculations',
+    'calculate_drawdown_statistics': 'utils.calculations',
+    'calculate_correlation_matrix': 'utils.calculations',
+    'calculate_point_value': 'utils.calculations',
+    'account_summary_card': 'utils.formatting',
+    'download_csv': 'utils.formatting'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
\ No newline at end of file
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.memo import memoize_on_data_version
+
+# Markup of a recent-trade card on the dashboard
+TRADE_CARD = """
+            <div class="trade-card {card_class}">
+                {date} - {strategy} - {outcome} - ${pnl}
+            </div>
+        """
+
+def build_equity_frame(performance, account_info):
+    """Long-form daily equity and drawdown of every account in account_info
+
+    One row per account and day, in account_info order then date order,
+    with columns Date, Account, Strategy, Equity and Drawdown (%).
+    Equity starts from the starting balance; drawdown is measured from
+    the running equity peak.
+    """
+    accounts = list(account_info)
+    names = performance['account'].astype(str)
+    daily = performance.assign(
+        account=names,
+        account_order=pd.Categorical(names, categories=accounts).codes
+    )
+    daily = daily[daily['account_order'] >= 0].sort_values(['account_order', 'date'], kind='stable')
+    
+    starting_balance = daily['account'].map({name: account['starting_balance'] for name, account in account_info.items()})
+    equity = starting_balance + daily.groupby('account_order')['pnl'].cumsum()
+    peak = equity.groupby(daily['account_order']).cummax()
+    
+    return pd.DataFrame({
+        'Date': daily['date'].to_numpy(),
+        'Account': daily['account'].to_numpy(),
+        'Strategy': daily['account'].map({name: account['strategy'] for name, account in account_info.items()}).to_numpy(),
+        'Equity': equity.to_numpy(dtype=float),
+        'Drawdown (%)': ((peak - equity) / peak * 100).to_numpy(dtype=float)
+    })
+
+def build_daily_log(performance, trades, account_info):
+    """Per-day log of every account in account_info, newest day first
+
+    Columns Account, Date, P&L ($), P&L (%) of the current balance,
+    # Trades, Win Rate and Notes. Trade counts and wins come from one
+    groupby over the journal merged onto the daily rows.
+    """
+    columns = ['Account', 'Date', 'P&L ($)', 'P&L (%)', '# Trades', 'Win Rate', 'Notes']
+    accounts = list(account_info)
+    names = performance['account'].astype(str)
+    daily = performance.assign(
+        account=names,
+        account_order=pd.Categorical(names, categories=accounts).codes
+    )
+    daily = daily[daily['account_order'] >= 0].sort_values(['account_order', 'date'], ascending=[True, False], kind='stable')
+    
+    day_trades = trades.assign(
+        account=trades['account'].astype(str),
+        win=(trades['outcome'] == 'Win').astype(int)
+    ).groupby(['account', 'date'])['win'].agg(trade_count='size', win_count='sum').reset_index()
+    daily = daily.merge(day_trades, on=['account', 'date'], how='left')
+    
+    trade_count = daily['trade_count'].fillna(0).astype(int)
+    win_rate = np.where(trade_count > 0, daily['win_count'].fillna(0) / trade_count.where(trade_count > 0, 1), 0)
+    current_balance = daily['account'].map({name: account['current_balance'] for name, account in account_info.items()})
+    
+    return pd.DataFrame({
+        'Account': daily['account'].to_numpy(),
+        'Date': daily['date'].to_numpy(),
+        'P&L ($)': daily['pnl'].to_numpy(dtype=float),
+        'P&L (%)': (daily['pnl'] / current_balance * 100).to_numpy(dtype=float),
+        '# Trades': trade_count.to_numpy(),
+        'Win Rate': pd.Series(win_rate * 100).map('{:.1f}%'.format).to_numpy(),
+        'Notes': ''
+    }, columns=columns)
+
+def build_trade_cards(trades):
+    """HTML card for each trade, win or loss styled, in the frame's order"""
+    card_class = np.where(trades['outcome'] == 'Win', 'win-trade', 'loss-trade')
+    return [
+        TRADE_CARD.format(card_class=card, date=date, strategy=strategy, outcome=outcome, pnl=pnl)
+        for card, date, strategy, outcome, pnl in zip(
+            card_class, trades['date'], trades['strategy'], trades['outcome'], trades['pnl']
+        )
+    ]
+
+@memoize_on_data_version
+def get_equity_frame():
+    """Daily equity and drawdown of all accounts for the session data"""
+    return build_equity_frame(st.session_state.daily_performance, st.session_state.account_info)
+
+@memoize_on_data_version
+def get_daily_log():
+    """Daily log of all accounts for the session data"""
+    return build_daily_log(st.session_state.daily_performance, st.session_state.trade_journal, st.session_state.account_info)
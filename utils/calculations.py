@@ -1,51 +1,340 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from datetime import datetime
 from config import INSTRUMENT_POINT_VALUES
+from utils.memo import memoize_on_data_version
+from data.trade_index import TradeIndex
+from data.analytics_cube import AnalyticsCube
+from data.trade_view import TradeHistoryView
 
-def calculate_account_metrics(account_name):
-    """Calculate performance metrics for an account"""
-    account_trades = st.session_state.trade_journal[st.session_state.trade_journal['account'] == account_name]
-    
-    total_trades = len(account_trades)
-    win_trades = len(account_trades[account_trades['outcome'] == 'Win'])
-    win_rate = win_trades / total_trades if total_trades > 0 else 0
-    
-    avg_win = account_trades[account_trades['outcome'] == 'Win']['r_multiple'].mean() if win_trades > 0 else 0
-    avg_loss = account_trades[account_trades['outcome'] == 'Loss']['r_multiple'].mean() if (total_trades - win_trades) > 0 else 0
+EMPTY_ACCOUNT_METRICS = {
+    'win_rate': 0,
+    'avg_win': 0,
+    'avg_loss': 0,
+    'expectancy': 0,
+    'profit_factor': 0
+}
+
+@memoize_on_data_version
+def get_trade_index():
+    """(account, date) row index over the session's trade journal"""
+    return TradeIndex(st.session_state.trade_journal)
+
+@memoize_on_data_version
+def get_trade_history_view():
+    """Filtered, sorted and paged access to the session's trade journal"""
+    return TradeHistoryView(st.session_state.trade_journal)
+
+@memoize_on_data_version
+def get_analytics_cube():
+    """Trade totals by account, weekday, hour, setup quality and month"""
+    return AnalyticsCube(st.session_state.trade_journal)
+
+def compute_account_metrics(trades):
+    """Calculate performance metrics for every account in one groupby pass"""
+    if trades.empty:
+        return {}
     
-    expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss) if total_trades > 0 else 0
+    is_win = trades['outcome'] == 'Win'
+    pnl = trades['pnl']
+    grouped = pd.DataFrame({
+        'account': trades['account'],
+        'trades': 1,
+        'wins': is_win,
+        'win_r': trades['r_multiple'].where(is_win),
+        'loss_r': trades['r_multiple'].where(trades['outcome'] == 'Loss'),
+        'gross_profit': pnl.where(pnl > 0, 0),
+        'gross_loss': -pnl.where(pnl < 0, 0)
+    }).groupby('account', observed=True).agg(
+        total_trades=('trades', 'sum'),
+        win_trades=('wins', 'sum'),
+        avg_win=('win_r', 'mean'),
+        avg_loss=('loss_r', 'mean'),
+        win_sum=('gross_profit', 'sum'),
+        loss_sum=('gross_loss', 'sum')
+    )
     
-    win_sum = account_trades[account_trades['pnl'] > 0]['pnl'].sum()
-    loss_sum = abs(account_trades[account_trades['pnl'] < 0]['pnl'].sum())
-    profit_factor = win_sum / loss_sum if loss_sum > 0 else win_sum
+    total_trades = grouped['total_trades']
+    win_trades = grouped['win_trades']
+    win_rate = win_trades / total_trades
+    avg_win = grouped['avg_win'].where(win_trades > 0, 0)
+    avg_loss = grouped['avg_loss'].where(total_trades - win_trades > 0, 0)
+    expectancy = (win_rate * avg_win) + ((1 - win_rate) * avg_loss)
+    profit_factor = (grouped['win_sum'] / grouped['loss_sum']).where(grouped['loss_sum'] > 0, grouped['win_sum'])
     
-    return {
+    metrics = pd.DataFrame({
         'win_rate': win_rate,
         'avg_win': avg_win,
         'avg_loss': avg_loss,
         'expectancy': expectancy,
         'profit_factor': profit_factor
-    }
+    })
+    return metrics.to_dict('index')
+
+@memoize_on_data_version
+def calculate_all_account_metrics():
+    """Performance metrics for all accounts, computed once per data version"""
+    return compute_account_metrics(st.session_state.trade_journal)
+
+def calculate_account_metrics(account_name):
+    """Calculate performance metrics for an account"""
+    # A copy, since callers add their own keys to the result
+    return dict(calculate_all_account_metrics().get(account_name, EMPTY_ACCOUNT_METRICS))
+
+def _window_sums(values, lo, hi):
+    """Sums of values[lo[i]:hi[i]] for every i from one prefix sum"""
+    prefix = np.concatenate([[0.0], np.cumsum(values, dtype=float)])
+    return prefix[hi] - prefix[lo]
+
+def compute_rolling_metrics(trades, window, by='trades'):
+    """Rolling win rate, average R, expectancy and profit factor per account
+
+    Every trade gets the metrics of the window ending at it: its account's
+    last `window` trades (by='trades'), or the trades of the last `window`
+    calendar days (by='days'). Window sums are differences of prefix sums,
+    so the cost is one sort plus O(N), whatever the window size. Trade
+    windows that aren't full yet are NaN. Calendar windows leave out trades
+    without a timestamp, which no day window can contain.
+    """
+    columns = ['account', 'date', 'timestamp', 'trades', 'win_rate', 'avg_r', 'expectancy', 'profit_factor']
+    if by == 'days':
+        trades = trades[trades['timestamp'].notna()]
+    if trades.empty:
+        return pd.DataFrame(columns=columns)
+    
+    ordered = trades.sort_values(['account', 'timestamp'], kind='stable')
+    results = []
+    for account, group in ordered.groupby('account', observed=True, sort=False):
+        n = len(group)
+        hi = np.arange(1, n + 1)
+        if by == 'days':
+            timestamps = group['timestamp'].to_numpy()
+            lo = np.searchsorted(timestamps, timestamps - np.timedelta64(window, 'D'), side='right')
+        else:
+            lo = np.maximum(hi - window, 0)
+        
+        is_win = (group['outcome'] == 'Win').to_numpy()
+        is_loss = (group['outcome'] == 'Loss').to_numpy()
+        r = np.nan_to_num(group['r_multiple'].to_numpy(dtype=float))
+        pnl = group['pnl'].to_numpy(dtype=float)
+        
+        count = hi - lo
+        wins = _window_sums(is_win, lo, hi)
+        losses = _window_sums(is_loss, lo, hi)
+        win_r = _window_sums(np.where(is_win, r, 0.0), lo, hi)
+        loss_r = _window_sums(np.where(is_loss, r, 0.0), lo, hi)
+        gross_profit = _window_sums(np.where(pnl > 0, pnl, 0.0), lo, hi)
+        gross_loss = -_window_sums(np.where(pnl < 0, pnl, 0.0), lo, hi)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = wins / count
+            avg_win = np.where(wins > 0, win_r / wins, 0.0)
+            avg_loss = np.where(losses > 0, loss_r / losses, 0.0)
+            expectancy = win_rate * avg_win + (1 - win_rate) * avg_loss
+            profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, gross_profit)
+            avg_r = _window_sums(r, lo, hi) / count
+        
+        frame = pd.DataFrame({
+            'account': account,
+            'date': group['date'].to_numpy(),
+            'timestamp': group['timestamp'].to_numpy(),
+            'trades': count,
+            'win_rate': win_rate,
+            'avg_r': avg_r,
+            'expectancy': expectancy,
+            'profit_factor': profit_factor
+        })
+        if by != 'days':
+            frame.loc[count < window, ['win_rate', 'avg_r', 'expectancy', 'profit_factor']] = np.nan
+        results.append(frame)
+    
+    return pd.concat(results, ignore_index=True)
+
+def compute_rolling_sharpe(performance, window, periods_per_year=252):
+    """Annualized Sharpe-style ratio of daily P&L over each account's last `window` days
+
+    Uses running sums of P&L and squared P&L, so each window is O(1).
+    """
+    results = []
+    for account, daily in performance.sort_values('date').groupby('account', observed=True, sort=False):
+        pnl = daily['pnl'].to_numpy(dtype=float)
+        hi = np.arange(1, len(pnl) + 1)
+        lo = np.maximum(hi - window, 0)
+        count = hi - lo
+        total = _window_sums(pnl, lo, hi)
+        total_sq = _window_sums(pnl * pnl, lo, hi)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count
+            variance = np.maximum(total_sq - total * mean, 0) / (count - 1)
+            sharpe = mean / np.sqrt(variance) * np.sqrt(periods_per_year)
+        sharpe[(count < window) | ~np.isfinite(sharpe)] = np.nan
+        
+        results.append(pd.DataFrame({'account': account, 'date': daily['date'].to_numpy(), 'sharpe': sharpe}))
+    
+    if not results:
+        return pd.DataFrame(columns=['account', 'date', 'sharpe'])
+    return pd.concat(results, ignore_index=True)
+
+@memoize_on_data_version
+def calculate_rolling_metrics(window, by='trades'):
+    """Rolling trade metrics for all accounts in the session journal"""
+    return compute_rolling_metrics(st.session_state.trade_journal, window, by)
+
+@memoize_on_data_version
+def calculate_rolling_sharpe(window):
+    """Rolling daily Sharpe-style ratio for all accounts"""
+    return compute_rolling_sharpe(st.session_state.daily_performance, window)
+
+def get_equity_state(account_name):
+    """Running equity/drawdown state of an account, kept current as trades are added"""
+    return st.session_state.equity_state.get(account_name)
 
 def calculate_drawdown(account_name):
-    """Calculate current and maximum drawdown for an account"""
-    account_daily = st.session_state.daily_performance[
-        st.session_state.daily_performance['account'] == account_name
-    ].sort_values('date')
+    """Current and maximum drawdown in $ below the running peak, starting from the starting balance"""
+    state = get_equity_state(account_name)
+    if state is None or state.days == 0:
+        return 0, 0
+    return state.current_drawdown, state.max_drawdown
+
+def equity_curve(pnl, starting_balance):
+    """Equity, running peak and drawdown in $ for a sequence of daily P&L
+
+    The starting balance is the first peak, so losing from day one counts
+    as a drawdown.
+    """
+    equity = starting_balance + np.cumsum(np.asarray(pnl, dtype=float))
+    peak = np.maximum.accumulate(np.maximum(equity, starting_balance)) if len(equity) else equity
+    return equity, peak, peak - equity
+
+def find_drawdown_episodes(dates, pnl, starting_balance):
+    """Every drawdown episode in one account's daily P&L, in one linear pass
+
+    An episode is a run of days with equity below its running peak. It
+    starts at the peak before the run, bottoms at the trough and ends on
+    the first day equity is back at the peak; episodes still under water
+    have no recovery date. Durations are in calendar days.
+    """
+    columns = ['start', 'trough', 'recovery', 'depth', 'depth_pct', 'trading_days', 'days_under_water', 'recovery_days']
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    equity, peak, drawdown = equity_curve(pnl, starting_balance)
+    underwater = drawdown > 1e-9
+    if not underwater.any():
+        return pd.DataFrame(columns=columns)
     
-    # Calculate cumulative PnL
-    account_daily['cum_pnl'] = account_daily['pnl'].cumsum()
+    # Run boundaries of the underwater mask
+    edges = np.diff(np.concatenate([[0], underwater.astype(np.int8), [0]]))
+    first = np.flatnonzero(edges == 1)
+    last = np.flatnonzero(edges == -1) - 1
     
-    # Calculate drawdown
-    account_daily['peak'] = account_daily['cum_pnl'].cummax()
-    account_daily['drawdown'] = account_daily['peak'] - account_daily['cum_pnl']
+    # Deepest point of each run: segment maxima, then the first day reaching them
+    episode = np.cumsum(edges[:-1] == 1) - 1
+    depth = np.maximum.reduceat(drawdown, first)
+    at_depth = np.flatnonzero(underwater & (drawdown == depth[episode]))
+    trough = at_depth[np.concatenate([[True], np.diff(episode[at_depth]) != 0])]
     
-    current_drawdown = account_daily['drawdown'].iloc[-1] if not account_daily.empty else 0
-    max_drawdown = account_daily['drawdown'].max() if not account_daily.empty else 0
+    # The peak is the day before the run, or the starting balance on the first day
+    start = np.where(first > 0, dates[np.maximum(first - 1, 0)], dates[first])
+    recovered = last + 1 < len(dates)
+    recovery = np.where(recovered, dates[np.minimum(last + 1, len(dates) - 1)], np.datetime64('NaT'))
+    end = np.where(recovered, recovery, dates[-1])
+    
+    return pd.DataFrame({
+        'start': start,
+        'trough': dates[trough],
+        'recovery': recovery,
+        'depth': depth,
+        'depth_pct': depth / peak[trough] * 100,
+        'trading_days': last - first + 1,
+        'days_under_water': (end - start).astype(int),
+        'recovery_days': np.where(recovered, (end - dates[trough]).astype(int), np.nan)
+    })
+
+def compute_drawdown_episodes(performance, account_info):
+    """Drawdown episodes of every account, one row per episode"""
+    episodes = []
+    for account, daily in performance.sort_values('date').groupby('account', observed=True, sort=False):
+        account = str(account)
+        starting_balance = account_info.get(account, {}).get('starting_balance', 0.0)
+        found = find_drawdown_episodes(daily['date'].to_numpy(), daily['pnl'].to_numpy(), starting_balance)
+        if not found.empty:
+            episodes.append(found.assign(account=account))
+    
+    if not episodes:
+        return pd.DataFrame(columns=['account', 'start', 'trough', 'recovery', 'depth', 'depth_pct',
+                                     'trading_days', 'days_under_water', 'recovery_days'])
+    result = pd.concat(episodes, ignore_index=True)
+    return result[['account'] + [column for column in result.columns if column != 'account']]
+
+@memoize_on_data_version
+def calculate_drawdown_episodes():
+    """Drawdown episodes for all accounts in the session data"""
+    return compute_drawdown_episodes(st.session_state.daily_performance, st.session_state.account_info)
+
+def compute_intraday_equity(trades):
+    """Each account's equity path within every trading session, at trade resolution
+
+    Trades are ordered by account, date and time; session P&L is a
+    cumulative sum per (account, date), and the session peak a cumulative
+    max that starts at the opening balance. Drawdown is peak to current,
+    so a session that rallies and gives it back shows the full giveback.
+    """
+    columns = ['account', 'date', 'time', 'pnl', 'session_pnl', 'session_peak', 'session_drawdown']
+    if trades.empty:
+        return pd.DataFrame(columns=columns)
     
-    return current_drawdown, max_drawdown
+    ordered = trades[['account', 'date', 'time', 'pnl']].sort_values(['account', 'date', 'time'], kind='stable')
+    sessions = [ordered['account'], ordered['date']]
+    session_pnl = ordered['pnl'].groupby(sessions, observed=True, sort=False).cumsum()
+    session_peak = session_pnl.groupby(sessions, observed=True, sort=False).cummax().clip(lower=0)
+    return ordered.assign(
+        session_pnl=session_pnl,
+        session_peak=session_peak,
+        session_drawdown=session_peak - session_pnl
+    ).reset_index(drop=True)
 
+def compute_intraday_sessions(intraday):
+    """Per (account, date) session summary of an intraday equity frame
+
+    max_drawdown is the deepest peak-to-trough drawdown in the session,
+    max_loss the deepest point below the opening balance and
+    current_drawdown the drawdown after the session's last trade.
+    """
+    grouped = intraday.groupby(['account', 'date'], observed=True)
+    sessions = grouped.agg(
+        trades=('pnl', 'size'),
+        pnl=('session_pnl', 'last'),
+        max_drawdown=('session_drawdown', 'max'),
+        low=('session_pnl', 'min'),
+        current_drawdown=('session_drawdown', 'last')
+    )
+    return sessions.assign(max_loss=(-sessions['low']).clip(lower=0)).drop(columns='low')
+
+@memoize_on_data_version
+def calculate_intraday_equity():
+    """Trade-level intraday equity of every account in the session journal"""
+    return compute_intraday_equity(st.session_state.trade_journal)
+
+@memoize_on_data_version
+def calculate_intraday_sessions():
+    """Intraday drawdown of every account's trading sessions"""
+    return compute_intraday_sessions(calculate_intraday_equity())
+
+def calculate_intraday_drawdown(account_name, date=None):
+    """Current and maximum intraday drawdown of an account's session, today's by default
+
+    This is the figure a prop firm's daily loss rule is measured on. An
+    account with no trades in the session has no drawdown.
+    """
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    sessions = calculate_intraday_sessions()
+    if (account_name, date) not in sessions.index:
+        return 0, 0
+    session = sessions.loc[(account_name, date)]
+    return session['current_drawdown'], session['max_drawdown']
+
+@memoize_on_data_version
 def calculate_drawdown_statistics(account_name):
     """Calculate detailed drawdown statistics for an account"""
     account = st.session_state.account_info[account_name]
@@ -61,74 +350,121 @@ def calculate_drawdown_statistics(account_name):
             'Max Drawdown': "0.00%",
             'Date': "N/A",
             'Avg Drawdown': "0.00%",
+            'Episodes': 0,
             'Recovery Days': "N/A"
         }
     
-    # Calculate cumulative equity and drawdown
-    initial_balance = account['starting_balance']
-    account_daily['equity'] = initial_balance + account_daily['pnl'].cumsum()
-    account_daily['peak'] = account_daily['equity'].cummax()
-    account_daily['drawdown'] = account_daily['peak'] - account_daily['equity']
-    account_daily['drawdown_pct'] = account_daily['drawdown'] / account_daily['peak'] * 100
-    
-    # Find max drawdown
-    max_dd = account_daily['drawdown_pct'].max()
-    max_dd_date = account_daily.loc[account_daily['drawdown_pct'].idxmax(), 'date'] if max_dd > 0 else "N/A"
-    
-    # Calculate average drawdown
-    avg_dd = account_daily['drawdown_pct'].mean()
-    
-    # Calculate recovery time (days from max drawdown to full recovery)
-    recovery_days = "N/A"
-    if max_dd > 0:
-        max_dd_idx = account_daily['drawdown_pct'].idxmax()
-        # Check if drawdown has recovered
-        if account_daily.loc[max_dd_idx:, 'drawdown_pct'].min() < 0.1:  # Consider recovered if < 0.1%
-            recovered_idx = account_daily.loc[max_dd_idx:].loc[account_daily['drawdown_pct'] < 0.1].index[0]
-            recovery_days = recovered_idx - max_dd_idx
-        else:
-            recovery_days = "Ongoing"
+    _, peak, drawdown = equity_curve(account_daily['pnl'].to_numpy(), account['starting_balance'])
+    avg_dd = (drawdown / peak * 100).mean()
+    
+    episodes = calculate_drawdown_episodes()
+    episodes = episodes[episodes['account'] == account_name]
+    if episodes.empty:
+        max_dd, max_dd_date, recovery_days = 0.0, "N/A", "N/A"
+    else:
+        # Recovery time of the deepest episode, in calendar days from its trough
+        deepest = episodes.loc[episodes['depth_pct'].idxmax()]
+        max_dd = deepest['depth_pct']
+        max_dd_date = deepest['trough'].strftime('%Y-%m-%d')
+        recovery_days = "Ongoing" if pd.isna(deepest['recovery']) else int(deepest['recovery_days'])
     
     return {
         'Strategy': strategy,
         'Max Drawdown': f"{max_dd:.2f}%",
         'Date': max_dd_date,
         'Avg Drawdown': f"{avg_dd:.2f}%",
+        'Episodes': len(episodes),
         'Recovery Days': recovery_days
     }
 
+def strategy_daily_matrix(performance, account_info):
+    """Pivot daily P&L into a date x strategy matrix, 0 where a strategy didn't trade"""
+    strategies = performance['account'].astype(str).map(
+        {name: account['strategy'] for name, account in account_info.items()}
+    )
+    matrix = performance.assign(strategy=strategies.fillna(performance['account'].astype(str))).pivot_table(
+        index='date', columns='strategy', values='pnl', aggfunc='sum', fill_value=0, observed=True
+    )
+    matrix.columns = matrix.columns.astype(str)
+    return matrix.sort_index().astype(float)
+
+def _correlation_from_moments(count, sums, cross):
+    """Pearson correlations from window counts, column sums and cross-product sums
+
+    `sums` is (..., k) and `cross` is (..., k, k). Columns with no variance
+    in the window give NaN, as DataFrame.corr does.
+    """
+    count = np.asarray(count, dtype=float)[..., None, None]
+    covariance = cross - sums[..., :, None] * sums[..., None, :] / count
+    variance = np.diagonal(covariance, axis1=-2, axis2=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.sqrt(np.where(variance > 1e-12, variance, np.nan))
+        corr = covariance / (scale[..., :, None] * scale[..., None, :])
+    return np.clip(corr, -1, 1)
+
+def mean_abs_correlation(corr):
+    """Mean absolute off-diagonal correlation of a (..., k, k) matrix, ignoring NaN pairs"""
+    corr = np.asarray(corr, dtype=float)
+    pairs = np.abs(corr[..., ~np.eye(corr.shape[-1], dtype=bool)])
+    valid = np.isfinite(pairs)
+    count = valid.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, np.where(valid, pairs, 0).sum(axis=-1) / count, np.nan)
+
+def compute_correlation_matrix(matrix):
+    """Correlation between the columns of a date x strategy matrix
+
+    Returns the correlation dataframe and the mean absolute off-diagonal
+    correlation (NaN with fewer than two strategies or two days).
+    """
+    values = matrix.to_numpy(dtype=float)
+    if values.shape[0] < 2:
+        corr = np.full((values.shape[1], values.shape[1]), np.nan)
+    else:
+        corr = _correlation_from_moments(values.shape[0], values.sum(axis=0), values.T @ values)
+    corr_matrix = pd.DataFrame(corr, index=matrix.columns, columns=matrix.columns)
+    return corr_matrix, float(mean_abs_correlation(corr))
+
+def compute_rolling_correlation(matrix, window):
+    """Correlation matrix over each trailing `window` days of a date x strategy matrix
+
+    Column sums and cross products are prefix-summed once, so each window's
+    matrix is a difference of two prefixes rather than a fresh .corr().
+    Returns the window end dates and a (windows, k, k) array.
+    """
+    values = matrix.to_numpy(dtype=float)
+    n, k = values.shape
+    if n < window or window < 2:
+        return matrix.index[:0], np.empty((0, k, k))
+    
+    zero = np.zeros((1, k))
+    prefix_sums = np.concatenate([zero, np.cumsum(values, axis=0)])
+    prefix_cross = np.concatenate([zero[:, :, None] * zero[:, None, :], np.cumsum(values[:, :, None] * values[:, None, :], axis=0)])
+    hi = np.arange(window, n + 1)
+    lo = hi - window
+    corr = _correlation_from_moments(
+        np.full(len(hi), window),
+        prefix_sums[hi] - prefix_sums[lo],
+        prefix_cross[hi] - prefix_cross[lo]
+    )
+    return matrix.index[window - 1:], corr
+
+@memoize_on_data_version
+def get_strategy_daily_matrix():
+    """Date x strategy daily P&L matrix for the session data"""
+    return strategy_daily_matrix(st.session_state.daily_performance, st.session_state.account_info)
+
+@memoize_on_data_version
 def calculate_correlation_matrix():
     """Calculate correlation matrix between strategies"""
-    # Calculate PnL by day for each strategy
-    strategy_daily = {}
-    
-    for account_name in ["Account 1", "Account 2", "Account 3"]:
-        strategy = st.session_state.account_info[account_name]['strategy']
-        account_daily = st.session_state.daily_performance[
-            st.session_state.daily_performance['account'] == account_name
-        ].sort_values('date')
-        
-        strategy_daily[strategy] = account_daily[['date', 'pnl']].rename(columns={'pnl': strategy})
-    
-    # Create a dataframe with all strategies
-    corr_data = strategy_daily['Hourly Quarters']
-    for strategy in ['930 Strategy', 'Lab Strategy']:
-        corr_data = pd.merge(corr_data, strategy_daily[strategy], on='date', how='outer')
-    
-    # Fill NaN values with 0
-    corr_data = corr_data.fillna(0)
-    
-    # Calculate correlation matrix
-    corr_matrix = corr_data[['Hourly Quarters', '930 Strategy', 'Lab Strategy']].corr()
-    
-    # Calculate average correlation (absolute values)
-    hourly_930 = corr_matrix.loc['Hourly Quarters', '930 Strategy']
-    hourly_lab = corr_matrix.loc['Hourly Quarters', 'Lab Strategy']
-    lab_930 = corr_matrix.loc['Lab Strategy', '930 Strategy']
-    
-    avg_correlation = (abs(hourly_930) + abs(hourly_lab) + abs(lab_930)) / 3
-    
-    return corr_matrix, avg_correlation
+    return compute_correlation_matrix(get_strategy_daily_matrix())
+
+@memoize_on_data_version
+def calculate_rolling_correlation(window):
+    """Rolling correlation between strategies over the last `window` trading days"""
+    matrix = get_strategy_daily_matrix()
+    dates, corr = compute_rolling_correlation(matrix, window)
+    return dates, list(matrix.columns), corr
 
 def calculate_point_value(instrument):
     """Get point value for an instrument"""
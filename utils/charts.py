@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from config import CHART_MAX_POINTS, WEBGL_POINT_THRESHOLD
+
+def lttb_indices(y, n_out, x=None):
+    """Positions kept by largest-triangle-three-buckets downsampling
+
+    Keeps the first and last point and, from each of n_out - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the next bucket's average. Visually
+    significant turns survive; flat stretches collapse.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(int) + 1
+    edges[-1] = n - 1
+    
+    # Each bucket's average, used as the third vertex by the bucket before it
+    bucket_ids = np.repeat(np.arange(n_out - 2), np.diff(edges))
+    counts = np.bincount(bucket_ids)
+    avg_x = np.append(np.bincount(bucket_ids, x[1:n - 1]) / counts, x[-1])
+    avg_y = np.append(np.bincount(bucket_ids, y[1:n - 1]) / counts, y[-1])
+    
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs(
+            (x[previous] - avg_x[bucket + 1]) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (avg_y[bucket + 1] - y[previous])
+        )
+        previous = lo + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+def minmax_indices(y, n_out):
+    """Positions of the minimum and maximum of each of n_out / 2 buckets"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(rows).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    rows = rows[valid]
+    return np.unique(np.concatenate([
+        offsets + np.nanargmin(rows, axis=1),
+        offsets + np.nanargmax(rows, axis=1),
+        [0, n - 1]
+    ]))
+
+def downsample_indices(y, max_points=CHART_MAX_POINTS, method='lttb'):
+    """Sorted positions to plot for a series, always including its extremes
+
+    The global minimum and maximum are kept whatever the method, so an
+    equity peak or a drawdown trough is never smoothed away. The method
+    picks two points fewer to leave room for them, so a series never
+    exceeds max_points.
+    """
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return np.arange(len(y))
+    
+    n_out = max(max_points - 2, 3)
+    picked = lttb_indices(y, n_out) if method == 'lttb' else minmax_indices(y, n_out)
+    finite = np.isfinite(y)
+    extremes = [int(np.nanargmin(y)), int(np.nanargmax(y))] if finite.any() else []
+    return np.unique(np.concatenate([picked, extremes]).astype(int))
+
+def downsample_frame(df, y_columns, by=None, max_points=CHART_MAX_POINTS, method='lttb'):
+    """Rows of an ordered frame to plot, per `by` group
+
+    A row is kept when any of `y_columns` selects it, so e.g. equity and
+    drawdown plotted from one frame share x values and keep both series'
+    turning points.
+    """
+    if by is None:
+        groups = [df]
+    else:
+        groups = [group for _, group in df.groupby(by, observed=True, sort=False)]
+    
+    kept = []
+    for group in groups:
+        if len(group) <= max_points:
+            kept.append(group)
+            continue
+        positions = np.unique(np.concatenate([
+            downsample_indices(group[column].to_numpy(dtype=float), max_points, method) for column in y_columns
+        ]))
+        kept.append(group.iloc[positions])
+    return pd.concat(kept) if kept else df
+
+def render_mode(n_points):
+    """Plotly Express render_mode for a figure with this many points"""
+    return 'webgl' if n_points > WEBGL_POINT_THRESHOLD else 'svg'
+
+def line_trace(x, y, total_points=None, **kwargs):
+    """A line trace, WebGL-rendered when the figure holds many points
+
+    `total_points` is the point count of the whole figure, since that is
+    what the browser has to draw; it defaults to this trace's length.
+    """
+    total_points = len(x) if total_points is None else total_points
+    trace = go.Scattergl if total_points > WEBGL_POINT_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, mode=kwargs.pop('mode', 'lines'), **kwargs)
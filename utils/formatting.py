@@ -6,16 +6,11 @@ from datetime import datetime, timedelta
 def account_summary_card(account_name, header_class):
     """Create an account summary card for the dashboard"""
     account = st.session_state.account_info[account_name]
-    today_pnl = st.session_state.daily_performance[
-        (st.session_state.daily_performance['account'] == account_name) & 
-        (st.session_state.daily_performance['date'] == datetime.now().strftime('%Y-%m-%d'))
-    ]['pnl'].sum()
-    
-    week_pnl = st.session_state.daily_performance[
-        (st.session_state.daily_performance['account'] == account_name) & 
-        (pd.to_datetime(st.session_state.daily_performance['date']) >= 
-         pd.to_datetime(datetime.now() - timedelta(days=7)))
-    ]['pnl'].sum()
+    # The last 7 days, today first; the session's daily view looks each one up directly
+    week = [(datetime.now() - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(7)]
+    daily_view = st.session_state.daily_view
+    today_pnl = daily_view.pnl(account_name, week[0])
+    week_pnl = sum(daily_view.pnl(account_name, day) for day in week)
     
     from utils.calculations import calculate_account_metrics
     metrics = calculate_account_metrics(account_name)
@@ -32,6 +27,19 @@ def account_summary_card(account_name, header_class):
         </div>
     """, unsafe_allow_html=True)
 
+def format_metric(metric, value):
+    """Format an account metric value for display"""
+    if metric == 'win_rate':
+        return f"{value*100:.1f}%"
+    return f"{value:.2f}"
+
+def format_interval(metric, interval):
+    """Format a (low, high) confidence interval of an account metric"""
+    if interval is None:
+        return "N/A"
+    low, high = interval
+    return f"{format_metric(metric, low)} – {format_metric(metric, high)}"
+
 def download_csv(df, filename):
     """Create a download link for a dataframe as CSV"""
     csv = df.to_csv(index=False)
@@ -0,0 +1,143 @@
+import functools
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+import streamlit as st
+from config import MEMO_CACHE_SIZE, FIGURE_CACHE_MAX_BYTES
+
+# Process-wide so every session gets versions no other session uses
+_versions = itertools.count(1)
+
+def get_data_version():
+    """Current data version of this session"""
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = next(_versions)
+    return st.session_state.data_version
+
+def bump_data_version():
+    """Mark this session's data as changed; call after every mutation"""
+    st.session_state.data_version = next(_versions)
+    return st.session_state.data_version
+
+# Estimated bytes of a figure beyond its trace data: layout, templates and plotly objects
+FIGURE_OVERHEAD_BYTES = 64 * 1024
+
+# Trace attributes that hold per-point data
+FIGURE_DATA_ATTRIBUTES = ('x', 'y', 'z', 'text', 'hovertext', 'customdata', 'ids', 'labels', 'values')
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with hit/miss counters
+
+    By default maxsize bounds the number of entries. With `weigh`, it
+    bounds the total weight of the values instead, e.g. their estimated
+    size in bytes; a value heavier than the whole budget isn't stored.
+    """
+
+    def __init__(self, maxsize, weigh=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._weigh = weigh or (lambda value: 1)
+        self._weight = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        weight = self._weigh(value)
+        with self._lock:
+            if key in self._entries:
+                self._weight -= self._entries.pop(key)[1]
+            if weight > self.maxsize:
+                return
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while self._weight > self.maxsize:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._weight -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'weight': self._weight,
+                'maxsize': self.maxsize
+            }
+
+def estimate_figure_bytes(figure):
+    """Rough memory held by a figure: its traces' and animation frames' point data plus a fixed overhead"""
+    if figure is None:
+        return 0
+    traces = list(figure.data)
+    for frame in figure.frames:
+        traces.extend(frame.data)
+    total = FIGURE_OVERHEAD_BYTES
+    for trace in traces:
+        for name in FIGURE_DATA_ATTRIBUTES:
+            value = getattr(trace, name, None)
+            if value is not None and not isinstance(value, str):
+                total += np.asarray(value).nbytes
+    return total
+
+_memo_cache = LRUCache(MEMO_CACHE_SIZE)
+_figure_cache = LRUCache(FIGURE_CACHE_MAX_BYTES, weigh=estimate_figure_bytes)
+_MISSING = object()
+
+def _memoize_in(cache, func):
+    """Wrap func to cache its results in `cache` on (function, data version, arguments)"""
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = (func.__qualname__, get_data_version(), args)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(*args)
+            cache.put(key, result)
+        return result
+    return wrapper
+
+def memoize_on_data_version(func):
+    """Cache a calculation on (function, session data version, arguments)
+
+    The wrapped function must only read session data and return a value
+    callers don't mutate. A rerun that hasn't changed data gets the cached
+    result without touching any frame.
+    """
+    return _memoize_in(_memo_cache, func)
+
+def cache_figure(func):
+    """Cache a built chart on (figure function, session data version, view parameters)
+
+    The arguments are the view parameters the figure depends on, such as
+    widget values. Figures live in their own cache, bounded by their
+    estimated size rather than their count, so a few large charts can't
+    evict the calculation results behind them or hold unbounded memory.
+    A rerun that hasn't changed data or those parameters reuses the
+    figure, skipping both the aggregation and the figure construction.
+    """
+    return _memoize_in(_figure_cache, func)
+
+def memo_cache_info():
+    """Hit/miss counters and size of the calculation cache"""
+    return _memo_cache.info()
+
+def figure_cache_info():
+    """Hit/miss counters, entry count and estimated bytes of the figure cache"""
+    return _figure_cache.info()
@@ -0,0 +1,189 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+import streamlit as st
+from config import MONTE_CARLO_MAX_LOSS, MONTE_CARLO_MAX_TRADES_PER_DAY, MONTE_CARLO_SEED, MONTE_CARLO_WORKERS
+from utils.memo import memoize_on_data_version
+from utils.calculations import get_trade_index
+
+# Path x trade cells simulated per chunk. Bounds a chunk's float arrays to
+# about 16 MB each whatever the trade count, and is the unit handed to worker
+# processes; results don't depend on the worker count.
+CHUNK_CELLS = 2_000_000
+TRADING_DAYS_PER_WEEK = 5
+# Final balance percentiles reported, and bins of the final balance histogram
+BALANCE_PERCENTILES = (5, 25, 50, 75, 95)
+BALANCE_HISTOGRAM_BINS = 60
+
+@dataclass
+class MonteCarloResult:
+    """Summary of simulating many sequences of future trades for one account
+
+    Only summary statistics are kept, not the per-path balances, so a
+    memoized result stays a few kilobytes whatever the path count.
+    """
+    n_paths: int
+    n_trades: int
+    trades_per_day: int
+    daily_stop_prob: float
+    weekly_stop_prob: float
+    max_loss_prob: float
+    target_prob: float
+    # Mean trades needed by the paths that reached the target
+    expected_trades_to_target: float
+    # Final balance at each of BALANCE_PERCENTILES
+    balance_percentiles: dict
+    # Final balance histogram: path counts and the BALANCE_HISTOGRAM_BINS + 1 bin edges
+    balance_counts: np.ndarray
+    balance_edges: np.ndarray
+
+    @property
+    def expected_days_to_target(self):
+        return self.expected_trades_to_target / self.trades_per_day
+
+def sample_r_multiples(rng, r_history, shape, method='bootstrap'):
+    """Draw R multiples by resampling history or from a normal fit to it"""
+    r_history = np.asarray(r_history, dtype=float)
+    if method == 'normal':
+        return rng.normal(r_history.mean(), r_history.std(ddof=1), size=shape)
+    return r_history[rng.integers(0, len(r_history), size=shape)]
+
+def _simulate_chunk(task):
+    """Simulate one chunk of paths; module-level so worker processes can run it"""
+    (seed, n_paths, r_history, method, risk_per_trade, balance, n_trades, trades_per_day,
+     daily_stop, weekly_stop, loss_limit, target) = task
+    rng = np.random.default_rng(seed)
+    
+    # Per-trade growth factors, padded to whole days; padding trades don't move equity.
+    # This one buffer later holds the balances, so a chunk keeps two full-size float arrays.
+    n_days = -(-n_trades // trades_per_day)
+    padded = np.ones((n_paths, n_days * trades_per_day))
+    growth = padded[:, :n_trades]
+    
+    # Fixed-fractional sizing: every trade risks risk_per_trade of the current balance
+    r_multiples = sample_r_multiples(rng, r_history, (n_paths, n_trades), method)
+    r_multiples *= risk_per_trade
+    r_multiples += 1
+    np.maximum(r_multiples, 0, out=growth)
+    del r_multiples
+    
+    # Intraday lows relative to the day's opening balance
+    intraday = np.cumprod(padded.reshape(n_paths, n_days, trades_per_day), axis=2)
+    day_low = intraday.min(axis=2)
+    daily_hit = (day_low <= 1 - daily_stop).any(axis=1)
+    
+    # Weekly lows: equity before each day within its week times that day's low
+    n_weeks = -(-n_days // TRADING_DAYS_PER_WEEK)
+    day_close = np.ones((n_paths, n_weeks * TRADING_DAYS_PER_WEEK))
+    day_close[:, :n_days] = intraday[:, :, -1]
+    del intraday
+    week_low = np.ones_like(day_close)
+    week_low[:, :n_days] = day_low
+    day_close = day_close.reshape(n_paths, n_weeks, TRADING_DAYS_PER_WEEK)
+    week_open = np.concatenate([np.ones((n_paths, n_weeks, 1)), np.cumprod(day_close, axis=2)[:, :, :-1]], axis=2)
+    weekly_hit = (week_open * week_low.reshape(day_close.shape) <= 1 - weekly_stop).any(axis=(1, 2))
+    
+    # Balances after each trade, in place of the growth factors
+    balances = np.cumprod(growth, axis=1, out=growth)
+    balances *= balance
+    
+    # The account stops trading at the first breach of the max loss limit
+    breached = balances <= loss_limit
+    breach_hit = breached.any(axis=1)
+    breach_at = np.where(breach_hit, breached.argmax(axis=1), n_trades)
+    final_balances = balances[np.arange(n_paths), np.minimum(breach_at, n_trades - 1)]
+    
+    # Paths reaching the target before any breach, and the trade they reach it on
+    reached = balances >= target
+    reached_at = reached.argmax(axis=1)
+    target_hit = reached.any(axis=1) & (reached_at < breach_at)
+    
+    return daily_hit.sum(), weekly_hit.sum(), breach_hit.sum(), final_balances, reached_at[target_hit] + 1
+
+def simulate_account(r_history, risk_per_trade, balance, n_trades, trades_per_day, daily_stop, weekly_stop,
+                     loss_limit, target, n_paths=100000, method='bootstrap', seed=MONTE_CARLO_SEED, workers=1):
+    """Monte Carlo projection of an account's next `n_trades` trades
+
+    Each path draws R multiples from `r_history` (or a normal fit) and
+    compounds them at `risk_per_trade`. Reports how often a path touches
+    the daily or weekly stop (measured from each day's or week's opening
+    balance), breaches the absolute `loss_limit` balance, or reaches the
+    `target` balance first. Paths are simulated in chunks of
+    chunk_paths(n_trades) seeded from one SeedSequence, so a seed gives the
+    same result serially or across `workers` processes (0 uses every core).
+    """
+    trades_per_day = max(int(trades_per_day), 1)
+    size = chunk_paths(n_trades)
+    chunks = [size] * (n_paths // size)
+    if n_paths % size:
+        chunks.append(n_paths % size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [
+        (chunk_seed, chunk, np.asarray(r_history, dtype=float), method, risk_per_trade, balance, n_trades,
+         trades_per_day, daily_stop, weekly_stop, loss_limit, target)
+        for chunk_seed, chunk in zip(seeds, chunks)
+    ]
+    
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+    
+    daily_hits, weekly_hits, breaches, final_balances, trades_to_target = zip(*results)
+    final_balances = np.concatenate(final_balances)
+    trades_to_target = np.concatenate(trades_to_target)
+    counts, edges = np.histogram(final_balances, bins=BALANCE_HISTOGRAM_BINS)
+    return MonteCarloResult(
+        n_paths=n_paths,
+        n_trades=n_trades,
+        trades_per_day=trades_per_day,
+        daily_stop_prob=sum(daily_hits) / n_paths,
+        weekly_stop_prob=sum(weekly_hits) / n_paths,
+        max_loss_prob=sum(breaches) / n_paths,
+        target_prob=len(trades_to_target) / n_paths,
+        expected_trades_to_target=float(trades_to_target.mean()) if len(trades_to_target) else math.nan,
+        balance_percentiles=dict(zip(BALANCE_PERCENTILES, np.percentile(final_balances, BALANCE_PERCENTILES))),
+        balance_counts=counts,
+        balance_edges=edges
+    )
+
+def chunk_paths(n_trades):
+    """Paths per simulated chunk, so a chunk holds about CHUNK_CELLS path x trade cells"""
+    return max(CHUNK_CELLS // max(int(n_trades), 1), 1)
+
+def account_trades_per_day(trades, limit=MONTE_CARLO_MAX_TRADES_PER_DAY):
+    """Average trades per trading day in a trade history, clamped to 1..`limit`"""
+    if trades.empty:
+        return 1
+    return min(max(int(round(len(trades) / trades['date'].nunique())), 1), limit)
+
+@memoize_on_data_version
+def calculate_monte_carlo(account_name, n_trades, trades_per_day, target_pct, n_paths, method):
+    """Monte Carlo projection of an account from its own R-multiple history
+
+    Returns None when the account has no trades to resample.
+    """
+    account = st.session_state.account_info[account_name]
+    r_history = get_trade_index().trades_for(account_name)['r_multiple'].dropna().to_numpy(dtype=float)
+    if len(r_history) < 2:
+        return None
+    
+    balance = account['current_balance']
+    return simulate_account(
+        r_history,
+        account['risk_per_trade'],
+        balance,
+        n_trades,
+        trades_per_day,
+        account['daily_stop'],
+        account['weekly_stop'],
+        loss_limit=account['starting_balance'] * (1 - account.get('max_loss', MONTE_CARLO_MAX_LOSS)),
+        target=balance * (1 + target_pct),
+        n_paths=n_paths,
+        method=method,
+        workers=MONTE_CARLO_WORKERS
+    )
@@ -0,0 +1,49 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Process-wide timings in seconds, in the order they were first recorded
+_timings = {}
+_lock = threading.Lock()
+_report_logged = False
+
+def record_timing(name, seconds, once=False):
+    """Record a timing; with once=True only the first measurement is kept"""
+    with _lock:
+        if once and name in _timings:
+            return
+        _timings[name] = seconds
+
+@contextmanager
+def timed(name, once=False):
+    """Time the enclosed block, or each call of a decorated function, under `name`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start, once=once)
+
+def get_timings():
+    """Return a copy of the recorded timings"""
+    with _lock:
+        return dict(_timings)
+
+def timing_report():
+    """Format the recorded timings as a small table"""
+    timings = get_timings()
+    if not timings:
+        return "No timings recorded"
+    width = max(len(name) for name in timings)
+    return "\n".join(f"{name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in timings.items())
+
+def log_timing_report_once():
+    """Log the timing report the first time it is called in this process"""
+    global _report_logged
+    with _lock:
+        if _report_logged:
+            return
+        _report_logged = True
+    logger.info("Startup timings:\n%s", timing_report())
@@ -0,0 +1,241 @@
+import math
+import itertools
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config import BOOTSTRAP_RESAMPLES, BOOTSTRAP_CONFIDENCE, BOOTSTRAP_SEED, PERMUTATION_SHUFFLES
+from utils.memo import memoize_on_data_version
+
+# Most resampled trades held in memory at once; resamples are drawn in
+# blocks of this many draws so large journals never need one B x N array
+BOOTSTRAP_BLOCK_SIZE = 4_000_000
+
+# Above this many trades the resampled sums are drawn from their normal
+# limit (same mean and covariance) instead of resampling trade by trade
+BOOTSTRAP_EXACT_MAX_TRADES = 5000
+
+# Above this many pooled observations a permutation test uses the normal
+# limit of the permutation distribution instead of shuffling
+PERMUTATION_EXACT_MAX_SAMPLES = 50_000
+
+# Most shuffled observations held in memory at once; shuffles run in chunks
+# of rows through one reused buffer of this many values
+PERMUTATION_BLOCK_SIZE = 4_000_000
+
+# How a permutation test's p-value was obtained
+PERMUTATION_METHOD = 'Permutation'
+NORMAL_APPROX_METHOD = 'Normal approx.'
+
+# p-value below which a difference between strategies is reported as significant
+SIGNIFICANCE_LEVEL = 0.05
+
+def _safe_ratio(numerator, denominator, fallback):
+    """numerator / denominator, or `fallback` where the denominator is 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), fallback)
+
+def bootstrap_account_metrics(outcomes, r_multiples, pnl, n_resamples=BOOTSTRAP_RESAMPLES, seed=BOOTSTRAP_SEED):
+    """Account metrics recomputed on `n_resamples` bootstrap resamples of the trades
+
+    Each resample draws len(trades) trades with replacement. A block of
+    resamples is one array of draw counts per trade, and the sums behind
+    every metric come from a single matrix product with it. Past
+    BOOTSTRAP_EXACT_MAX_TRADES the sums are drawn from the multivariate
+    normal they converge to, which keeps the cost independent of journal
+    size. Metrics follow compute_account_metrics, including its fallbacks
+    for resamples with no wins, no losses or no gross loss. Returns a dict
+    of metric name -> array of `n_resamples` values.
+    """
+    outcomes = np.asarray(outcomes)
+    r_multiples = np.asarray(r_multiples, dtype=float)
+    pnl = np.asarray(pnl, dtype=float)
+    n = len(pnl)
+    rng = np.random.default_rng(seed)
+    
+    is_win = outcomes == 'Win'
+    is_loss = outcomes == 'Loss'
+    has_r = ~np.isnan(r_multiples)
+    r = np.where(has_r, r_multiples, 0.0)
+    # Per-trade contributions; every metric is built from sums of these columns
+    columns = np.stack([
+        is_win,
+        is_win & has_r,
+        is_loss & has_r,
+        np.where(is_win, r, 0.0),
+        np.where(is_loss, r, 0.0),
+        np.where(pnl > 0, pnl, 0.0),
+        np.where(pnl < 0, -pnl, 0.0)
+    ], axis=1).astype(float)
+    
+    if n > BOOTSTRAP_EXACT_MAX_TRADES:
+        sums = rng.multivariate_normal(
+            n * columns.mean(axis=0), n * np.cov(columns, rowvar=False, bias=True),
+            size=n_resamples, check_valid='ignore'
+        )
+    else:
+        # How many times each resample drew each trade, so all sums are one matrix product
+        block = max(BOOTSTRAP_BLOCK_SIZE // max(n, 1), 1)
+        blocks = []
+        for start in range(0, n_resamples, block):
+            size = min(block, n_resamples - start)
+            sample = rng.integers(0, n, size=(size, n)) + np.arange(size)[:, None] * n
+            weights = np.bincount(sample.ravel(), minlength=size * n).reshape(size, n)
+            blocks.append(weights @ columns)
+        sums = np.concatenate(blocks)
+    wins, win_count, loss_count, win_r, loss_r, gross_profit, gross_loss = sums.T
+    
+    win_rate = wins / n
+    avg_win = _safe_ratio(win_r, win_count, 0.0)
+    avg_loss = _safe_ratio(loss_r, loss_count, 0.0)
+    return {
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': win_rate * avg_win + (1 - win_rate) * avg_loss,
+        'profit_factor': _safe_ratio(gross_profit, gross_loss, gross_profit)
+    }
+
+def compute_metric_intervals(trades, n_resamples=BOOTSTRAP_RESAMPLES, confidence=BOOTSTRAP_CONFIDENCE,
+                             seed=BOOTSTRAP_SEED):
+    """Percentile bootstrap confidence intervals of every account metric
+
+    Returns {account: {metric: (low, high)}} for each account with trades.
+    """
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for account, group in trades.groupby('account', observed=True):
+        samples = bootstrap_account_metrics(
+            group['outcome'].to_numpy(dtype=str),
+            group['r_multiple'].to_numpy(dtype=float, na_value=np.nan),
+            group['pnl'].to_numpy(dtype=float),
+            n_resamples,
+            seed
+        )
+        intervals[account] = {
+            metric: tuple(float(bound) for bound in np.percentile(values, [tail, 100 - tail]))
+            for metric, values in samples.items()
+        }
+    return intervals
+
+@memoize_on_data_version
+def calculate_all_metric_intervals():
+    """Bootstrap confidence intervals for all accounts, computed once per data version"""
+    return compute_metric_intervals(st.session_state.trade_journal)
+
+def calculate_metric_intervals(account_name):
+    """Confidence intervals of an account's metrics, or None without trades"""
+    return calculate_all_metric_intervals().get(account_name)
+
+def permutation_test(a, b, n_shuffles=PERMUTATION_SHUFFLES, seed=BOOTSTRAP_SEED):
+    """Two-sided permutation test for a difference in means between two samples
+
+    Each shuffle is a row holding a random permutation of the pooled
+    sample, whose first len(a) entries are the relabelled `a`. Rows are
+    shuffled in chunks through one buffer of at most
+    PERMUTATION_BLOCK_SIZE values. Past PERMUTATION_EXACT_MAX_SAMPLES
+    pooled observations the normal limit of the permutation distribution,
+    whose variance is known exactly, is used instead. Returns the mean
+    difference, Cohen's d, the p-value and the method that produced it.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n_a, n_b = len(a), len(b)
+    pooled = np.concatenate([a, b])
+    n = n_a + n_b
+    difference = a.mean() - b.mean()
+    
+    pooled_std = math.sqrt(((n_a - 1) * a.var(ddof=1) + (n_b - 1) * b.var(ddof=1)) / (n - 2)) if n > 2 else 0.0
+    effect_size = difference / pooled_std if pooled_std > 0 else 0.0
+    
+    method = PERMUTATION_METHOD
+    if pooled.var() == 0:
+        p_value = 1.0
+    elif n > PERMUTATION_EXACT_MAX_SAMPLES:
+        # Sum of a random n_a-subset: variance n_a * n_b * var / (n - 1)
+        std = math.sqrt(n * n * pooled.var() / (n_a * n_b * (n - 1)))
+        p_value = math.erfc(abs(difference) / std / math.sqrt(2))
+        method = NORMAL_APPROX_METHOD
+    else:
+        rng = np.random.default_rng(seed)
+        rows = min(max(PERMUTATION_BLOCK_SIZE // n, 1), n_shuffles)
+        buffer = np.empty((rows, n))
+        sum_a = np.empty(n_shuffles)
+        for start in range(0, n_shuffles, rows):
+            chunk = buffer[:min(rows, n_shuffles - start)]
+            chunk[:] = pooled
+            rng.permuted(chunk, axis=1, out=chunk)
+            sum_a[start:start + len(chunk)] = chunk[:, :n_a].sum(axis=1)
+        shuffled_differences = sum_a / n_a - (pooled.sum() - sum_a) / n_b
+        extreme = np.count_nonzero(np.abs(shuffled_differences) >= abs(difference) - 1e-12)
+        p_value = (extreme + 1) / (n_shuffles + 1)
+    
+    return {'difference': float(difference), 'effect_size': float(effect_size), 'p_value': float(p_value), 'method': method}
+
+def compare_samples(samples, n_shuffles=PERMUTATION_SHUFFLES, seed=BOOTSTRAP_SEED):
+    """Permutation test between every pair of named samples
+
+    Returns one row per pair with both means, the difference, Cohen's d,
+    the p-value and the test method. Samples with fewer than two
+    observations are skipped.
+    """
+    columns = ['group_a', 'group_b', 'mean_a', 'mean_b', 'difference', 'effect_size', 'p_value', 'method']
+    names = [name for name, values in samples.items() if len(values) >= 2]
+    rows = []
+    for name_a, name_b in itertools.combinations(names, 2):
+        result = permutation_test(samples[name_a], samples[name_b], n_shuffles, seed)
+        rows.append({
+            'group_a': name_a,
+            'group_b': name_b,
+            'mean_a': float(np.mean(samples[name_a])),
+            'mean_b': float(np.mean(samples[name_b])),
+            **result
+        })
+    return pd.DataFrame(rows, columns=columns)
+
+def compute_strategy_comparisons(trades, performance, account_info):
+    """Pairwise strategy tests for each compared metric
+
+    Win rate, average win and loss, and expectancy are compared on
+    per-trade values (win indicator, R of wins, R of losses, R of all
+    trades); returns on daily P&L. Returns {metric: pairwise results}.
+    """
+    strategies = {name: account['strategy'] for name, account in account_info.items()}
+    trades = trades.assign(strategy=trades['account'].astype(str).map(strategies))
+    performance = performance.assign(strategy=performance['account'].astype(str).map(strategies))
+    
+    samples = {metric: {} for metric in ['win_rate', 'avg_win', 'avg_loss', 'expectancy', 'daily_pnl']}
+    for strategy, group in trades.groupby('strategy', sort=False):
+        r = group['r_multiple'].to_numpy(dtype=float, na_value=np.nan)
+        is_win = (group['outcome'] == 'Win').to_numpy()
+        is_loss = (group['outcome'] == 'Loss').to_numpy()
+        has_r = ~np.isnan(r)
+        samples['win_rate'][strategy] = is_win.astype(float)
+        samples['avg_win'][strategy] = r[is_win & has_r]
+        samples['avg_loss'][strategy] = r[is_loss & has_r]
+        samples['expectancy'][strategy] = r[has_r]
+    for strategy, group in performance.groupby('strategy', sort=False):
+        samples['daily_pnl'][strategy] = group['pnl'].to_numpy(dtype=float)
+    
+    return {metric: compare_samples(metric_samples) for metric, metric_samples in samples.items()}
+
+@memoize_on_data_version
+def calculate_strategy_comparisons():
+    """Pairwise strategy significance tests for the session data"""
+    return compute_strategy_comparisons(
+        st.session_state.trade_journal, st.session_state.daily_performance, st.session_state.account_info
+    )
+
+def describe_comparison(comparisons, format_difference):
+    """One-line summary of the most significant pairwise difference"""
+    if comparisons.empty:
+        return "Not enough data to compare"
+    strongest = comparisons.loc[comparisons['p_value'].idxmin()]
+    if strongest['p_value'] >= SIGNIFICANCE_LEVEL:
+        return f"No significant difference (lowest p = {strongest['p_value']:.2f})"
+    
+    higher, lower = strongest['group_a'], strongest['group_b']
+    if strongest['difference'] < 0:
+        higher, lower = lower, higher
+    approximation = ", normal approx." if strongest['method'] == NORMAL_APPROX_METHOD else ""
+    return (f"{higher} above {lower} by {format_difference(abs(strongest['difference']))} "
+            f"(d = {abs(strongest['effect_size']):.2f}, p = {strongest['p_value']:.3f}{approximation})")